@@ -12,9 +12,31 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import hashlib
+import json
+import threading
+
+import cachetools
+from oslo_config import cfg
 from oslo_utils import importutils
 
 
+CONF = cfg.CONF
+
+CONF.import_opt('action_class_cache_size', 'mistral.config', group='executor')
+
+# Executor-local cache of constructed action classes.
+# {(action_class_str, attributes_hash): action_class}
+_ACTION_CLASS_CACHE = None
+
+_CACHE_LOCK = threading.RLock()
+
+_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+# {action_class_str: [number_of_setups, total_setup_time]}
+_SETUP_TIMES = {}
+
+
 def construct_action_class(action_class_str, attributes):
     # Rebuild action class and restore attributes.
     action_class = importutils.import_class(action_class_str)
@@ -26,3 +48,105 @@ def construct_action_class(action_class_str, attributes):
     )
 
     return unique_action_class
+
+
+def _get_attributes_hash(attributes):
+    try:
+        s = json.dumps(attributes or {}, sort_keys=True)
+    except (TypeError, ValueError):
+        s = repr(sorted((attributes or {}).items()))
+
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+def _get_action_class_cache():
+    global _ACTION_CLASS_CACHE
+
+    if _ACTION_CLASS_CACHE is None:
+        _ACTION_CLASS_CACHE = cachetools.LRUCache(
+            maxsize=CONF.executor.action_class_cache_size
+        )
+
+    return _ACTION_CLASS_CACHE
+
+
+def get_action_class(action_class_str, attributes):
+    """Gets action class, constructing it only if it's not cached yet.
+
+    Unlike construct_action_class() this function keeps a bounded cache of
+    already constructed classes keyed by the class path and a hash of the
+    attributes so that the module import and building of a new subclass
+    happen only once per unique (class, attributes) pair.
+
+    :param action_class_str: Path to action class in dot notation.
+    :param attributes: Attributes of action class which will be set to.
+    :return: Action class.
+    """
+    if CONF.executor.action_class_cache_size <= 0:
+        return construct_action_class(action_class_str, attributes)
+
+    key = (action_class_str, _get_attributes_hash(attributes))
+
+    with _CACHE_LOCK:
+        cache = _get_action_class_cache()
+
+        action_cls = cache.get(key)
+
+        if action_cls is not None:
+            _CACHE_STATS['hits'] += 1
+
+            return action_cls
+
+        _CACHE_STATS['misses'] += 1
+
+    action_cls = construct_action_class(action_class_str, attributes)
+
+    with _CACHE_LOCK:
+        cache[key] = action_cls
+
+    return action_cls
+
+
+def record_setup_time(action_class_str, seconds):
+    """Accounts time spent on preparing action for running."""
+    with _CACHE_LOCK:
+        stat = _SETUP_TIMES.setdefault(action_class_str, [0, 0.0])
+
+        stat[0] += 1
+        stat[1] += seconds
+
+
+def get_cache_stats():
+    """Returns statistics of the action class cache.
+
+    :return: Dictionary with cache hits, misses, hit rate, current cache
+        size and average setup time (in seconds) per action class.
+    """
+    with _CACHE_LOCK:
+        hits = _CACHE_STATS['hits']
+        misses = _CACHE_STATS['misses']
+        total = hits + misses
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': float(hits) / total if total else 0.0,
+            'size': len(_ACTION_CLASS_CACHE) if _ACTION_CLASS_CACHE else 0,
+            'setup_time': dict(
+                (cls_str, stat[1] / stat[0])
+                for cls_str, stat in _SETUP_TIMES.items()
+            )
+        }
+
+
+def clear_cache():
+    """Intends to be used by tests to reset the cache and its statistics."""
+    global _ACTION_CLASS_CACHE
+
+    with _CACHE_LOCK:
+        _ACTION_CLASS_CACHE = None
+
+        _CACHE_STATS['hits'] = 0
+        _CACHE_STATS['misses'] = 0
+
+        _SETUP_TIMES.clear()
@@ -37,8 +37,17 @@ class Action(object):
     a dictionary containing contextual information like execution identifier,
     workbook name and other that may be needed for some specific action
     implementations.
+    An action may also provide method "run_async" with the same contract as
+    "run". It signals that the action only does cooperative (green) I/O so
+    that an executor running in async mode can run it concurrently with
+    other actions on its event loop instead of a native thread.
     """
 
+    # If True, a client created by the action may be reused by subsequent
+    # runs of actions of the same kind (if pooling is enabled in the
+    # executor configuration).
+    reusable_client = False
+
     @abc.abstractmethod
     def run(self):
         """Run action logic.
@@ -16,35 +16,39 @@ import functools
 
 from oslo_config import cfg
 from oslo_log import log
-from oslo_utils import importutils
 
 from keystoneclient.auth import identity
 from keystoneclient import httpclient
 
-barbicanclient = importutils.try_import('barbicanclient.client')
-ceilometerclient = importutils.try_import('ceilometerclient.v2.client')
-cinderclient = importutils.try_import('cinderclient.v2.client')
-designateclient = importutils.try_import('designateclient.v1')
-glanceclient = importutils.try_import('glanceclient.v2.client')
-heatclient = importutils.try_import('heatclient.v1.client')
-keystoneclient = importutils.try_import('keystoneclient.v3.client')
-ironic_inspector_client = importutils.try_import('ironic_inspector_client.v1')
-ironicclient = importutils.try_import('ironicclient.v1.client')
-magnumclient = importutils.try_import('magnumclient.v1.client')
-mistralclient = importutils.try_import('mistralclient.api.v2.client')
-muranoclient = importutils.try_import('muranoclient.v1.client')
-neutronclient = importutils.try_import('neutronclient.v2_0.client')
-novaclient = importutils.try_import('novaclient.client')
-swift_client = importutils.try_import('swiftclient.client')
-tackerclient = importutils.try_import('tackerclient.v1_0.client')
-troveclient = importutils.try_import('troveclient.v1.client')
-zaqarclient = importutils.try_import('zaqarclient.queues.v2.client')
-
 from mistral.actions.openstack import base
 from mistral import context
 from mistral.utils import inspect_utils
+from mistral.utils import lazy_import
 from mistral.utils.openstack import keystone as keystone_utils
 
+# Python clients are heavy to import so they're only imported when an
+# action of the corresponding service is used for the first time.
+barbicanclient = lazy_import.LazyModule('barbicanclient.client')
+ceilometerclient = lazy_import.LazyModule('ceilometerclient.v2.client')
+cinderclient = lazy_import.LazyModule('cinderclient.v2.client')
+designateclient = lazy_import.LazyModule('designateclient.v1')
+glanceclient = lazy_import.LazyModule('glanceclient.v2.client')
+heatclient = lazy_import.LazyModule('heatclient.v1.client')
+keystoneclient = lazy_import.LazyModule('keystoneclient.v3.client')
+ironic_inspector_client = lazy_import.LazyModule(
+    'ironic_inspector_client.v1'
+)
+ironicclient = lazy_import.LazyModule('ironicclient.v1.client')
+magnumclient = lazy_import.LazyModule('magnumclient.v1.client')
+mistralclient = lazy_import.LazyModule('mistralclient.api.v2.client')
+muranoclient = lazy_import.LazyModule('muranoclient.v1.client')
+neutronclient = lazy_import.LazyModule('neutronclient.v2_0.client')
+novaclient = lazy_import.LazyModule('novaclient.client')
+swift_client = lazy_import.LazyModule('swiftclient.client')
+tackerclient = lazy_import.LazyModule('tackerclient.v1_0.client')
+troveclient = lazy_import.LazyModule('troveclient.v1.client')
+zaqarclient = lazy_import.LazyModule('zaqarclient.queues.v2.client')
+
 
 LOG = log.getLogger(__name__)
 
@@ -14,15 +14,49 @@
 
 import abc
 import inspect
+import threading
 import traceback
 
+import cachetools
+from oslo_config import cfg
 from oslo_log import log
 
 from mistral.actions import base
+from mistral import context
 from mistral import exceptions as exc
 
 LOG = log.getLogger(__name__)
 
+CONF = cfg.CONF
+
+CONF.import_opt('pool_action_clients', 'mistral.config', group='executor')
+
+# Pool of python-client instances shared by reusable actions.
+# {(client_owner_class, project_id, auth_token): client}
+_CLIENT_POOL = None
+
+_CLIENT_POOL_LOCK = threading.RLock()
+
+
+def _get_client_pool():
+    global _CLIENT_POOL
+
+    if _CLIENT_POOL is None:
+        _CLIENT_POOL = cachetools.TTLCache(
+            maxsize=CONF.executor.action_client_pool_size,
+            ttl=CONF.executor.action_client_pool_ttl
+        )
+
+    return _CLIENT_POOL
+
+
+def clear_client_pool():
+    """Intends to be used by tests to drop all pooled clients."""
+    global _CLIENT_POOL
+
+    with _CLIENT_POOL_LOCK:
+        _CLIENT_POOL = None
+
 
 class OpenStackAction(base.Action):
     """OpenStack Action.
@@ -33,6 +67,10 @@ class OpenStackAction(base.Action):
     _kwargs_for_run = {}
     client_method_name = None
 
+    # Clients are reused only within the security context they were
+    # created for.
+    reusable_client = True
+
     def __init__(self, **kwargs):
         self._kwargs_for_run = kwargs
 
@@ -74,9 +112,38 @@ class OpenStackAction(base.Action):
     def get_fake_client_method(cls):
         return cls._get_client_method(cls._get_fake_client())
 
+    @classmethod
+    def _get_client_owner(cls):
+        """Returns the class that defines how the client is created."""
+        for klass in inspect.getmro(cls):
+            if '_get_client' in vars(klass):
+                return klass
+
+        return cls
+
+    def _get_pooled_client(self):
+        """Returns python-client instance, reusing it if possible."""
+        if not (self.reusable_client and CONF.executor.pool_action_clients):
+            return self._get_client()
+
+        ctx = context.ctx()
+
+        key = (self._get_client_owner(), ctx.project_id, ctx.auth_token)
+
+        with _CLIENT_POOL_LOCK:
+            client = _get_client_pool().get(key)
+
+        if client is None:
+            client = self._get_client()
+
+            with _CLIENT_POOL_LOCK:
+                _get_client_pool()[key] = client
+
+        return client
+
     def run(self):
         try:
-            method = self._get_client_method(self._get_client())
+            method = self._get_client_method(self._get_pooled_client())
 
             result = method(**self._kwargs_for_run)
 
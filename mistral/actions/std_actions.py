@@ -20,7 +20,9 @@ from email.mime import text
 
 import json
 import requests
+from six.moves import http_cookiejar
 import smtplib
+import threading
 import time
 
 from mistral.actions import base
@@ -28,10 +30,48 @@ from mistral import exceptions as exc
 from mistral.utils import javascript
 from mistral.utils import ssh_utils
 from mistral.workflow import utils as wf_utils
+from oslo_config import cfg
 from oslo_log import log as logging
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+CONF.import_opt('pool_action_clients', 'mistral.config', group='executor')
+
+# HTTP session shared by HTTP actions if client pooling is enabled. It keeps
+# connections alive between action runs.
+_HTTP_SESSION = None
+
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+class _RejectCookiesPolicy(http_cookiejar.DefaultCookiePolicy):
+    """Keeps the shared session from storing and sending any cookies.
+
+    Actions of different projects and executions use the same session so
+    cookies set by a response must not leak into subsequent requests.
+    Cookies given to an action are still sent since they're kept in a
+    separate jar of the request.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def _get_http_session():
+    global _HTTP_SESSION
+
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            _HTTP_SESSION = requests.Session()
+            _HTTP_SESSION.cookies.set_policy(_RejectCookiesPolicy())
+
+        return _HTTP_SESSION
+
 
 class EchoAction(base.Action):
     """Echo action.
@@ -125,6 +165,8 @@ class HTTPAction(base.Action):
         A CA_BUNDLE path can also be provided.
     """
 
+    reusable_client = True
+
     def __init__(self,
                  url,
                  method="GET",
@@ -171,8 +213,13 @@ class HTTPAction(base.Action):
                   self.proxies,
                   self.verify))
 
+        if self.reusable_client and CONF.executor.pool_action_clients:
+            request = _get_http_session().request
+        else:
+            request = requests.request
+
         try:
-            resp = requests.request(
+            resp = request(
                 self.method,
                 self.url,
                 params=self.params,
@@ -216,6 +263,11 @@ class HTTPAction(base.Action):
 
         return _result
 
+    def run_async(self):
+        # HTTP requests are done via monkey patched sockets so they can
+        # safely run on the executor event loop.
+        return self.run()
+
     def test(self):
         # TODO(rakhmerov): Implement.
         return None
@@ -311,6 +363,10 @@ class SendEmailAction(base.Action):
             raise exc.ActionException("Failed to send an email message: %s"
                                       % e)
 
+    def run_async(self):
+        # SMTP session uses monkey patched sockets.
+        return self.run()
+
     def test(self):
         # Just logging the operation since this action is not supposed
         # to return a result.
@@ -379,6 +435,10 @@ class SSHAction(base.Action):
         except Exception as e:
             return raise_exc(parent_exc=e)
 
+    def run_async(self):
+        # Paramiko transport uses monkey patched sockets and threads.
+        return self.run()
+
     def test(self):
         # TODO(rakhmerov): Implement.
         return None
@@ -16,6 +16,10 @@
 
 """Access Control API server."""
 
+import threading
+import time
+
+import cachetools
 from keystonemiddleware import auth_token
 from oslo_config import cfg
 from oslo_policy import policy
@@ -25,6 +29,19 @@ from mistral import exceptions as exc
 
 _ENFORCER = None
 
+# Cache of enforcement decisions and the rules they were made with.
+_DECISIONS = None
+_DECISIONS_RULES = None
+_DECISIONS_LOCK = threading.Lock()
+
+_STATS = {
+    'calls': 0,
+    'hits': 0,
+    'misses': 0,
+    'evaluations': 0,
+    'evaluation_time': 0.0
+}
+
 
 def setup(app):
     if cfg.CONF.pecan.auth_enable and cfg.CONF.auth_type == 'keystone':
@@ -76,14 +93,100 @@ def enforce(action, context, target=None, do_raise=True,
     target_obj.update(target or {})
     _ensure_enforcer_initialization()
 
-    return _ENFORCER.enforce(
+    # Decisions on a custom target depend on the target itself,
+    # they are not cached.
+    if target or not cfg.CONF.api.policy_cache_size:
+        return _evaluate(action, target_obj, context, do_raise, exc)
+
+    # Reloads rules if the policy file has changed.
+    _ENFORCER.load_rules()
+
+    key = (
         action,
-        target_obj,
-        context.to_dict(),
-        do_raise=do_raise,
-        exc=exc
+        frozenset(context.roles or []),
+        context.project_id,
+        context.user_id,
+        bool(context.is_admin)
     )
 
+    with _DECISIONS_LOCK:
+        decision = _get_decisions().get(key)
+
+        _STATS['calls'] += 1
+        _STATS['hits' if decision is not None else 'misses'] += 1
+
+    if decision is None:
+        decision = _evaluate(action, target_obj, context, False, exc)
+
+        with _DECISIONS_LOCK:
+            _get_decisions()[key] = decision
+
+    if not decision and do_raise:
+        raise exc()
+
+    return decision
+
+
+def _evaluate(action, target_obj, context, do_raise, exc):
+    started = time.time()
+
+    try:
+        return _ENFORCER.enforce(
+            action,
+            target_obj,
+            context.to_dict(),
+            do_raise=do_raise,
+            exc=exc
+        )
+    finally:
+        with _DECISIONS_LOCK:
+            _STATS['evaluations'] += 1
+            _STATS['evaluation_time'] += time.time() - started
+
+
+def _get_decisions():
+    global _DECISIONS
+    global _DECISIONS_RULES
+
+    # Policy rules are replaced with a new object when the policy file
+    # is reloaded or rules are set explicitly.
+    if _DECISIONS is None or _DECISIONS_RULES is not _ENFORCER.rules:
+        _DECISIONS = cachetools.LRUCache(
+            maxsize=cfg.CONF.api.policy_cache_size
+        )
+        _DECISIONS_RULES = _ENFORCER.rules
+
+    return _DECISIONS
+
+
+def get_stats():
+    """Returns counters of policy enforcement.
+
+    :return: Dictionary with number of cacheable enforcement calls, number
+        of cache hits and misses, number of evaluations of policy rules
+        and total number of seconds spent on them.
+    """
+    with _DECISIONS_LOCK:
+        return dict(_STATS)
+
+
+def clear_cache():
+    """Intends to be used by tests to reset cached decisions and counters."""
+    global _DECISIONS
+    global _DECISIONS_RULES
+
+    with _DECISIONS_LOCK:
+        _DECISIONS = None
+        _DECISIONS_RULES = None
+
+        _STATS.update(
+            calls=0,
+            hits=0,
+            misses=0,
+            evaluations=0,
+            evaluation_time=0.0
+        )
+
 
 def _ensure_enforcer_initialization():
     global _ENFORCER
@@ -25,6 +25,7 @@ from mistral import coordination
 from mistral.db.v2 import api as db_api_v2
 from mistral.engine.rpc_backend import rpc
 from mistral.services import periodic
+from mistral.services import state_notifications
 
 
 def get_pecan_config():
@@ -71,6 +72,9 @@ def setup_app(config=None):
     # Set up RPC related flags in config
     rpc.get_transport()
 
+    # Receive state changes of executions from engines of other processes.
+    state_notifications.start_listener()
+
     # Set up profiler.
     if cfg.CONF.profiler.enabled:
         app = osprofiler.web.WsgiMiddleware(
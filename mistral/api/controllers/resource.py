@@ -103,6 +103,16 @@ class ResourceList(Resource):
         if not self.has_next(limit):
             return wtypes.Unset
 
+        return self.get_next_link(
+            self.collection[-1].id,
+            limit,
+            url=url,
+            fields=fields,
+            **kwargs
+        )
+
+    def get_next_link(self, marker, limit, url=None, fields=None, **kwargs):
+        """Return a link to the subset of the resources after the marker."""
         q_args = ''.join(
             ['%s=%s&' % (key, value) for key, value in kwargs.items()]
         )
@@ -112,7 +122,7 @@ class ResourceList(Resource):
             {
                 'args': q_args,
                 'limit': limit,
-                'marker': self.collection[-1].id
+                'marker': marker
             }
         )
 
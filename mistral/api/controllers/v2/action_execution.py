@@ -16,6 +16,7 @@
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from pecan import hooks
 from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
@@ -23,6 +24,7 @@ import wsmeext.pecan as wsme_pecan
 from mistral.api import access_control as acl
 from mistral.api.controllers import resource
 from mistral.api.controllers.v2 import types
+from mistral.api.hooks import streaming
 from mistral import context
 from mistral.db.v2 import api as db_api
 from mistral.engine.rpc_backend import rpc
@@ -122,7 +124,7 @@ def _get_action_execution_resource(action_ex):
 
 def _get_action_executions(task_execution_id=None, marker=None, limit=None,
                            sort_keys='created_at', sort_dirs='asc',
-                           fields='', **filters):
+                           fields='', stream=False, **filters):
     """Return all action executions.
 
     Where project_id is the same as the requester or
@@ -142,6 +144,7 @@ def _get_action_executions(task_execution_id=None, marker=None, limit=None,
                    be returned. 'id' will be included automatically in
                    fields if it's provided, since it will be used when
                    constructing 'next' link.
+    :param stream: Optional. If True, the response is streamed.
     :param filters: Optional. A list of filters to apply to the result.
     """
     filters['type'] = 'action_execution'
@@ -160,11 +163,14 @@ def _get_action_executions(task_execution_id=None, marker=None, limit=None,
         sort_keys=sort_keys,
         sort_dirs=sort_dirs,
         fields=fields,
+        stream=stream,
         **filters
     )
 
 
-class ActionExecutionsController(rest.RestController):
+class ActionExecutionsController(rest.RestController, hooks.HookController):
+    __hooks__ = [streaming.StreamingHook()]
+
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(ActionExecution, wtypes.text)
     def get(self, id):
@@ -234,13 +240,13 @@ class ActionExecutionsController(rest.RestController):
                          wtypes.text, wtypes.text, types.uniquelist,
                          wtypes.text, wtypes.text, wtypes.text, types.uuid,
                          wtypes.text, wtypes.text, bool, types.jsontype,
-                         types.jsontype, types.jsontype, wtypes.text)
+                         types.jsontype, types.jsontype, wtypes.text, bool)
     def get_all(self, marker=None, limit=None, sort_keys='created_at',
                 sort_dirs='asc', fields='', created_at=None, name=None,
                 tag=None, tags=None, updated_at=None, workflow_name=None,
                 task_name=None, task_execution_id=None, state=None,
                 state_info=None, accepted=None, input=None, output=None,
-                params=None, description=None):
+                params=None, description=None, stream=False):
         """Return all tasks within the execution.
 
         Where project_id is the same as the requester or
@@ -285,6 +291,9 @@ class ActionExecutionsController(rest.RestController):
                            time and date.
         :param updated_at: Optional. Keep only resources with specific latest
                            update time and date.
+        :param stream: Optional. If true, the response is streamed while
+                       reading the database so that memory use doesn't
+                       depend on the number of returned resources.
         """
         acl.enforce('action_executions:list', context.ctx())
 
@@ -321,6 +330,7 @@ class ActionExecutionsController(rest.RestController):
             sort_keys=sort_keys,
             sort_dirs=sort_dirs,
             fields=fields,
+            stream=stream,
             **filters
         )
 
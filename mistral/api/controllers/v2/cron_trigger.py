@@ -45,6 +45,7 @@ class CronTrigger(resource.Resource):
     remaining_executions = wtypes.IntegerType(minimum=1)
     first_execution_time = wtypes.text
     next_execution_time = wtypes.text
+    next_execution_times = [wtypes.text]
 
     created_at = wtypes.text
     updated_at = wtypes.text
@@ -81,16 +82,34 @@ class CronTriggers(resource.ResourceList):
 
 class CronTriggersController(rest.RestController):
     @rest_utils.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose(CronTrigger, wtypes.text)
-    def get(self, name):
-        """Returns the named cron_trigger."""
+    @wsme_pecan.wsexpose(CronTrigger, wtypes.text,
+                         wtypes.IntegerType(minimum=1, maximum=1000))
+    def get(self, name, next_executions=None):
+        """Returns the named cron_trigger.
+
+        :param name: Name of the cron trigger.
+        :param next_executions: Optional. If given, the upcoming execution
+                                times of the trigger, at most this many, are
+                                returned in 'next_execution_times'.
+        """
 
         acl.enforce('cron_triggers:get', context.ctx())
         LOG.info('Fetch cron trigger [name=%s]' % name)
 
         db_model = db_api.get_cron_trigger(name)
 
-        return CronTrigger.from_dict(db_model.to_dict())
+        cron_trigger = CronTrigger.from_dict(db_model.to_dict())
+
+        if next_executions:
+            cron_trigger.next_execution_times = [
+                str(t) for t in
+                triggers.get_upcoming_execution_times(
+                    db_model,
+                    next_executions
+                )
+            ]
+
+        return cron_trigger
 
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(CronTrigger, body=CronTrigger, status_code=201)
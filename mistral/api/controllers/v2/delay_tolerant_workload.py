@@ -15,6 +15,8 @@
 # under the License.
 #
 
+from dateutil import parser as date_parser
+from oslo_config import cfg
 from oslo_log import log as logging
 from pecan import rest
 from wsme import types as wtypes
@@ -25,6 +27,7 @@ from mistral.api.controllers import resource
 from mistral.api.controllers.v2 import types
 from mistral import context
 from mistral.db.v2 import api as db_api
+from mistral import exceptions as exc
 from mistral.services import delay_tolerant_workload as dtw
 from mistral.utils import rest_utils
 
@@ -47,6 +50,18 @@ class DelayTolerantWorkload(resource.Resource):
     deadline = wtypes.text
     job_duration = wtypes.IntegerType(minimum=1)
 
+    estimated_duration = wtypes.IntegerType(minimum=0)
+    "Read-only. Duration estimated from previous executions (seconds)."
+
+    planned_start_time = wtypes.text
+    "Read-only. Time the workload is planned to start at."
+
+    reschedule_count = wtypes.IntegerType(minimum=0)
+    "Read-only. Number of times the planned start has been moved."
+
+    reschedule_reason = wtypes.text
+    "Read-only. Reason of the last change of the planned start."
+
     created_at = wtypes.text
     updated_at = wtypes.text
 
@@ -61,6 +76,7 @@ class DelayTolerantWorkload(resource.Resource):
                    scope='private',
                    deadline='2016-07-23T00:00:00',
                    job_duration=4,
+                   estimated_duration=3,
                    created_at='1970-01-01T00:00:00.000000',
                    updated_at='1970-01-01T00:00:00.000000')
 
@@ -80,7 +96,102 @@ class DelayTolerantWorkloads(resource.ResourceList):
         return cls(delay_tolerant_workloads=[DelayTolerantWorkload.sample()])
 
 
+class DelayTolerantWorkloadBulkResult(resource.Resource):
+    """Result of creating one workload of a bulk request."""
+
+    name = wtypes.text
+    id = wtypes.text
+    "ID of the created workload, unset if the workload is invalid."
+
+    error = wtypes.text
+    "Reason why the workload hasn't been created."
+
+    @classmethod
+    def sample(cls):
+        return cls(name='DTW_test',
+                   id='123e4567-e89b-12d3-a456-426655440000')
+
+
+class DelayTolerantWorkloadsBulkResult(resource.Resource):
+    """Results of a bulk request in the order of submitted workloads."""
+
+    results = [DelayTolerantWorkloadBulkResult]
+
+    @classmethod
+    def sample(cls):
+        return cls(results=[DelayTolerantWorkloadBulkResult.sample()])
+
+
+def _normalize_deadline_filter(value):
+    if value is None:
+        return None
+
+    try:
+        return date_parser.parse(value).isoformat()
+    except ValueError as e:
+        raise exc.InputException(
+            'Invalid deadline filter value %s: %s' % (value, e)
+        )
+
+
+def _get_dtw_resource(db_model):
+    dtw_resource = DelayTolerantWorkload.from_dict(db_model.to_dict())
+
+    if not cfg.CONF.engine.dtw_duration_estimates:
+        return dtw_resource
+
+    estimate = dtw.get_duration_estimate(
+        db_model.workflow_id,
+        db_model.workflow_input_size
+    )
+
+    if estimate is not None:
+        dtw_resource.estimated_duration = estimate
+
+    return dtw_resource
+
+
+class DelayTolerantWorkloadsBulkController(rest.RestController):
+    @rest_utils.wrap_wsme_controller_exception
+    @wsme_pecan.wsexpose(
+        DelayTolerantWorkloadsBulkResult,
+        body=DelayTolerantWorkloads
+    )
+    def post(self, dtws):
+        """Creates a number of delay tolerant workloads.
+
+        Workloads are validated independently, invalid workloads are
+        reported in the results while all others are created.
+        """
+        acl.enforce('delay_tolerant_workloads:create', context.ctx())
+
+        # The argument must not be named after the attribute of the body,
+        # WSME would take the attribute value as the whole body otherwise.
+        workloads = [
+            w.to_dict() for w in dtws.delay_tolerant_workloads or []
+        ]
+
+        LOG.info(
+            'Creating %s delay tolerant workloads in bulk.' % len(workloads)
+        )
+
+        results = dtw.create_delay_tolerant_workloads(workloads)
+
+        return DelayTolerantWorkloadsBulkResult(
+            results=[
+                DelayTolerantWorkloadBulkResult(
+                    name=values.get('name'),
+                    id=values.get('id'),
+                    error=error
+                )
+                for values, error in results
+            ]
+        )
+
+
 class DelayTolerantWorkloadController(rest.RestController):
+    bulk = DelayTolerantWorkloadsBulkController()
+
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(DelayTolerantWorkload, wtypes.text)
     def get(self, name):
@@ -91,7 +202,7 @@ class DelayTolerantWorkloadController(rest.RestController):
 
         db_model = db_api.get_delay_tolerant_workload(name)
 
-        return DelayTolerantWorkload.from_dict(db_model.to_dict())
+        return _get_dtw_resource(db_model)
 
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(
@@ -118,7 +229,7 @@ class DelayTolerantWorkloadController(rest.RestController):
             workflow_id=values.get('workflow_id')
         )
 
-        return DelayTolerantWorkload.from_dict(db_model.to_dict())
+        return _get_dtw_resource(db_model)
 
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(None, wtypes.text, status_code=204)
@@ -129,17 +240,19 @@ class DelayTolerantWorkloadController(rest.RestController):
 
         db_api.delete_delay_tolerant_workload(name)
 
+    @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(DelayTolerantWorkloads, wtypes.text,
                          wtypes.IntegerType(minimum=1), types.uuid, int,
                          types.uniquelist, types.list, types.uniquelist,
                          wtypes.text, wtypes.text, types.uuid, types.jsontype,
                          types.jsontype, SCOPE_TYPES,
-                         wtypes.text, wtypes.text)
+                         wtypes.text, wtypes.text, wtypes.text, wtypes.text)
     def get_all(self, deadline=None, job_duration=None,
                 marker=None, limit=None, sort_keys='created_at',
                 sort_dirs='asc', fields='', name=None, workflow_name=None,
                 workflow_id=None, workflow_input=None, workflow_params=None,
-                scope=None, created_at=None, updated_at=None):
+                scope=None, created_at=None, updated_at=None,
+                deadline_from=None, deadline_to=None):
         """Return all cron triggers.
 
         :param deadline: Optional.
@@ -172,6 +285,10 @@ class DelayTolerantWorkloadController(rest.RestController):
                            time and date.
         :param updated_at: Optional. Keep only resources with specific latest
                            update time and date.
+        :param deadline_from: Optional. Keep only resources with deadline
+                              later than or equal to the given time.
+        :param deadline_to: Optional. Keep only resources with deadline
+                            earlier than the given time.
         """
         acl.enforce('delay_tolerant_workloads:list', context.ctx())
 
@@ -186,6 +303,8 @@ class DelayTolerantWorkloadController(rest.RestController):
             scope=scope,
             job_duration=job_duration,
             deadline=deadline,
+            deadline_from=_normalize_deadline_filter(deadline_from),
+            deadline_to=_normalize_deadline_filter(deadline_to)
         )
 
         LOG.info("Fetching Delay tolerant workload. "
@@ -198,7 +317,7 @@ class DelayTolerantWorkloadController(rest.RestController):
             DelayTolerantWorkload,
             db_api.get_delay_tolerant_workloads,
             db_api.get_delay_tolerant_workload,
-            resource_function=None,
+            resource_function=_get_dtw_resource,
             marker=marker,
             limit=limit,
             sort_keys=sort_keys,
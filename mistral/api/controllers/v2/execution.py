@@ -14,19 +14,25 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from oslo_config import cfg
 from oslo_log import log as logging
+from pecan import hooks
 from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
 from mistral.api import access_control as acl
 from mistral.api.controllers import resource
+from mistral.api.controllers.v2 import execution_stats
 from mistral.api.controllers.v2 import task
 from mistral.api.controllers.v2 import types
+from mistral.api.hooks import conditional_get
+from mistral.api.hooks import streaming
 from mistral import context
 from mistral.db.v2 import api as db_api
 from mistral.engine.rpc_backend import rpc
 from mistral import exceptions as exc
+from mistral.services import state_notifications
 from mistral.services import workflows as wf_service
 from mistral.utils import rest_utils
 from mistral.workflow import states
@@ -112,17 +118,69 @@ class Executions(resource.ResourceList):
         return executions_sample
 
 
-class ExecutionsController(rest.RestController):
+def _wait_for_state_change(id, timeout):
+    # Subscribe before reading the current state so that a change
+    # committed in between isn't missed.
+    with state_notifications.subscribe(id) as subscription:
+        state = db_api.get_workflow_execution(id).state
+
+        if states.is_completed(state):
+            return
+
+        subscription.wait(
+            lambda e: e['id'] == id and e['state'] != state,
+            timeout
+        )
+
+
+class ExecutionsController(rest.RestController, hooks.HookController):
+    __hooks__ = [
+        streaming.StreamingHook(),
+        conditional_get.ConditionalGetHook()
+    ]
+
     tasks = task.ExecutionTasksController()
+    stats = execution_stats.ExecutionStatsController()
 
     @rest_utils.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose(Execution, wtypes.text)
-    def get(self, id):
-        """Return the specified Execution."""
+    @wsme_pecan.wsexpose(Execution, wtypes.text, int)
+    def get(self, id, wait_for_state_change=None):
+        """Return the specified Execution.
+
+        :param id: execution ID.
+        :param wait_for_state_change: Optional. Number of seconds to wait
+                                      for the execution to change its state
+                                      before it's returned. The execution is
+                                      returned immediately if it's already
+                                      completed.
+        """
         acl.enforce("executions:get", context.ctx())
         LOG.info("Fetch execution [id=%s]" % id)
 
-        return Execution.from_dict(db_api.get_workflow_execution(id).to_dict())
+        if wait_for_state_change:
+            if wait_for_state_change < 0:
+                raise exc.InputException(
+                    "wait_for_state_change must not be negative: %s" %
+                    wait_for_state_change
+                )
+
+            _wait_for_state_change(
+                id,
+                min(
+                    wait_for_state_change,
+                    cfg.CONF.api.max_wait_for_state_change
+                )
+            )
+
+        if rest_utils.is_not_modified(db_api.get_workflow_execution_version,
+                                      id):
+            return
+
+        wf_ex = db_api.get_workflow_execution(id)
+
+        rest_utils.set_cache_headers(wf_ex)
+
+        return Execution.from_dict(wf_ex.to_dict())
 
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(Execution, wtypes.text, body=Execution)
@@ -259,12 +317,13 @@ class ExecutionsController(rest.RestController):
                          types.list, types.uniquelist, wtypes.text,
                          types.uuid, wtypes.text, types.jsontype, types.uuid,
                          STATE_TYPES, wtypes.text, types.jsontype,
-                         types.jsontype, wtypes.text, wtypes.text)
+                         types.jsontype, wtypes.text, wtypes.text, bool)
     def get_all(self, marker=None, limit=None, sort_keys='created_at',
                 sort_dirs='asc', fields='', workflow_name=None,
                 workflow_id=None, description=None, params=None,
                 task_execution_id=None, state=None, state_info=None,
-                input=None, output=None, created_at=None, updated_at=None):
+                input=None, output=None, created_at=None, updated_at=None,
+                stream=False):
         """Return all Executions.
 
         :param marker: Optional. Pagination marker for large data sets.
@@ -299,6 +358,9 @@ class ExecutionsController(rest.RestController):
                            time and date.
         :param updated_at: Optional. Keep only resources with specific latest
                            update time and date.
+        :param stream: Optional. If true, the response is streamed while
+                       reading the database so that memory use doesn't
+                       depend on the number of returned resources.
         """
         acl.enforce('executions:list', context.ctx())
 
@@ -333,5 +395,6 @@ class ExecutionsController(rest.RestController):
             sort_keys=sort_keys,
             sort_dirs=sort_dirs,
             fields=fields,
+            stream=stream,
             **filters
         )
@@ -0,0 +1,288 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Aggregate statistics of workflow and task executions.
+
+Statistics are calculated by the database with GROUP BY queries so that
+dashboards don't need to page through all executions. Results can be
+cached per project for a short time (see
+[api]/execution_stats_cache_ttl).
+"""
+
+import threading
+
+import cachetools
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
+from pecan import rest
+from wsme import types as wtypes
+import wsmeext.pecan as wsme_pecan
+
+from mistral.api import access_control as acl
+from mistral.api.controllers import resource
+from mistral.api.controllers.v2 import types
+from mistral import context
+from mistral.db.v2 import api as db_api
+from mistral import exceptions as exc
+from mistral.services import security
+from mistral.utils import rest_utils
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+INTERVAL_TYPES = wtypes.Enum(str, 'minute', 'hour', 'day', 'month')
+
+EXECUTION_GROUP_BY = ('state', 'workflow_name', 'project_id')
+TASK_GROUP_BY = ('state', 'workflow_name', 'project_id', 'name')
+
+_STATS_CACHE = None
+_STATS_CACHE_LOCK = threading.Lock()
+
+
+class ExecutionStat(resource.Resource):
+    """Aggregate statistics of a group of executions.
+
+    Only the attributes executions are grouped by are set. Durations are
+    calculated for completed executions only.
+    """
+
+    state = wtypes.text
+    workflow_name = wtypes.text
+    project_id = wtypes.text
+
+    name = wtypes.text
+    "Task name, only used for task statistics."
+
+    period = wtypes.text
+    "Start of the creation time period if grouped by interval."
+
+    count = int
+    avg_duration = float
+    "Durations are approximate and only cover SUCCESS and ERROR executions."
+
+    min_duration = float
+    max_duration = float
+
+    @classmethod
+    def sample(cls):
+        return cls(
+            state='SUCCESS',
+            workflow_name='flow',
+            period='2016-01-01T10:00:00',
+            count=42,
+            avg_duration=12.5,
+            min_duration=3.0,
+            max_duration=40.0
+        )
+
+
+class ExecutionStats(resource.Resource):
+    """A collection of ExecutionStat resources."""
+
+    stats = [ExecutionStat]
+
+    @classmethod
+    def sample(cls):
+        return cls(stats=[ExecutionStat.sample()])
+
+
+def _get_stats_cache():
+    global _STATS_CACHE
+
+    if _STATS_CACHE is None:
+        _STATS_CACHE = cachetools.TTLCache(
+            maxsize=CONF.api.execution_stats_cache_size,
+            ttl=CONF.api.execution_stats_cache_ttl
+        )
+
+    return _STATS_CACHE
+
+
+def clear_stats_cache():
+    """Intends to be used by tests to reset cached statistics."""
+    global _STATS_CACHE
+
+    with _STATS_CACHE_LOCK:
+        _STATS_CACHE = None
+
+
+def _parse_time(name, value):
+    if not value:
+        return None
+
+    try:
+        return timeutils.normalize_time(timeutils.parse_isotime(value))
+    except ValueError as e:
+        raise exc.InputException("Invalid %s: %s" % (name, e))
+
+
+def _get_stats(kind, db_func, group_by, allowed_group_by, interval,
+               created_from, created_to, filters):
+    group_by = group_by or ['state']
+
+    invalid = set(group_by) - set(allowed_group_by)
+
+    if invalid:
+        raise exc.InputException(
+            "Invalid group_by columns: %s, allowed: %s" %
+            (', '.join(sorted(invalid)), ', '.join(allowed_group_by))
+        )
+
+    created_from = _parse_time('created_from', created_from)
+    created_to = _parse_time('created_to', created_to)
+
+    use_cache = CONF.api.execution_stats_cache_ttl > 0
+
+    # Results depend on the project since queries are scoped by it.
+    key = (
+        kind,
+        security.get_project_id(),
+        tuple(group_by),
+        interval,
+        created_from,
+        created_to,
+        tuple(sorted(filters.items()))
+    )
+
+    stats = None
+
+    if use_cache:
+        with _STATS_CACHE_LOCK:
+            stats = _get_stats_cache().get(key)
+
+    if stats is None:
+        stats = db_func(
+            group_by,
+            interval=interval,
+            created_from=created_from,
+            created_to=created_to,
+            **filters
+        )
+
+        if use_cache:
+            with _STATS_CACHE_LOCK:
+                _get_stats_cache()[key] = stats
+
+    return ExecutionStats(
+        stats=[ExecutionStat.from_dict(s) for s in stats]
+    )
+
+
+class ExecutionStatsController(rest.RestController):
+    @rest_utils.wrap_wsme_controller_exception
+    @wsme_pecan.wsexpose(ExecutionStats, types.uniquelist, INTERVAL_TYPES,
+                         wtypes.text, wtypes.text, wtypes.text, wtypes.text,
+                         wtypes.text)
+    def get_all(self, group_by=None, interval=None, created_from=None,
+                created_to=None, workflow_name=None, workflow_id=None,
+                state=None):
+        """Return aggregate statistics of workflow executions.
+
+        :param group_by: Optional. Columns to group executions by, any of
+                         state, workflow_name and project_id.
+                         Default: state.
+        :param interval: Optional. Also group executions by periods of
+                         creation time: minute, hour, day or month.
+        :param created_from: Optional. Count only executions created at
+                             this time or later.
+        :param created_to: Optional. Count only executions created before
+                           this time.
+        :param workflow_name: Optional. Count only executions of a specific
+                              workflow name.
+        :param workflow_id: Optional. Count only executions of a specific
+                            workflow ID.
+        :param state: Optional. Count only executions in a specific state.
+        """
+        acl.enforce('executions:list', context.ctx())
+
+        filters = rest_utils.filters_to_dict(
+            workflow_name=workflow_name,
+            workflow_id=workflow_id,
+            state=state
+        )
+
+        LOG.info(
+            "Fetch execution statistics. group_by=%s, interval=%s, "
+            "created_from=%s, created_to=%s, filters=%s", group_by,
+            interval, created_from, created_to, filters
+        )
+
+        return _get_stats(
+            'executions',
+            db_api.get_workflow_execution_stats,
+            group_by,
+            EXECUTION_GROUP_BY,
+            interval,
+            created_from,
+            created_to,
+            filters
+        )
+
+
+class TaskStatsController(rest.RestController):
+    @rest_utils.wrap_wsme_controller_exception
+    @wsme_pecan.wsexpose(ExecutionStats, types.uniquelist, INTERVAL_TYPES,
+                         wtypes.text, wtypes.text, wtypes.text, wtypes.text,
+                         wtypes.text, wtypes.text)
+    def get_all(self, group_by=None, interval=None, created_from=None,
+                created_to=None, workflow_name=None, workflow_id=None,
+                workflow_execution_id=None, state=None):
+        """Return aggregate statistics of task executions.
+
+        :param group_by: Optional. Columns to group tasks by, any of state,
+                         workflow_name, project_id and name.
+                         Default: state.
+        :param interval: Optional. Also group tasks by periods of creation
+                         time: minute, hour, day or month.
+        :param created_from: Optional. Count only tasks created at this time
+                             or later.
+        :param created_to: Optional. Count only tasks created before this
+                           time.
+        :param workflow_name: Optional. Count only tasks of a specific
+                              workflow name.
+        :param workflow_id: Optional. Count only tasks of a specific
+                            workflow ID.
+        :param workflow_execution_id: Optional. Count only tasks of a
+                                      specific workflow execution.
+        :param state: Optional. Count only tasks in a specific state.
+        """
+        acl.enforce('tasks:list', context.ctx())
+
+        filters = rest_utils.filters_to_dict(
+            workflow_name=workflow_name,
+            workflow_id=workflow_id,
+            workflow_execution_id=workflow_execution_id,
+            state=state
+        )
+
+        LOG.info(
+            "Fetch task statistics. group_by=%s, interval=%s, "
+            "created_from=%s, created_to=%s, filters=%s", group_by,
+            interval, created_from, created_to, filters
+        )
+
+        return _get_stats(
+            'tasks',
+            db_api.get_task_execution_stats,
+            group_by,
+            TASK_GROUP_BY,
+            interval,
+            created_from,
+            created_to,
+            filters
+        )
@@ -16,6 +16,7 @@
 import json
 
 from oslo_log import log as logging
+from pecan import hooks
 from pecan import rest
 import wsme
 from wsme import types as wtypes
@@ -24,7 +25,9 @@ import wsmeext.pecan as wsme_pecan
 from mistral.api import access_control as acl
 from mistral.api.controllers import resource
 from mistral.api.controllers.v2 import action_execution
+from mistral.api.controllers.v2 import execution_stats
 from mistral.api.controllers.v2 import types
+from mistral.api.hooks import streaming
 from mistral import context
 from mistral.db.v2 import api as db_api
 from mistral.engine.rpc_backend import rpc
@@ -109,9 +112,29 @@ def _get_task_resource_with_result(task_ex):
     return task
 
 
+def _get_task_resources(task_exs, fields):
+    # Results of the whole page are fetched at once and only if needed.
+    results = (
+        data_flow.get_task_execution_results(task_exs)
+        if not fields or 'result' in fields else None
+    )
+
+    tasks = []
+
+    for task_ex in task_exs:
+        task = Task.from_dict(task_ex.to_dict())
+
+        if results is not None:
+            task.result = json.dumps(results[task_ex.id])
+
+        tasks.append(task)
+
+    return tasks
+
+
 def _get_task_resources_with_results(marker=None, limit=None,
                                      sort_keys='created_at', sort_dirs='asc',
-                                     fields='', **filters):
+                                     fields='', stream=False, **filters):
     """Return all tasks within the execution.
 
     Where project_id is the same as the requester or
@@ -131,6 +154,7 @@ def _get_task_resources_with_results(marker=None, limit=None,
                    be returned. 'id' will be included automatically in
                    fields if it's provided, since it will be used when
                    constructing 'next' link.
+    :param stream: Optional. If True, the response is streamed.
     :param filters: Optional. A list of filters to apply to the result.
     """
     return rest_utils.get_all(
@@ -138,18 +162,22 @@ def _get_task_resources_with_results(marker=None, limit=None,
         Task,
         db_api.get_task_executions,
         db_api.get_task_execution,
-        resource_function=_get_task_resource_with_result,
+        resources_function=_get_task_resources,
         marker=marker,
         limit=limit,
         sort_keys=sort_keys,
         sort_dirs=sort_dirs,
         fields=fields,
+        stream=stream,
         **filters
     )
 
 
-class TasksController(rest.RestController):
+class TasksController(rest.RestController, hooks.HookController):
+    __hooks__ = [streaming.StreamingHook()]
+
     action_executions = action_execution.TasksActionExecutionController()
+    stats = execution_stats.TaskStatsController()
 
     @rest_utils.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(Task, wtypes.text)
@@ -166,12 +194,13 @@ class TasksController(rest.RestController):
                          types.list, types.uniquelist, wtypes.text,
                          wtypes.text, types.uuid, types.uuid, STATE_TYPES,
                          wtypes.text, wtypes.text, types.jsontype, bool,
-                         wtypes.text, wtypes.text, bool, types.jsontype)
+                         wtypes.text, wtypes.text, bool, types.jsontype, bool)
     def get_all(self, marker=None, limit=None, sort_keys='created_at',
                 sort_dirs='asc', fields='', name=None, workflow_name=None,
                 workflow_id=None, workflow_execution_id=None, state=None,
                 state_info=None, result=None, published=None, processed=None,
-                created_at=None, updated_at=None, reset=None, env=None):
+                created_at=None, updated_at=None, reset=None, env=None,
+                stream=False):
         """Return all tasks.
 
         Where project_id is the same as the requester or
@@ -213,6 +242,9 @@ class TasksController(rest.RestController):
                            time and date.
         :param updated_at: Optional. Keep only resources with specific latest
                            update time and date.
+        :param stream: Optional. If true, the response is streamed while
+                       reading the database so that memory use doesn't
+                       depend on the number of returned resources.
         """
         acl.enforce('tasks:list', context.ctx())
 
@@ -242,6 +274,7 @@ class TasksController(rest.RestController):
             sort_keys=sort_keys,
             sort_dirs=sort_dirs,
             fields=fields,
+            stream=stream,
             **filters
         )
 
@@ -24,6 +24,7 @@ from mistral.api import access_control as acl
 from mistral.api.controllers import resource
 from mistral.api.controllers.v2 import types
 from mistral.api.controllers.v2 import validation
+from mistral.api.hooks import conditional_get
 from mistral.api.hooks import content_type as ct_hook
 from mistral import context
 from mistral.db.v2 import api as db_api
@@ -79,7 +80,10 @@ class Workbooks(resource.ResourceList):
 
 
 class WorkbooksController(rest.RestController, hooks.HookController):
-    __hooks__ = [ct_hook.ContentTypeHook("application/json", ['POST', 'PUT'])]
+    __hooks__ = [
+        ct_hook.ContentTypeHook("application/json", ['POST', 'PUT']),
+        conditional_get.ConditionalGetHook()
+    ]
 
     validate = validation.SpecValidationController(
         spec_parser.get_workbook_spec_from_yaml)
@@ -91,8 +95,13 @@ class WorkbooksController(rest.RestController, hooks.HookController):
         acl.enforce('workbooks:get', context.ctx())
         LOG.info("Fetch workbook [name=%s]" % name)
 
+        if rest_utils.is_not_modified(db_api.get_workbook_version, name):
+            return
+
         db_model = db_api.get_workbook(name)
 
+        rest_utils.set_cache_headers(db_model)
+
         return Workbook.from_dict(db_model.to_dict())
 
     @rest_utils.wrap_pecan_controller_exception
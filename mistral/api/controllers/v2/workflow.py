@@ -27,6 +27,7 @@ from mistral.api.controllers import resource
 from mistral.api.controllers.v2 import member
 from mistral.api.controllers.v2 import types
 from mistral.api.controllers.v2 import validation
+from mistral.api.hooks import conditional_get
 from mistral.api.hooks import content_type as ct_hook
 from mistral import context
 from mistral.db.v2 import api as db_api
@@ -119,7 +120,10 @@ class WorkflowsController(rest.RestController, hooks.HookController):
     # TODO(nmakhotkin): Have a discussion with pecan/WSME folks in order
     # to have requests and response of different content types. Then
     # delete ContentTypeHook.
-    __hooks__ = [ct_hook.ContentTypeHook("application/json", ['POST', 'PUT'])]
+    __hooks__ = [
+        ct_hook.ContentTypeHook("application/json", ['POST', 'PUT']),
+        conditional_get.ConditionalGetHook()
+    ]
 
     validate = validation.SpecValidationController(
         spec_parser.get_workflow_list_spec_from_yaml)
@@ -157,8 +161,14 @@ class WorkflowsController(rest.RestController, hooks.HookController):
         acl.enforce('workflows:get', context.ctx())
         LOG.info("Fetch workflow [identifier=%s]" % identifier)
 
+        if rest_utils.is_not_modified(
+                db_api.get_workflow_definition_version, identifier):
+            return
+
         db_model = db_api.get_workflow_definition(identifier)
 
+        rest_utils.set_cache_headers(db_model)
+
         return Workflow.from_dict(db_model.to_dict())
 
     @rest_utils.wrap_pecan_controller_exception
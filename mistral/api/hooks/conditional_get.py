@@ -0,0 +1,40 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from pecan import hooks
+
+from mistral.utils import rest_utils
+
+
+class ConditionalGetHook(hooks.PecanHook):
+    """Conditional GET hook.
+
+    WSME always renders a body with status 200 for a successful call.
+    This hook turns the response into "304 Not Modified" without a body
+    if rest_utils.is_not_modified() found out that the client already
+    has the current version of the requested object.
+    """
+
+    def after(self, state):
+        if not state.request.context.pop(rest_utils.NOT_MODIFIED_KEY, False):
+            return
+
+        if state.response.status_int != 200:
+            return
+
+        state.response.status = 304
+        state.response.body = b''
+
+        del state.response.content_type
@@ -0,0 +1,43 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from pecan import hooks
+
+from mistral.utils import rest_utils
+
+
+class StreamingHook(hooks.PecanHook):
+    """Streaming hook.
+
+    WSME always renders the whole value returned by a controller. This hook
+    replaces the rendered body with the iterator left in the request
+    context by rest_utils.get_all(stream=True) so that the response is
+    written incrementally by the WSGI server.
+    """
+
+    def after(self, state):
+        app_iter = state.request.context.pop(rest_utils.STREAM_KEY, None)
+
+        if app_iter is None:
+            return
+
+        if state.response.status_int != 200:
+            app_iter.close()
+
+            return
+
+        state.response.content_type = 'application/json'
+        state.response.app_iter = app_iter
+        state.response.content_length = None
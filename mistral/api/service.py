@@ -0,0 +1,66 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from oslo_concurrency import processutils
+from oslo_config import cfg
+from oslo_service import service
+from oslo_service import wsgi
+
+from mistral.api import app
+
+
+CONF = cfg.CONF
+
+
+class WSGIService(service.ServiceBase):
+    """Serves Mistral API with eventlet WSGI server.
+
+    The listening socket is opened by the parent process and shared by all
+    worker processes. The application itself (DB engine, RPC clients,
+    coordination membership etc.) is created in each worker after it's
+    forked so that workers don't share connections.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.workers = (
+            CONF.api.api_workers or processutils.get_worker_count()
+        )
+
+        self.server = wsgi.Server(
+            CONF,
+            name,
+            None,
+            host=CONF.api.host,
+            port=CONF.api.port,
+            backlog=CONF.api.backlog
+        )
+
+    def start(self):
+        if self.server.app is None:
+            self.server.app = app.setup_app()
+
+        self.server.start()
+
+    def stop(self):
+        # Stops accepting new connections, requests being processed
+        # are finished in wait().
+        self.server.stop()
+
+    def wait(self):
+        self.server.wait()
+
+    def reset(self):
+        self.server.reset()
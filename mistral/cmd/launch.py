@@ -38,8 +38,15 @@ POSSIBLE_TOPDIR = os.path.normpath(os.path.join(os.path.abspath(sys.argv[0]),
 if os.path.exists(os.path.join(POSSIBLE_TOPDIR, 'mistral', '__init__.py')):
     sys.path.insert(0, POSSIBLE_TOPDIR)
 
+from mistral.cmd import startup_profiler
+
+# Enabled before importing anything else so that all imports are measured.
+if '--profile-startup' in sys.argv:
+    startup_profiler.start()
+
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_service import service
 
 if six.PY3 is True:
     import socketserver
@@ -49,14 +56,11 @@ else:
 from wsgiref import simple_server
 from wsgiref.simple_server import WSGIServer
 
-from mistral.api import app
+# NOTE: Modules specific to API, engine or executor are imported when the
+# corresponding server is launched so that a process doesn't pay for
+# importing (and initializing) components it doesn't run.
 from mistral import config
-from mistral.db.v2 import api as db_api
-from mistral.engine import default_engine as def_eng
-from mistral.engine import default_executor as def_executor
 from mistral.engine.rpc_backend import rpc
-from mistral.services import expiration_policy
-from mistral.services import scheduler
 from mistral.utils import profiler
 from mistral.utils import rpc_utils
 from mistral import version
@@ -67,18 +71,33 @@ CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
+def _report_startup(server_name):
+    if startup_profiler.is_enabled():
+        LOG.info(
+            "Startup profile of %s:\n%s",
+            server_name,
+            startup_profiler.report()
+        )
+
+
 def launch_executor():
-    profiler.setup('mistral-executor', cfg.CONF.executor.host)
+    with startup_profiler.phase('executor: import'):
+        from mistral.engine import default_executor as def_executor
+
+    with startup_profiler.phase('executor: init'):
+        profiler.setup('mistral-executor', cfg.CONF.executor.host)
 
-    executor_v2 = def_executor.DefaultExecutor(rpc.get_engine_client())
-    executor_endpoint = rpc.ExecutorServer(executor_v2)
+        executor_v2 = def_executor.DefaultExecutor(rpc.get_engine_client())
+        executor_endpoint = rpc.ExecutorServer(executor_v2)
 
-    executor_server = rpc.get_rpc_server_driver()(
-        rpc_utils.get_rpc_info_from_oslo(CONF.executor)
-    )
-    executor_server.register_endpoint(executor_endpoint)
+        executor_server = rpc.get_rpc_server_driver()(
+            rpc_utils.get_rpc_info_from_oslo(CONF.executor)
+        )
+        executor_server.register_endpoint(executor_endpoint)
 
-    executor_v2.register_membership()
+        executor_v2.register_membership()
+
+    _report_startup('executor')
 
     try:
         executor_server.run()
@@ -89,25 +108,34 @@ def launch_executor():
 
 
 def launch_engine():
-    profiler.setup('mistral-engine', cfg.CONF.engine.host)
+    with startup_profiler.phase('engine: import'):
+        from mistral.db.v2 import api as db_api
+        from mistral.engine import default_engine as def_eng
+        from mistral.services import expiration_policy
+        from mistral.services import scheduler
+
+    with startup_profiler.phase('engine: init'):
+        profiler.setup('mistral-engine', cfg.CONF.engine.host)
+
+        engine_v2 = def_eng.DefaultEngine(rpc.get_engine_client())
 
-    engine_v2 = def_eng.DefaultEngine(rpc.get_engine_client())
+        engine_endpoint = rpc.EngineServer(engine_v2)
 
-    engine_endpoint = rpc.EngineServer(engine_v2)
+        # Setup scheduler in engine.
+        db_api.setup_db()
+        scheduler.setup()
 
-    # Setup scheduler in engine.
-    db_api.setup_db()
-    scheduler.setup()
+        # Setup expiration policy
+        expiration_policy.setup()
 
-    # Setup expiration policy
-    expiration_policy.setup()
+        engine_server = rpc.get_rpc_server_driver()(
+            rpc_utils.get_rpc_info_from_oslo(CONF.engine)
+        )
+        engine_server.register_endpoint(engine_endpoint)
 
-    engine_server = rpc.get_rpc_server_driver()(
-        rpc_utils.get_rpc_info_from_oslo(CONF.engine)
-    )
-    engine_server.register_endpoint(engine_endpoint)
+        engine_v2.register_membership()
 
-    engine_v2.register_membership()
+    _report_startup('engine')
 
     try:
         engine_server.run()
@@ -121,16 +149,45 @@ class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
     pass
 
 
+def launch_api_workers():
+    with startup_profiler.phase('api: import'):
+        from mistral.api import service as api_service
+
+    with startup_profiler.phase('api: init'):
+        api_server = api_service.WSGIService('mistral_api')
+
+    _report_startup('api')
+
+    launcher = service.ProcessLauncher(CONF)
+    launcher.launch_service(api_server, workers=api_server.workers)
+
+    LOG.info("Mistral API is serving on http://%s:%s with %s workers "
+             "(PID=%s)" % (api_server.server.host, api_server.server.port,
+                           api_server.workers, os.getpid()))
+
+    # Restarts workers if they die and gracefully reloads them on SIGHUP.
+    launcher.wait()
+
+
 def launch_api():
+    if cfg.CONF.api.server_type == 'eventlet':
+        return launch_api_workers()
+
     host = cfg.CONF.api.host
     port = cfg.CONF.api.port
 
-    api_server = simple_server.make_server(
-        host,
-        port,
-        app.setup_app(),
-        ThreadingWSGIServer
-    )
+    with startup_profiler.phase('api: import'):
+        from mistral.api import app
+
+    with startup_profiler.phase('api: init'):
+        api_server = simple_server.make_server(
+            host,
+            port,
+            app.setup_app(),
+            ThreadingWSGIServer
+        )
+
+    _report_startup('api')
 
     LOG.info("Mistral API is serving on http://%s:%s (PID=%s)" %
              (host, port, os.getpid()))
@@ -228,16 +285,25 @@ def main():
         rpc.get_transport()
 
         if cfg.CONF.server == ['all']:
-            # Launch all servers.
-            launch_any(LAUNCH_OPTIONS.keys())
+            servers = set(LAUNCH_OPTIONS.keys())
         else:
             # Validate launch option.
             if set(cfg.CONF.server) - set(LAUNCH_OPTIONS.keys()):
                 raise Exception('Valid options are all or any combination of '
                                 'api, engine, and executor.')
 
-            # Launch distinct set of server(s).
-            launch_any(set(cfg.CONF.server))
+            servers = set(cfg.CONF.server)
+
+        # Forked API workers would inherit green threads of the engine and
+        # executor running in the same process.
+        if cfg.CONF.api.server_type == 'eventlet' and servers != {'api'}:
+            raise RuntimeError(
+                'API server type "eventlet" requires the API to be launched '
+                'alone (--server api).'
+            )
+
+        # Launch distinct set of server(s).
+        launch_any(servers)
 
     except RuntimeError as excp:
         sys.stderr.write("ERROR: %s\n" % excp)
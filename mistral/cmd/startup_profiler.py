@@ -0,0 +1,153 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Measures import and initialization time of Mistral services.
+
+The module doesn't import anything heavy so that it can be enabled before
+the rest of the service is imported (see '--profile-startup' option of
+the launch script).
+"""
+
+import collections
+import contextlib
+import sys
+import threading
+import time
+
+from six.moves import builtins
+
+
+_PROFILER = None
+
+
+class StartupProfiler(object):
+    def __init__(self, timer=time.time):
+        self._timer = timer
+        self._local = threading.local()
+        self._orig_import = None
+
+        # {module name: (self time, cumulative time)}
+        self.imports = {}
+
+        # {phase name: time}
+        self.phases = collections.OrderedDict()
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+
+        if stack is None:
+            stack = self._local.stack = []
+
+        return stack
+
+    def _import(self, name, *args, **kwargs):
+        # Only the first import of a module is worth measuring.
+        if name in sys.modules:
+            return self._orig_import(name, *args, **kwargs)
+
+        stack = self._get_stack()
+
+        # Time spent importing nested modules.
+        stack.append(0.0)
+
+        started = self._timer()
+
+        try:
+            return self._orig_import(name, *args, **kwargs)
+        finally:
+            total = self._timer() - started
+            nested = stack.pop()
+
+            if stack:
+                stack[-1] += total
+
+            if name in sys.modules and name not in self.imports:
+                self.imports[name] = (total - nested, total)
+
+    def start(self):
+        if self._orig_import is None:
+            self._orig_import = builtins.__import__
+
+            builtins.__import__ = self._import
+
+    def stop(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+
+            self._orig_import = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = self._timer()
+
+        try:
+            yield
+        finally:
+            self.phases[name] = self._timer() - started
+
+    def report(self, limit=30):
+        """Returns text report with the slowest imports and phases."""
+        lines = [
+            'Imported %s modules in %.3f s, slowest (self, cumulative):' %
+            (
+                len(self.imports),
+                sum(t[0] for t in self.imports.values())
+            )
+        ]
+
+        slowest = sorted(
+            self.imports.items(),
+            key=lambda i: i[1][0],
+            reverse=True
+        )
+
+        for name, (self_time, total) in slowest[:limit]:
+            lines.append('  %8.3f %8.3f  %s' % (self_time, total, name))
+
+        if self.phases:
+            lines.append('Initialization:')
+
+            for name, duration in self.phases.items():
+                lines.append('  %8.3f  %s' % (duration, name))
+
+        return '\n'.join(lines)
+
+
+def start():
+    """Starts measuring imports of the process."""
+    global _PROFILER
+
+    if _PROFILER is None:
+        _PROFILER = StartupProfiler()
+
+    _PROFILER.start()
+
+
+def is_enabled():
+    return _PROFILER is not None
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Measures an initialization phase if profiling is enabled."""
+    if _PROFILER is None:
+        yield
+    else:
+        with _PROFILER.phase(name):
+            yield
+
+
+def report(limit=30):
+    return _PROFILER.report(limit) if _PROFILER else ''
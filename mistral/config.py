@@ -43,6 +43,14 @@ wf_trace_log_name_opt = cfg.StrOpt(
     help='Logger name for pretty workflow trace output.'
 )
 
+profile_startup_opt = cfg.BoolOpt(
+    'profile-startup',
+    default=False,
+    help='Enables measuring of import and initialization time of modules '
+         'when a server is launched. The slowest modules are logged once '
+         'the server is initialized.'
+)
+
 use_debugger_opt = cfg.BoolOpt(
     'use-debugger',
     default=False,
@@ -61,11 +69,75 @@ auth_type_opt = cfg.StrOpt(
 api_opts = [
     cfg.StrOpt('host', default='0.0.0.0', help='Mistral API server host'),
     cfg.PortOpt('port', default=8989, help='Mistral API server port'),
+    cfg.StrOpt(
+        'server_type',
+        default='simple',
+        choices=['simple', 'eventlet'],
+        help='Type of HTTP server used for Mistral API. "simple" serves '
+             'requests in a single process with one thread per request. '
+             '"eventlet" pre-forks api_workers processes each serving '
+             'requests in a pool of green threads with keep-alive '
+             'connections (see [DEFAULT]/wsgi_default_pool_size, '
+             'wsgi_keep_alive and client_socket_timeout). Workers are '
+             'gracefully restarted on SIGHUP. "eventlet" requires the API '
+             'to be launched alone (--server api).'
+    ),
+    cfg.IntOpt(
+        'api_workers',
+        min=0,
+        default=0,
+        help='Number of API worker processes if server_type is "eventlet". '
+             '0 means the number of CPUs available.'
+    ),
+    cfg.IntOpt(
+        'backlog',
+        min=1,
+        default=128,
+        help='Maximum number of connections queued by the API socket if '
+             'server_type is "eventlet".'
+    ),
     cfg.BoolOpt(
         'allow_action_execution_deletion',
         default=False,
         help='Enables the ability to delete action_execution which '
              'has no relationship with workflows.'
+    ),
+    cfg.IntOpt(
+        'streaming_batch_size',
+        min=1,
+        default=100,
+        help='Number of DB rows fetched at once when a list of executions, '
+             'tasks or action executions is streamed.'
+    ),
+    cfg.IntOpt(
+        'execution_stats_cache_ttl',
+        min=0,
+        default=0,
+        help='Number of seconds results of execution and task statistics '
+             'queries are cached for per project. 0 disables caching.'
+    ),
+    cfg.IntOpt(
+        'execution_stats_cache_size',
+        min=1,
+        default=1000,
+        help='Maximum number of cached results of execution and task '
+             'statistics queries.'
+    ),
+    cfg.IntOpt(
+        'max_wait_for_state_change',
+        min=0,
+        default=60,
+        help='Maximum number of seconds a request to get an execution '
+             'waits for its state change (wait_for_state_change parameter).'
+    ),
+    cfg.IntOpt(
+        'policy_cache_size',
+        min=0,
+        default=1000,
+        help='Maximum number of cached policy enforcement decisions. '
+             'Decisions are cached per rule and roles, project, user and '
+             'admin flag of the request and dropped when policy rules are '
+             'reloaded. 0 disables caching.'
     )
 ]
 
@@ -85,6 +157,15 @@ os_endpoint_type = cfg.StrOpt(
          ' communication with OpenStack services.'
 )
 
+os_actions_manifest_opt = cfg.StrOpt(
+    'openstack_actions_manifest_path',
+    help='Path of a file caching metadata of generated OpenStack actions '
+         '(names, arguments, descriptions). If set, introspection of '
+         'OpenStack clients is skipped on system action synchronization '
+         'as long as versions of installed packages and the actions '
+         'mapping are the same.'
+)
+
 pecan_opts = [
     cfg.StrOpt(
         'root',
@@ -135,7 +216,169 @@ engine_opts = [
         'dtw_scheduler_last_minute',
         default=True,
         help='Boolean to determine whether we use last minute scheduler or schedule immediately.'
-    )    
+    ),
+    cfg.StrOpt(
+        'dtw_scheduler',
+        choices=['immediate', 'last_minute', 'deadline'],
+        help='Scheduler of delay tolerant workloads. "deadline" starts '
+             'workloads in earliest deadline first order keeping the number '
+             'of concurrently running workloads within '
+             'dtw_max_concurrent_executions. If not set, '
+             'dtw_scheduler_last_minute determines the scheduler.'
+    ),
+    cfg.IntOpt(
+        'dtw_max_concurrent_executions',
+        min=1,
+        default=10,
+        help='Maximum number of delay tolerant workloads running at the same '
+             'time in the whole cluster if dtw_scheduler is "deadline". '
+             'Processes polling workloads at the same moment may exceed it '
+             'until the next polling.'
+    ),
+    cfg.IntOpt(
+        'dtw_scheduling_slot',
+        min=1,
+        default=60,
+        help='Length in seconds of the time slots capacity is planned in if '
+             'dtw_scheduler is "deadline".'
+    ),
+    cfg.BoolOpt(
+        'dtw_rebalancing',
+        default=False,
+        help='Enables moving planned starts of delay tolerant workloads '
+             'depending on the cluster load. The load is the number of '
+             'running workflow executions compared to '
+             'dtw_max_concurrent_executions and saturation of executors. '
+             'On overload workloads with slack are postponed, otherwise '
+             'workloads are started earlier to use free capacity.'
+    ),
+    cfg.IntOpt(
+        'dtw_rebalancing_window',
+        min=1,
+        default=300,
+        help='Workloads planned to start within this number of seconds '
+             'are postponed on overload.'
+    ),
+    cfg.IntOpt(
+        'dtw_postpone_delay',
+        min=1,
+        default=60,
+        help='Number of seconds a workload is postponed by on overload.'
+    ),
+    cfg.BoolOpt(
+        'dtw_duration_estimates',
+        default=False,
+        help='Enables collecting duration statistics of successful workflow '
+             'executions. Delay tolerant workloads are scheduled using the '
+             'estimated duration if it is larger than job_duration or if '
+             'job_duration is not specified.'
+    ),
+    cfg.FloatOpt(
+        'dtw_duration_percentile',
+        min=0,
+        max=100,
+        default=90,
+        help='Percentile of workflow execution durations used as the '
+             'estimated duration.'
+    ),
+    cfg.IntOpt(
+        'dtw_duration_min_samples',
+        min=1,
+        default=5,
+        help='Minimum number of workflow executions needed to estimate '
+             'the duration.'
+    ),
+    cfg.IntOpt(
+        'dtw_bulk_max_size',
+        min=1,
+        default=1000,
+        help='Maximum number of delay tolerant workloads that can be '
+             'created with one bulk request.'
+    ),
+    cfg.BoolOpt(
+        'cron_trigger_timing_wheel',
+        default=False,
+        help='Enables keeping fire times of cron triggers in memory. Cron '
+             'triggers are partitioned between API processes of the '
+             'coordination group and the database is only queried for '
+             'triggers that are due.'
+    ),
+    cfg.IntOpt(
+        'cron_trigger_wheel_refresh_interval',
+        min=1,
+        default=10,
+        help='Number of seconds between loading cron triggers changed by '
+             'other processes into the timing wheel.'
+    ),
+    cfg.IntOpt(
+        'cron_trigger_wheel_resync_interval',
+        min=1,
+        default=300,
+        help='Number of seconds between full reloads of the cron trigger '
+             'timing wheel.'
+    ),
+    cfg.IntOpt(
+        'cron_trigger_batch_size',
+        min=1,
+        default=100,
+        help='Maximum number of due cron triggers advanced with one '
+             'database statement.'
+    ),
+    cfg.IntOpt(
+        'cron_trigger_start_pool_size',
+        min=1,
+        default=16,
+        help='Maximum number of workflows started by cron triggers '
+             'concurrently.'
+    ),
+    cfg.IntOpt(
+        'cron_pattern_cache_size',
+        default=1000,
+        help='Maximum number of compiled cron patterns kept in the cache. '
+             'Use 0 to disable caching.'
+    ),
+    cfg.IntOpt(
+        'dtw_polling_batch_size',
+        min=1,
+        default=100,
+        help='Number of unscheduled delay tolerant workloads read from '
+             'the database at once.'
+    ),
+    cfg.BoolOpt(
+        'executor_load_balancing',
+        default=False,
+        help='Enables routing of actions to the least loaded executor based '
+             'on the load executors advertise via the coordination backend. '
+             'If all executors are saturated new actions are postponed. '
+             'Every executor must have a unique [executor]/host.'
+    ),
+    cfg.FloatOpt(
+        'executor_load_refresh_interval',
+        default=5.0,
+        help='Number of seconds executor load information is cached by the '
+             'engine.'
+    ),
+    cfg.IntOpt(
+        'executor_backpressure_delay',
+        default=1,
+        help='Number of seconds scheduling of an action is postponed if all '
+             'executors are saturated.'
+    ),
+    cfg.BoolOpt(
+        'state_change_notifications',
+        default=False,
+        help='Enables sending notifications about state changes of workflow '
+             'and task executions through the message bus so that API '
+             'servers running in other processes can answer requests '
+             'waiting for state changes. Within one process notifications '
+             'are always delivered.'
+    ),
+    cfg.StrOpt(
+        'state_change_notifications_topic',
+        default='mistral_state_changes',
+        help='Topic notifications about state changes of executions are '
+             'sent to.'
+    )
 ]
 
 executor_opts = [
@@ -155,6 +398,74 @@ executor_opts = [
         'version',
         default='1.0',
         help='The version of the executor.'
+    ),
+    cfg.IntOpt(
+        'action_class_cache_size',
+        default=500,
+        help='Maximum number of constructed action classes kept in the '
+             'executor cache. Use 0 to disable caching.'
+    ),
+    cfg.BoolOpt(
+        'pool_action_clients',
+        default=False,
+        help='Enables reusing of client objects (e.g. OpenStack clients, '
+             'HTTP sessions) by actions that declare them reusable.'
+    ),
+    cfg.IntOpt(
+        'action_client_pool_ttl',
+        default=300,
+        help='Number of seconds a pooled action client is kept before it '
+             'is created again.'
+    ),
+    cfg.IntOpt(
+        'action_client_pool_size',
+        default=100,
+        help='Maximum number of pooled action clients.'
+    ),
+    cfg.BoolOpt(
+        'async_mode',
+        default=False,
+        help='Enables asynchronous executor mode. In this mode actions '
+             'providing run_async() run concurrently in green threads and '
+             'all other actions run in a bounded pool of native threads.'
+    ),
+    cfg.IntOpt(
+        'async_pool_size',
+        default=1000,
+        help='Maximum number of actions running concurrently in green '
+             'threads in async mode.'
+    ),
+    cfg.IntOpt(
+        'sync_thread_pool_size',
+        default=20,
+        help='Maximum number of native threads running actions that do not '
+             'provide run_async() in async mode.'
+    ),
+    cfg.IntOpt(
+        'process_pool_size',
+        default=0,
+        help='Number of pre-forked worker processes running CPU-bound '
+             'actions. Use 0 to run all actions in the executor process.'
+    ),
+    cfg.IntOpt(
+        'process_pool_max_tasks_per_child',
+        default=100,
+        help='Number of actions a worker process runs before it is replaced '
+             'with a fresh one. Use 0 for no limit.'
+    ),
+    cfg.ListOpt(
+        'process_pool_actions',
+        default=['mistral.actions.std_actions.JavaScriptAction'],
+        help='Action classes (in dot notation) that always run in the '
+             'process pool in addition to those declaring attribute '
+             'run_in_process.'
+    ),
+    cfg.IntOpt(
+        'process_pool_action_timeout',
+        default=0,
+        help='Number of seconds the executor waits for an action running in '
+             'the process pool before reporting it as failed. Use 0 for no '
+             'limit.'
     )
 ]
 
@@ -207,6 +518,28 @@ keycloak_oidc_opts = [
         'insecure',
         default=False,
         help='If True, SSL/TLS certificate verification is disabled'
+    ),
+    cfg.IntOpt(
+        'token_cache_size',
+        default=1000,
+        min=0,
+        help='Maximum number of validated access tokens kept in memory '
+             'to avoid calling Keycloak on every request. 0 disables '
+             'caching.'
+    ),
+    cfg.IntOpt(
+        'token_cache_ttl',
+        default=60,
+        min=1,
+        help='Number of seconds a validated access token is trusted '
+             'without calling Keycloak again. Tokens are never trusted '
+             'after their expiration time.'
+    ),
+    cfg.IntOpt(
+        'http_pool_size',
+        default=10,
+        min=1,
+        help='Maximum number of pooled HTTP connections to Keycloak.'
     )
 ]
 
@@ -238,16 +571,24 @@ CONF.register_opts(profiler_opts, group=PROFILER_GROUP)
 CONF.register_opt(rpc_impl_opt)
 CONF.register_opts(keycloak_oidc_opts, group=KEYCLOAK_OIDC_GROUP)
 CONF.register_opt(os_endpoint_type)
+CONF.register_opt(os_actions_manifest_opt)
 
 
 CLI_OPTS = [
     use_debugger_opt,
+    profile_startup_opt,
     launch_opt
 ]
 
 default_group_opts = itertools.chain(
     CLI_OPTS,
-    [wf_trace_log_name_opt, auth_type_opt, rpc_impl_opt, os_endpoint_type]
+    [
+        wf_trace_log_name_opt,
+        auth_type_opt,
+        rpc_impl_opt,
+        os_endpoint_type,
+        os_actions_manifest_opt
+    ]
 )
 
 CONF.register_cli_opts(CLI_OPTS)
@@ -13,6 +13,12 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import base64
+import hashlib
+import threading
+import time
+
+import cachetools
 import eventlet
 from keystoneclient.v3 import client as keystone_client
 import logging
@@ -24,6 +30,7 @@ import pecan
 from pecan import hooks
 import pprint
 import requests
+from requests import adapters
 
 from mistral import exceptions as exc
 from mistral import utils
@@ -37,6 +44,17 @@ CONF = cfg.CONF
 _CTX_THREAD_LOCAL_NAME = "MISTRAL_APP_CTX_THREAD_LOCAL"
 ALLOWED_WITHOUT_AUTH = ['/', '/v2/']
 
+# Access tokens validated by Keycloak.
+# {(realm name, token hash): (expiration timestamp, user info)}
+_KEYCLOAK_TOKEN_CACHE = None
+
+# Validations being made at the moment. {cache key: _InFlightValidation}
+_KEYCLOAK_IN_FLIGHT = {}
+
+_KEYCLOAK_LOCK = threading.Lock()
+
+_KEYCLOAK_SESSION = None
+
 
 class BaseContext(object):
     """Container for context variables."""
@@ -252,9 +270,96 @@ def authenticate_with_keystone(req):
     raise exc.UnauthorizedException(msg)
 
 
-def authenticate_with_keycloak(req):
-    realm_name = req.headers.get('X-Project-Id')
+class _InFlightValidation(object):
+    """Result of a token validation shared by concurrent requests."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
+
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+
+def _get_keycloak_session():
+    global _KEYCLOAK_SESSION
+
+    if _KEYCLOAK_SESSION is None:
+        pool_size = CONF.keycloak_oidc.http_pool_size
+
+        session = requests.Session()
+
+        adapter = adapters.HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size
+        )
+
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        _KEYCLOAK_SESSION = session
+
+    return _KEYCLOAK_SESSION
+
+
+def _get_keycloak_token_cache():
+    global _KEYCLOAK_TOKEN_CACHE
+
+    if _KEYCLOAK_TOKEN_CACHE is None:
+        _KEYCLOAK_TOKEN_CACHE = cachetools.TTLCache(
+            maxsize=CONF.keycloak_oidc.token_cache_size,
+            ttl=CONF.keycloak_oidc.token_cache_ttl
+        )
+
+    return _KEYCLOAK_TOKEN_CACHE
+
+
+def clear_keycloak_token_cache():
+    """Intends to be used by tests to forget validated tokens."""
+    global _KEYCLOAK_TOKEN_CACHE
+    global _KEYCLOAK_SESSION
+
+    with _KEYCLOAK_LOCK:
+        _KEYCLOAK_TOKEN_CACHE = None
+
+        if _KEYCLOAK_SESSION is not None:
+            _KEYCLOAK_SESSION.close()
+
+            _KEYCLOAK_SESSION = None
+
+
+def _get_token_expiration(access_token):
+    """Returns 'exp' claim of a JWT access token without verifying it.
+
+    The token is only trusted after Keycloak has accepted it, the claim is
+    used to make sure it's not trusted any longer than it's valid.
+    """
+    try:
+        payload = access_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
 
+        exp = jsonutils.loads(base64.urlsafe_b64decode(str(payload)))['exp']
+
+        return float(exp)
+    except Exception:
+        return None
+
+
+def _request_user_info(realm_name, access_token):
     # NOTE(rakhmerov): There's a special endpoint for introspecting
     # access tokens described in OpenID Connect specification but it's
     # available in KeyCloak starting only with version 1.8.Final so we have
@@ -265,9 +370,7 @@ def authenticate_with_keycloak(req):
         (CONF.keycloak_oidc.auth_url, realm_name)
     )
 
-    access_token = req.headers.get('X-Auth-Token')
-
-    resp = requests.get(
+    resp = _get_keycloak_session().get(
         user_info_endpoint,
         headers={"Authorization": "Bearer %s" % access_token},
         verify=not CONF.keycloak_oidc.insecure
@@ -275,11 +378,79 @@ def authenticate_with_keycloak(req):
 
     resp.raise_for_status()
 
+    user_info = resp.json()
+
     LOG.debug(
         "HTTP response from OIDC provider: %s" %
-        pprint.pformat(resp.json())
+        pprint.pformat(user_info)
     )
 
+    return user_info
+
+
+def _validate_keycloak_token(realm_name, access_token):
+    """Validates the token, calling Keycloak only if it's not cached.
+
+    Concurrent validations of the same token wait for a single request
+    to Keycloak. Failed validations are not cached.
+    """
+    if CONF.keycloak_oidc.token_cache_size <= 0:
+        return _request_user_info(realm_name, access_token)
+
+    key = (
+        realm_name,
+        hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+    )
+
+    with _KEYCLOAK_LOCK:
+        cached = _get_keycloak_token_cache().get(key)
+
+        if cached and (cached[0] is None or cached[0] > time.time()):
+            return cached[1]
+
+        in_flight = _KEYCLOAK_IN_FLIGHT.get(key)
+
+        if in_flight:
+            is_owner = False
+        else:
+            in_flight = _KEYCLOAK_IN_FLIGHT[key] = _InFlightValidation()
+            is_owner = True
+
+    if not is_owner:
+        return in_flight.wait()
+
+    try:
+        user_info = _request_user_info(realm_name, access_token)
+    except Exception as e:
+        with _KEYCLOAK_LOCK:
+            _KEYCLOAK_IN_FLIGHT.pop(key, None)
+
+        in_flight.set_error(e)
+
+        raise
+
+    with _KEYCLOAK_LOCK:
+        _get_keycloak_token_cache()[key] = (
+            _get_token_expiration(access_token),
+            user_info
+        )
+
+        _KEYCLOAK_IN_FLIGHT.pop(key, None)
+
+    in_flight.set_result(user_info)
+
+    return user_info
+
+
+def authenticate_with_keycloak(req):
+    realm_name = req.headers.get('X-Project-Id')
+    access_token = req.headers.get('X-Auth-Token')
+
+    if not access_token:
+        raise exc.UnauthorizedException('Authentication required')
+
+    _validate_keycloak_token(realm_name, access_token)
+
 
 class ContextHook(hooks.PecanHook):
     def before(self, state):
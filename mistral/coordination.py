@@ -75,6 +75,10 @@ class ServiceCoordinator(object):
             self._coordinator = None
             self._started = False
 
+    @property
+    def member_id(self):
+        return self._my_id
+
     def is_active(self):
         return self._coordinator and self._started
 
@@ -96,12 +100,12 @@ class ServiceCoordinator(object):
             self._started = False
 
     @retry(stop_max_attempt_number=5)
-    def join_group(self, group_id):
+    def join_group(self, group_id, capabilities=b''):
         if not self.is_active() or not group_id:
             return
 
         try:
-            join_req = self._coordinator.join_group(group_id)
+            join_req = self._coordinator.join_group(group_id, capabilities)
             join_req.get()
 
             LOG.info(
@@ -134,6 +138,46 @@ class ServiceCoordinator(object):
                 self._my_id
             )
 
+    def update_capabilities(self, group_id, capabilities):
+        """Publishes capabilities of this member to the group."""
+        if not self.is_active():
+            return
+
+        try:
+            self._coordinator.update_capabilities(
+                group_id,
+                capabilities
+            ).get()
+        except tooz.coordination.ToozError as e:
+            LOG.warning(
+                'Failed to update capabilities in group %s: %s',
+                group_id,
+                six.text_type(e)
+            )
+
+    def get_members_capabilities(self, group_id):
+        """Gets capabilities of all members of coordination group.
+
+        :return: Dictionary {member_id: capabilities}.
+        """
+        members = self.get_members(group_id)
+
+        # Send all requests first so that they are processed concurrently.
+        reqs = [
+            (m, self._coordinator.get_member_capabilities(group_id, m))
+            for m in members
+        ]
+
+        result = {}
+
+        for member_id, req in reqs:
+            try:
+                result[member_id] = req.get()
+            except tooz.coordination.MemberNotJoined:
+                pass
+
+        return result
+
     def get_members(self, group_id):
         """Gets members of coordination group.
 
@@ -179,6 +223,27 @@ class Service(object):
         self.group_type = group_type
         self._tg = None
 
+    def get_capabilities(self):
+        """Returns capabilities advertised to the group with heartbeats.
+
+        Subclasses may override it to let other services know about their
+        state (e.g. current load). None means nothing is advertised.
+        """
+        return None
+
+    def _heartbeat(self):
+        service_coordinator = get_service_coordinator()
+
+        service_coordinator.heartbeat()
+
+        capabilities = self.get_capabilities()
+
+        if capabilities is not None:
+            service_coordinator.update_capabilities(
+                self.group_type,
+                capabilities
+            )
+
     @lockutils.synchronized('service_coordinator')
     def register_membership(self):
         """Registers group membership.
@@ -191,13 +256,16 @@ class Service(object):
         service_coordinator = get_service_coordinator()
 
         if service_coordinator.is_active():
-            service_coordinator.join_group(self.group_type)
+            service_coordinator.join_group(
+                self.group_type,
+                self.get_capabilities() or b''
+            )
 
             self._tg = threadgroup.ThreadGroup()
 
             self._tg.add_timer(
                 cfg.CONF.coordination.heartbeat_interval,
-                service_coordinator.heartbeat
+                self._heartbeat
             )
 
     def stop(self):
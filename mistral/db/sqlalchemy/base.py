@@ -18,19 +18,27 @@ import six
 from oslo_config import cfg
 from oslo_db import options
 from oslo_db.sqlalchemy import session as db_session
+from oslo_log import log as logging
 import osprofiler.sqlalchemy
 import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy import orm
 
 from mistral.db.sqlalchemy import sqlite_lock
 from mistral import exceptions as exc
 from mistral import utils
 
 
+LOG = logging.getLogger(__name__)
+
 # Note(dzimine): sqlite only works for basic testing.
 options.set_defaults(cfg.CONF, connection="sqlite:///mistral.sqlite")
 
 _DB_SESSION_THREAD_LOCAL_NAME = "db_sql_alchemy_session"
 
+# Key of session info under which callbacks to run after commit are kept.
+_AFTER_COMMIT_KEY = "mistral.after_commit"
+
 _facade = None
 _sqlalchemy_create_engine_orig = sa.create_engine
 
@@ -206,6 +214,37 @@ def end_tx():
     _set_thread_local_session(None)
 
 
+def after_commit(func):
+    """Calls the given function after the current transaction is committed.
+
+    If there's no transaction in progress the function is called
+    immediately. If the transaction is rolled back the function is not
+    called at all.
+    """
+    ses = _get_thread_local_session()
+
+    if not ses:
+        func()
+
+        return
+
+    ses.info.setdefault(_AFTER_COMMIT_KEY, []).append(func)
+
+
+@event.listens_for(orm.Session, 'after_commit')
+def _run_after_commit_callbacks(session):
+    for func in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            func()
+        except Exception as e:
+            LOG.exception("Failed to run after commit callback: %s", e)
+
+
+@event.listens_for(orm.Session, 'after_soft_rollback')
+def _discard_after_commit_callbacks(session, previous_transaction):
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
 @session_aware()
 def get_driver_name(session=None):
     return session.bind.url.drivername
@@ -0,0 +1,85 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add delay tolerant workload table and polling index
+
+Revision ID: 013
+Revises: 012
+Create Date: 2016-09-14 11:27:03.218337
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+from mistral.db.sqlalchemy import types as st
+
+
+TABLE_NAME = 'delay_tolerant_workload'
+
+
+def upgrade():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+
+    # The table could have been created by the services on startup.
+    if TABLE_NAME not in inspector.get_table_names():
+        op.create_table(
+            TABLE_NAME,
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('project_id', sa.String(length=80), nullable=True),
+            sa.Column('scope', sa.String(length=80), nullable=True),
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('name', sa.String(length=200), nullable=True),
+            sa.Column('deadline', sa.DateTime(), nullable=True),
+            sa.Column('job_duration', sa.Integer(), nullable=True),
+            sa.Column('workflow_name', sa.String(length=80), nullable=True),
+            sa.Column('executed', sa.Boolean(), nullable=True),
+            sa.Column('workflow_id', sa.String(length=36), nullable=True),
+            sa.Column('workflow_params', st.JsonEncoded(), nullable=True),
+            sa.Column('workflow_params_hash', sa.CHAR(length=64),
+                      nullable=True),
+            sa.Column('workflow_input', st.JsonEncoded(), nullable=True),
+            sa.Column('workflow_input_hash', sa.CHAR(length=64),
+                      nullable=True),
+            sa.Column('trust_id', sa.String(length=80), nullable=True),
+
+            sa.ForeignKeyConstraint(
+                ['workflow_id'],
+                [u'workflow_definitions_v2.id'],
+            ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name', 'project_id'),
+            sa.UniqueConstraint(
+                'workflow_input_hash', 'workflow_name', 'project_id',
+                'workflow_params_hash', 'deadline', 'job_duration'
+            ),
+            sa.Index('%s_project_id' % TABLE_NAME, 'project_id'),
+            sa.Index('%s_scope' % TABLE_NAME, 'scope'),
+            sa.Index('%s_workflow_name' % TABLE_NAME, 'workflow_name')
+        )
+
+    op.create_index(
+        '%s_executed_deadline' % TABLE_NAME,
+        TABLE_NAME,
+        ['executed', 'deadline'],
+        unique=False
+    )
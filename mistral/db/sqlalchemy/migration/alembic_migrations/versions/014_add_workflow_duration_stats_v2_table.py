@@ -0,0 +1,53 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add workflow duration stats table
+
+Revision ID: 014
+Revises: 013
+Create Date: 2016-09-21 15:02:41.731852
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+
+from alembic import op
+import sqlalchemy as sa
+
+from mistral.db.sqlalchemy import types as st
+
+
+def upgrade():
+    op.create_table(
+        'workflow_duration_stats_v2',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('workflow_id', sa.String(length=36), nullable=False),
+        sa.Column('input_size_bucket', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('histogram', st.JsonEncoded(), nullable=True),
+
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('workflow_id', 'input_size_bucket')
+    )
+
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('workflow_input_size', sa.Integer(), nullable=True)
+    )
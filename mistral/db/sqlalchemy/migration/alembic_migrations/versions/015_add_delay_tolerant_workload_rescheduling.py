@@ -0,0 +1,49 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add delay tolerant workload rescheduling columns
+
+Revision ID: 015
+Revises: 014
+Create Date: 2016-09-28 11:24:05.314127
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('planned_start_time', sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('reschedule_count', sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('rescheduled_at', sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('reschedule_reason', sa.String(length=255), nullable=True)
+    )
@@ -0,0 +1,44 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add fingerprints table
+
+Revision ID: 016
+Revises: 015
+Create Date: 2016-10-12 10:41:27.503964
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        'fingerprints_v2',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=80), nullable=False),
+        sa.Column('value', sa.String(length=64), nullable=False),
+
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
@@ -0,0 +1,45 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add indices used by execution statistics
+
+Revision ID: 017
+Revises: 016
+Create Date: 2016-10-14 15:20:43.617290
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index(
+        'executions_v2_workflow_name',
+        'executions_v2',
+        ['workflow_name'],
+        unique=False
+    )
+
+    op.create_index(
+        'executions_v2_created_at',
+        'executions_v2',
+        ['created_at'],
+        unique=False
+    )
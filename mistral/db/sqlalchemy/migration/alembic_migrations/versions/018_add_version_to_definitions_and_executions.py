@@ -0,0 +1,39 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add version to definitions and executions
+
+Revision ID: 018
+Revises: 017
+Create Date: 2016-10-17 09:12:05.214538
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    for table_name in ('workbooks_v2', 'workflow_definitions_v2',
+                       'action_definitions_v2', 'executions_v2'):
+        op.add_column(
+            table_name,
+            sa.Column('version', sa.Integer(), nullable=True)
+        )
@@ -0,0 +1,37 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""add claim token to delay tolerant workload
+
+Revision ID: 019
+Revises: 018
+Create Date: 2016-10-19 10:41:27.608213
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column(
+        'delay_tolerant_workload',
+        sa.Column('claim_token', sa.String(length=36), nullable=True)
+    )
@@ -52,6 +52,15 @@ def end_tx():
     IMPL.end_tx()
 
 
+def after_commit(func):
+    """Calls the given function after the current transaction is committed.
+
+    The function is called immediately if there's no transaction in
+    progress and never called if the transaction is rolled back.
+    """
+    IMPL.after_commit(func)
+
+
 @contextlib.contextmanager
 def transaction():
     with IMPL.transaction():
@@ -76,6 +85,14 @@ def load_workbook(name):
     return IMPL.load_workbook(name)
 
 
+def get_workbook_version(name):
+    """Returns ID, version and timestamps of a workbook.
+
+    Unlike get_workbook this method doesn't load heavy columns.
+    """
+    return IMPL.get_workbook_version(name)
+
+
 def get_workbooks(limit=None, marker=None, sort_keys=None,
                   sort_dirs=None, fields=None, **kwargs):
     return IMPL.get_workbooks(
@@ -123,6 +140,14 @@ def load_workflow_definition(name):
     return IMPL.load_workflow_definition(name)
 
 
+def get_workflow_definition_version(identifier):
+    """Returns ID, version and timestamps of a workflow definition.
+
+    Unlike get_workflow_definition this method doesn't load heavy columns.
+    """
+    return IMPL.get_workflow_definition_version(identifier)
+
+
 def get_workflow_definitions(limit=None, marker=None, sort_keys=None,
                              sort_dirs=None, fields=None, **kwargs):
     return IMPL.get_workflow_definitions(
@@ -147,6 +172,26 @@ def create_or_update_workflow_definition(name, values):
     return IMPL.create_or_update_workflow_definition(name, values)
 
 
+def create_workflow_definitions(values_list):
+    """Creates workflow definitions inserting them in batches.
+
+    :param values_list: List of dictionaries with workflow definition values.
+    :return: List of created workflow definitions.
+    """
+    return IMPL.create_workflow_definitions(values_list)
+
+
+def create_or_update_workflow_definitions(values_list):
+    """Creates or updates workflow definitions by names.
+
+    Existing definitions are looked up with a single query.
+
+    :param values_list: List of dictionaries with workflow definition values.
+    :return: List of workflow definitions in the order of values_list.
+    """
+    return IMPL.create_or_update_workflow_definitions(values_list)
+
+
 def delete_workflow_definition(identifier):
     IMPL.delete_workflow_definition(identifier)
 
@@ -193,6 +238,17 @@ def create_or_update_action_definition(name, values):
     return IMPL.create_or_update_action_definition(name, values)
 
 
+def create_or_update_action_definitions(values_list):
+    """Creates or updates action definitions by names.
+
+    Existing definitions are looked up with a single query.
+
+    :param values_list: List of dictionaries with action definition values.
+    :return: List of action definitions in the order of values_list.
+    """
+    return IMPL.create_or_update_action_definitions(values_list)
+
+
 def delete_action_definition(name):
     return IMPL.delete_action_definition(name)
 
@@ -201,6 +257,33 @@ def delete_action_definitions(**kwargs):
     return IMPL.delete_action_definitions(**kwargs)
 
 
+def create_action_definitions(values_list):
+    """Creates action definitions in bulk.
+
+    Unlike create_action_definition it doesn't return created objects.
+
+    :param values_list: List of dictionaries with action definition values.
+    """
+    IMPL.create_action_definitions(values_list)
+
+
+def update_action_definitions(values_list):
+    """Updates action definitions in bulk.
+
+    :param values_list: List of dictionaries with new values, every
+        dictionary must contain 'id' of the action definition.
+    """
+    IMPL.update_action_definitions(values_list)
+
+
+def delete_action_definitions_by_ids(ids):
+    """Deletes action definitions in bulk.
+
+    :return: Number of deleted action definitions.
+    """
+    return IMPL.delete_action_definitions_by_ids(ids)
+
+
 # Common executions.
 
 def get_execution(id):
@@ -255,6 +338,14 @@ def get_action_executions(**kwargs):
     return IMPL.get_action_executions(**kwargs)
 
 
+def get_accepted_action_execution_outputs(task_execution_ids):
+    """Returns outputs of accepted action executions of the given tasks.
+
+    :return: List of tuples (task_execution_id, runtime_context, output).
+    """
+    return IMPL.get_accepted_action_execution_outputs(task_execution_ids)
+
+
 def ensure_action_execution_exists(id):
     return IMPL.ensure_action_execution_exists(id)
 
@@ -290,6 +381,14 @@ def load_workflow_execution(name):
     return IMPL.load_workflow_execution(name)
 
 
+def get_workflow_execution_version(id):
+    """Returns ID, version and timestamps of a workflow execution.
+
+    Unlike get_workflow_execution this method doesn't load heavy columns.
+    """
+    return IMPL.get_workflow_execution_version(id)
+
+
 def get_workflow_executions(limit=None, marker=None, sort_keys=['created_at'],
                             sort_dirs=None, **kwargs):
     return IMPL.get_workflow_executions(
@@ -305,6 +404,16 @@ def ensure_workflow_execution_exists(id):
     return IMPL.ensure_workflow_execution_exists(id)
 
 
+def count_top_level_workflow_executions(state, description=None):
+    """Counts workflow executions not started by a task in all projects.
+
+    :param state: Execution state.
+    :param description: If given, only executions with this description
+        are counted.
+    """
+    return IMPL.count_top_level_workflow_executions(state, description)
+
+
 def create_workflow_execution(values):
     return IMPL.create_workflow_execution(values)
 
@@ -367,6 +476,51 @@ def delete_task_executions(**kwargs):
     return IMPL.delete_task_executions(**kwargs)
 
 
+# Execution statistics.
+
+def get_workflow_execution_stats(group_by, interval=None, created_from=None,
+                                 created_to=None, **kwargs):
+    """Returns aggregate statistics of workflow executions.
+
+    Statistics are calculated by the database and only cover executions
+    visible to the current project.
+
+    :param group_by: List of columns to group executions by.
+    :param interval: Optional. Length of the creation time periods to
+        group executions by, one of 'minute', 'hour', 'day', 'month'.
+    :param created_from: Optional. Only executions created at this time
+        or later are counted.
+    :param created_to: Optional. Only executions created before this time
+        are counted.
+    :param kwargs: Filters of executions by column values.
+    :return: List of dictionaries with values of the grouping columns,
+        'period' (if interval is given), 'count' and 'avg_duration',
+        'min_duration', 'max_duration' of completed executions in seconds.
+    """
+    return IMPL.get_workflow_execution_stats(
+        group_by,
+        interval=interval,
+        created_from=created_from,
+        created_to=created_to,
+        **kwargs
+    )
+
+
+def get_task_execution_stats(group_by, interval=None, created_from=None,
+                             created_to=None, **kwargs):
+    """Returns aggregate statistics of task executions.
+
+    See get_workflow_execution_stats() for the description of parameters.
+    """
+    return IMPL.get_task_execution_stats(
+        group_by,
+        interval=interval,
+        created_from=created_from,
+        created_to=created_to,
+        **kwargs
+    )
+
+
 # Delayed calls.
 
 def get_delayed_calls_to_start(time):
@@ -408,6 +562,21 @@ def get_next_cron_triggers(time):
     return IMPL.get_next_cron_triggers(time)
 
 
+def get_cron_trigger_fire_times(changed_since=None):
+    """Returns next execution times of cron triggers in all projects.
+
+    :param changed_since: Optional. Only triggers created or updated at
+        this time (UTC) or later are returned.
+    :return: List of tuples (id, next_execution_time).
+    """
+    return IMPL.get_cron_trigger_fire_times(changed_since=changed_since)
+
+
+def get_cron_triggers_by_ids(ids):
+    """Returns the given cron triggers ordered by next execution time."""
+    return IMPL.get_cron_triggers_by_ids(ids)
+
+
 def get_expired_executions(time):
     return IMPL.get_expired_executions(time)
 
@@ -420,6 +589,17 @@ def update_cron_trigger(name, values, query_filter=None):
     return IMPL.update_cron_trigger(name, values, query_filter=query_filter)
 
 
+def advance_cron_triggers(ids, prev_time, next_time):
+    """Advances cron triggers to the next execution time.
+
+    Triggers are changed only if their next execution time is still
+    'prev_time'. If 'next_time' is None the triggers are deleted.
+
+    :return: Number of triggers advanced.
+    """
+    return IMPL.advance_cron_triggers(ids, prev_time, next_time)
+
+
 def create_or_update_cron_trigger(name, values):
     return IMPL.create_or_update_cron_trigger(name, values)
 
@@ -455,6 +635,32 @@ def create_delay_tolerant_workload(values):
     return IMPL.create_delay_tolerant_workload(values)
 
 
+def create_delay_tolerant_workloads(values_list):
+    """Creates a number of delay tolerant workloads in bulk.
+
+    :param values_list: List of dictionaries with workload values.
+    :return: List of IDs of created workloads.
+    """
+    return IMPL.create_delay_tolerant_workloads(values_list)
+
+
+def get_delay_tolerant_workload_names(names):
+    """Returns those of the given names taken in the current project."""
+    return IMPL.get_delay_tolerant_workload_names(names)
+
+
+def get_delay_tolerant_workload_contents(workflow_names, deadlines):
+    """Returns contents of workloads with the given workflows and deadlines.
+
+    Contents are dictionaries with workflow name, input, parameters,
+    deadline and job duration of workloads of the current project.
+    """
+    return IMPL.get_delay_tolerant_workload_contents(
+        workflow_names,
+        deadlines
+    )
+
+
 def update_delay_tolerant_workload(name, values,
                                    query_filter=None):
     return IMPL.update_delay_tolerant_workload(name, values,
@@ -474,9 +680,110 @@ def get_delay_tolerant_workloads_with_execution(executed, session=None):
                                                             session=None)
 
 
+def get_unscheduled_delay_tolerant_workloads(limit, marker=None):
+    """Returns a page of not executed delay tolerant workloads.
+
+    Only the columns needed for scheduling are loaded, workloads are
+    ordered by deadline and ID.
+
+    :param limit: Maximum number of workloads to return.
+    :param marker: Tuple (deadline, id) of the last workload of the
+        previous page.
+    """
+    return IMPL.get_unscheduled_delay_tolerant_workloads(
+        limit,
+        marker=marker
+    )
+
+
+def claim_delay_tolerant_workloads(ids):
+    """Atomically marks not executed delay tolerant workloads as executed.
+
+    :param ids: IDs of delay tolerant workloads.
+    :return: IDs of workloads marked by this call. Workloads already
+        executed or claimed by another process are not included.
+    """
+    return IMPL.claim_delay_tolerant_workloads(ids)
+
+
+def get_planned_delay_tolerant_workloads(start_time=None, end_time=None,
+                                         limit=None):
+    """Returns workloads planned to start at a certain time.
+
+    :param start_time: Optional. Minimum planned start time.
+    :param end_time: Optional. Planned start time must be earlier.
+    :param limit: Optional. Maximum number of workloads returned.
+    :return: List of tuples (cron trigger, delay tolerant workload) in all
+        projects in the order of deadlines.
+    """
+    return IMPL.get_planned_delay_tolerant_workloads(
+        start_time=start_time,
+        end_time=end_time,
+        limit=limit
+    )
+
+
+def reschedule_delay_tolerant_workload(trigger_id, old_start_time,
+                                       new_start_time, dtw_id, reason):
+    """Moves the planned start of a workload and records the change.
+
+    :return: True if the workload has been rescheduled, False if its
+        cron trigger doesn't start at old_start_time anymore.
+    """
+    return IMPL.reschedule_delay_tolerant_workload(
+        trigger_id,
+        old_start_time,
+        new_start_time,
+        dtw_id,
+        reason
+    )
+
+
 def delete_delay_tolerant_workloads(**kwargs):
     return IMPL.delete_delay_tolerant_workloads(**kwargs)
 
+
+# Workflow duration statistics.
+
+def get_workflow_duration_stats(workflow_ids):
+    return IMPL.get_workflow_duration_stats(workflow_ids)
+
+
+def add_workflow_duration_sample(workflow_id, input_size_bucket,
+                                 duration_bucket):
+    """Counts a workflow execution in duration statistics.
+
+    :param workflow_id: Workflow definition ID.
+    :param input_size_bucket: Bucket of the workflow input size.
+    :param duration_bucket: Bucket of the execution duration.
+    :return: Updated statistics.
+    """
+    return IMPL.add_workflow_duration_sample(
+        workflow_id,
+        input_size_bucket,
+        duration_bucket
+    )
+
+
+def delete_workflow_duration_stats(**kwargs):
+    return IMPL.delete_workflow_duration_stats(**kwargs)
+
+
+# Fingerprints.
+
+def get_fingerprint(name):
+    """Returns value of the fingerprint or None if it's not stored yet."""
+    return IMPL.get_fingerprint(name)
+
+
+def set_fingerprint(name, value):
+    IMPL.set_fingerprint(name, value)
+
+
+def delete_fingerprints(**kwargs):
+    return IMPL.delete_fingerprints(**kwargs)
+
+
 # Environments.
 
 
@@ -21,7 +21,9 @@ from oslo_db import exception as db_exc
 from oslo_db import sqlalchemy as oslo_sqlalchemy
 from oslo_db.sqlalchemy import utils as db_utils
 from oslo_log import log as logging
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
+import six
 import sqlalchemy as sa
 
 from mistral.db.sqlalchemy import base as b
@@ -30,6 +32,8 @@ from mistral.db.sqlalchemy import sqlite_lock
 from mistral.db.v2.sqlalchemy import models
 from mistral import exceptions as exc
 from mistral.services import security
+from mistral import utils
+from mistral.workflow import states
 
 
 CONF = cfg.CONF
@@ -80,6 +84,10 @@ def end_tx():
     b.end_tx()
 
 
+def after_commit(func):
+    b.after_commit(func)
+
+
 @contextlib.contextmanager
 def transaction():
     try:
@@ -140,7 +148,7 @@ def _secure_query(model, *columns):
 
 
 def _paginate_query(model, limit=None, marker=None, sort_keys=None,
-                    sort_dirs=None, query=None):
+                    sort_dirs=None, query=None, yield_per=None):
     if not query:
         query = _secure_query(model)
 
@@ -153,9 +161,21 @@ def _paginate_query(model, limit=None, marker=None, sort_keys=None,
         sort_dirs=sort_dirs
     )
 
+    if yield_per:
+        # Rows are fetched lazily in batches while the caller iterates,
+        # the session must stay open until then.
+        return query.yield_per(yield_per)
+
     return query.all()
 
 
+def _to_datetime(value):
+    if isinstance(value, six.string_types):
+        return timeutils.normalize_time(timeutils.parse_isotime(value))
+
+    return value
+
+
 def _delete_all(model, session=None, **kwargs):
     # NOTE(kong): Because we use 'in_' operator in _secure_query(), delete()
     # method will raise error with default parameter. Please refer to
@@ -164,7 +184,8 @@ def _delete_all(model, session=None, **kwargs):
 
 
 def _get_collection(model, insecure=False, limit=None, marker=None,
-                    sort_keys=None, sort_dirs=None, fields=None, **kwargs):
+                    sort_keys=None, sort_dirs=None, fields=None,
+                    criteria=None, yield_per=None, **kwargs):
     columns = (
         tuple([getattr(model, f) for f in fields if hasattr(model, f)])
         if fields else ()
@@ -176,6 +197,9 @@ def _get_collection(model, insecure=False, limit=None, marker=None,
              else _secure_query(model, *columns))
     query = query.filter_by(**kwargs)
 
+    if criteria:
+        query = query.filter(*criteria)
+
     # To match the tag list, a resource must contain at least all of the
     # tags present in the filter parameter.
     if tags:
@@ -193,7 +217,8 @@ def _get_collection(model, insecure=False, limit=None, marker=None,
             marker,
             sort_keys,
             sort_dirs,
-            query
+            query,
+            yield_per=yield_per
         )
     except Exception as e:
         raise exc.DBQueryEntryError(
@@ -232,6 +257,30 @@ def _get_db_object_by_id(model, id):
     return _secure_query(model).filter_by(id=id).first()
 
 
+def _get_db_object_version(model, column, value):
+    """Returns ID, version and timestamps of an object.
+
+    Only these columns are loaded so that it's cheap to check whether
+    the object has changed.
+    """
+    query = _secure_query(
+        model,
+        model.id,
+        model.version,
+        model.created_at,
+        model.updated_at
+    ).filter(getattr(model, column) == value)
+
+    if issubclass(model, models.Execution):
+        # Only columns are selected so the discriminator of single table
+        # inheritance must be applied explicitly.
+        query = query.filter(
+            model.type == model.__mapper__.polymorphic_identity
+        )
+
+    return query.first()
+
+
 # Workbook definitions.
 
 def get_workbook(name):
@@ -249,6 +298,17 @@ def load_workbook(name):
     return _get_workbook(name)
 
 
+def get_workbook_version(name):
+    version = _get_db_object_version(models.Workbook, 'name', name)
+
+    if not version:
+        raise exc.DBEntityNotFoundError(
+            "Workbook not found [workbook_name=%s]" % name
+        )
+
+    return version
+
+
 def get_workbooks(**kwargs):
     return _get_collection_sorted_by_name(models.Workbook, **kwargs)
 
@@ -348,6 +408,21 @@ def load_workflow_definition(name):
     return _get_workflow_definition(name)
 
 
+def get_workflow_definition_version(identifier):
+    version = _get_db_object_version(
+        models.WorkflowDefinition,
+        'id' if uuidutils.is_uuid_like(identifier) else 'name',
+        identifier
+    )
+
+    if not version:
+        raise exc.DBEntityNotFoundError(
+            "Workflow not found [workflow_identifier=%s]" % identifier
+        )
+
+    return version
+
+
 def get_workflow_definitions(sort_keys=['created_at'], fields=None, **kwargs):
     if fields and 'input' in fields:
         fields.remove('input')
@@ -381,6 +456,14 @@ def create_workflow_definition(values, session=None):
 def update_workflow_definition(identifier, values, session=None):
     wf_def = get_workflow_definition(identifier)
 
+    _check_workflow_definition_update(wf_def, values, identifier)
+
+    wf_def.update(values.copy())
+
+    return wf_def
+
+
+def _check_workflow_definition_update(wf_def, values, identifier):
     if wf_def.project_id != security.get_project_id():
         raise exc.NotAllowedException(
             "Can not update workflow of other tenants. "
@@ -417,10 +500,6 @@ def update_workflow_definition(identifier, values, session=None):
                     identifier
                 )
 
-    wf_def.update(values.copy())
-
-    return wf_def
-
 
 @b.session_aware()
 def create_or_update_workflow_definition(name, values, session=None):
@@ -430,6 +509,90 @@ def create_or_update_workflow_definition(name, values, session=None):
         return update_workflow_definition(name, values)
 
 
+def _get_definitions_by_names(model, names):
+    """Returns {name: definition} visible to the current project.
+
+    Definitions of the current project take precedence over public
+    definitions of other projects with the same names.
+    """
+    if not names:
+        return {}
+
+    project_id = security.get_project_id()
+
+    result = {}
+
+    for d in _secure_query(model).filter(model.name.in_(names)):
+        if d.name not in result or d.project_id == project_id:
+            result[d.name] = d
+
+    return result
+
+
+def _save_new_definitions(model, values_list, session):
+    definitions = []
+
+    for values in values_list:
+        d = model()
+
+        # IDs are generated in advance so that the rows can be inserted
+        # in batches.
+        d.id = utils.generate_unicode_uuid()
+        d.update(values.copy())
+
+        definitions.append(d)
+
+    session.add_all(definitions)
+
+    try:
+        session.flush()
+    except db_exc.DBDuplicateEntry as e:
+        raise exc.DBDuplicateEntryError(
+            "Duplicate entry for %s: %s" % (model.__name__, e.columns)
+        )
+
+    return definitions
+
+
+@b.session_aware()
+def create_workflow_definitions(values_list, session=None):
+    return _save_new_definitions(
+        models.WorkflowDefinition,
+        values_list,
+        session
+    )
+
+
+@b.session_aware()
+def create_or_update_workflow_definitions(values_list, session=None):
+    existing = _get_definitions_by_names(
+        models.WorkflowDefinition,
+        [v['name'] for v in values_list]
+    )
+
+    to_create = []
+
+    for values in values_list:
+        wf_def = existing.get(values['name'])
+
+        if wf_def:
+            _check_workflow_definition_update(wf_def, values, values['name'])
+
+            wf_def.update(values.copy())
+        else:
+            to_create.append(values)
+
+    created = iter(
+        _save_new_definitions(models.WorkflowDefinition, to_create, session)
+    )
+
+    # Keep the order of the given values.
+    return [
+        d if d is not None else next(created)
+        for d in [existing.get(v['name']) for v in values_list]
+    ]
+
+
 @b.session_aware()
 def delete_workflow_definition(identifier, session=None):
     wf_def = get_workflow_definition(identifier)
@@ -553,6 +716,33 @@ def create_or_update_action_definition(name, values, session=None):
         return update_action_definition(name, values)
 
 
+@b.session_aware()
+def create_or_update_action_definitions(values_list, session=None):
+    existing = _get_definitions_by_names(
+        models.ActionDefinition,
+        [v['name'] for v in values_list]
+    )
+
+    to_create = []
+
+    for values in values_list:
+        a_def = existing.get(values['name'])
+
+        if a_def:
+            a_def.update(values.copy())
+        else:
+            to_create.append(values)
+
+    created = iter(
+        _save_new_definitions(models.ActionDefinition, to_create, session)
+    )
+
+    return [
+        d if d is not None else next(created)
+        for d in [existing.get(v['name']) for v in values_list]
+    ]
+
+
 @b.session_aware()
 def delete_action_definition(name, session=None):
     a_def = _get_action_definition(name)
@@ -570,6 +760,30 @@ def delete_action_definitions(**kwargs):
     return _delete_all(models.ActionDefinition, **kwargs)
 
 
+@b.session_aware()
+def create_action_definitions(values_list, session=None):
+    if values_list:
+        session.bulk_insert_mappings(models.ActionDefinition, values_list)
+
+
+@b.session_aware()
+def update_action_definitions(values_list, session=None):
+    if values_list:
+        session.bulk_update_mappings(models.ActionDefinition, values_list)
+
+
+@b.session_aware()
+def delete_action_definitions_by_ids(ids, session=None):
+    if not ids:
+        return 0
+
+    model = models.ActionDefinition
+
+    return b.model_query(model).filter(model.id.in_(ids)).delete(
+        synchronize_session=False
+    )
+
+
 def _get_action_definition(name):
     return _get_db_object_by_name(models.ActionDefinition, name)
 
@@ -687,6 +901,28 @@ def get_action_executions(**kwargs):
     return _get_action_executions(**kwargs)
 
 
+@b.session_aware()
+def get_accepted_action_execution_outputs(task_execution_ids, session=None):
+    if not task_execution_ids:
+        return []
+
+    model = models.ActionExecution
+
+    query = _secure_query(
+        model,
+        model.task_execution_id,
+        model.runtime_context,
+        model.output
+    )
+
+    query = query.filter(
+        model.task_execution_id.in_(task_execution_ids),
+        model.accepted == sa.true()
+    )
+
+    return query.all()
+
+
 @b.session_aware()
 def create_action_execution(values, session=None):
     a_ex = models.ActionExecution()
@@ -767,6 +1003,17 @@ def load_workflow_execution(id):
     return _get_workflow_execution(id)
 
 
+def get_workflow_execution_version(id):
+    version = _get_db_object_version(models.WorkflowExecution, 'id', id)
+
+    if not version:
+        raise exc.DBEntityNotFoundError(
+            "WorkflowExecution not found [id=%s]" % id
+        )
+
+    return version
+
+
 def ensure_workflow_execution_exists(id):
     get_workflow_execution(id)
 
@@ -778,6 +1025,22 @@ def get_workflow_executions(**kwargs):
     )
 
 
+@b.session_aware()
+def count_top_level_workflow_executions(state, description=None,
+                                        session=None):
+    model = models.WorkflowExecution
+
+    query = b.model_query(model, (sa.func.count(model.id),)).filter(
+        model.state == state,
+        model.task_execution_id.is_(None)
+    )
+
+    if description is not None:
+        query = query.filter(model.description == description)
+
+    return query.scalar()
+
+
 @b.session_aware()
 def create_workflow_execution(values, session=None):
     wf_ex = models.WorkflowExecution()
@@ -921,6 +1184,171 @@ def _get_task_executions(**kwargs):
     return _get_collection_sorted_by_time(models.TaskExecution, **kwargs)
 
 
+# Execution statistics.
+
+_STATS_DURATIONS = ('avg_duration', 'min_duration', 'max_duration')
+
+# Formats of creation time truncated to the interval, by DB dialect.
+_STATS_PERIOD_FORMATS = {
+    'sqlite': {
+        'minute': '%Y-%m-%dT%H:%M:00',
+        'hour': '%Y-%m-%dT%H:00:00',
+        'day': '%Y-%m-%dT00:00:00',
+        'month': '%Y-%m-01T00:00:00'
+    },
+    'mysql': {
+        'minute': '%Y-%m-%dT%H:%i:00',
+        'hour': '%Y-%m-%dT%H:00:00',
+        'day': '%Y-%m-%dT00:00:00',
+        'month': '%Y-%m-01T00:00:00'
+    },
+    'postgresql': {
+        'minute': 'YYYY-MM-DD"T"HH24:MI:00',
+        'hour': 'YYYY-MM-DD"T"HH24:00:00',
+        'day': 'YYYY-MM-DD"T"00:00:00',
+        'month': 'YYYY-MM-01"T"00:00:00'
+    }
+}
+
+
+def _get_dialect():
+    dialect = b.get_driver_name().split('+')[0]
+
+    if dialect not in _STATS_PERIOD_FORMATS:
+        raise exc.DBQueryEntryError(
+            "Execution statistics are not supported by DB dialect: %s" %
+            dialect
+        )
+
+    return dialect
+
+
+def _get_period_expr(model, interval, dialect):
+    fmt = _STATS_PERIOD_FORMATS[dialect][interval]
+
+    if dialect == 'sqlite':
+        return sa.func.strftime(fmt, model.created_at)
+
+    if dialect == 'mysql':
+        return sa.func.date_format(model.created_at, fmt)
+
+    return sa.func.to_char(model.created_at, fmt)
+
+
+def _get_duration_expr(model, dialect):
+    """Returns approximate duration of completed executions in seconds.
+
+    Completion time isn't recorded so the time of the last update is used
+    instead. It's only an upper bound since executions may still be
+    updated after completion, e.g. task executions are marked as processed
+    by the workflow afterwards. Durations of executions that are not
+    completed successfully or with an error (including cancelled ones)
+    are NULL and don't contribute to the statistics.
+    """
+    if dialect == 'sqlite':
+        duration = (
+            sa.func.julianday(model.updated_at) -
+            sa.func.julianday(model.created_at)
+        ) * 86400
+    elif dialect == 'mysql':
+        duration = sa.func.timestampdiff(
+            sa.text('SECOND'),
+            model.created_at,
+            model.updated_at
+        )
+    else:
+        duration = sa.extract('epoch', model.updated_at - model.created_at)
+
+    return sa.case(
+        [(model.state.in_([states.SUCCESS, states.ERROR]), duration)],
+        else_=None
+    )
+
+
+def _get_execution_stats(model, group_by, interval=None, created_from=None,
+                         created_to=None, **kwargs):
+    dialect = _get_dialect()
+
+    group_cols = [getattr(model, c).label(c) for c in group_by]
+
+    if interval:
+        group_cols.append(
+            _get_period_expr(model, interval, dialect).label('period')
+        )
+
+    duration = _get_duration_expr(model, dialect)
+
+    query = _secure_query(
+        model,
+        *(group_cols + [
+            sa.func.count(model.id),
+            sa.func.avg(duration),
+            sa.func.min(duration),
+            sa.func.max(duration)
+        ])
+    )
+
+    # Only aggregates are selected so the discriminator of single table
+    # inheritance must be applied explicitly.
+    query = query.filter(
+        model.type == model.__mapper__.polymorphic_identity
+    ).filter_by(**kwargs)
+
+    if created_from:
+        query = query.filter(model.created_at >= _to_datetime(created_from))
+
+    if created_to:
+        query = query.filter(model.created_at < _to_datetime(created_to))
+
+    if group_cols:
+        query = query.group_by(*group_cols).order_by(*group_cols)
+
+    stats = []
+
+    for row in query:
+        s = dict(zip(group_by, row))
+
+        if interval:
+            s['period'] = row[len(group_by)]
+
+        aggregates = row[len(group_cols):]
+
+        s['count'] = aggregates[0]
+
+        for key, val in zip(_STATS_DURATIONS, aggregates[1:]):
+            s[key] = float(val) if val is not None else None
+
+        stats.append(s)
+
+    return stats
+
+
+@b.session_aware()
+def get_workflow_execution_stats(group_by, interval=None, created_from=None,
+                                 created_to=None, session=None, **kwargs):
+    return _get_execution_stats(
+        models.WorkflowExecution,
+        group_by,
+        interval=interval,
+        created_from=created_from,
+        created_to=created_to,
+        **kwargs
+    )
+
+
+@b.session_aware()
+def get_task_execution_stats(group_by, interval=None, created_from=None,
+                             created_to=None, session=None, **kwargs):
+    return _get_execution_stats(
+        models.TaskExecution,
+        group_by,
+        interval=interval,
+        created_from=created_from,
+        created_to=created_to,
+        **kwargs
+    )
+
+
 # Delayed calls.
 
 @b.session_aware()
@@ -1060,6 +1488,35 @@ def get_next_cron_triggers(time, session=None):
     return query.all()
 
 
+@b.session_aware()
+def get_cron_trigger_fire_times(changed_since=None, session=None):
+    model = models.CronTrigger
+
+    query = b.model_query(model, (model.id, model.next_execution_time))
+
+    if changed_since:
+        query = query.filter(
+            sa.or_(
+                model.created_at >= changed_since,
+                model.updated_at >= changed_since
+            )
+        )
+
+    return query.all()
+
+
+@b.session_aware()
+def get_cron_triggers_by_ids(ids, session=None):
+    if not ids:
+        return []
+
+    model = models.CronTrigger
+
+    query = b.model_query(model).filter(model.id.in_(ids))
+
+    return query.order_by(model.next_execution_time).all()
+
+
 @b.session_aware()
 def create_cron_trigger(values, session=None):
     cron_trigger = models.CronTrigger()
@@ -1121,6 +1578,28 @@ def update_cron_trigger(name, values, session=None, query_filter=None):
         return cron_trigger, len(session.dirty)
 
 
+@b.session_aware()
+def advance_cron_triggers(ids, prev_time, next_time, session=None):
+    table = models.CronTrigger.__table__
+
+    # Compare-and-set of the whole set of triggers at once.
+    condition = sa.and_(
+        table.c.id.in_(ids),
+        table.c.next_execution_time == prev_time
+    )
+
+    if next_time is None:
+        stmt = table.delete().where(condition)
+    else:
+        # NULL remaining executions (unlimited) stay NULL.
+        stmt = table.update().where(condition).values(
+            next_execution_time=next_time,
+            remaining_executions=table.c.remaining_executions - 1
+        )
+
+    return session.execute(stmt).rowcount
+
+
 @b.session_aware()
 def create_or_update_cron_trigger(name, values, session=None):
     cron_trigger = _get_cron_trigger(name)
@@ -1161,6 +1640,20 @@ def _get_cron_trigger(name):
 
 # Delay Tolerant Workload
 
+# Columns loaded when polling for unscheduled workloads.
+DTW_POLLING_COLUMNS = (
+    'id',
+    'name',
+    'deadline',
+    'job_duration',
+    'workflow_name',
+    'workflow_id',
+    'workflow_input_size',
+    'project_id',
+    'trust_id'
+)
+
+
 def get_delay_tolerant_workload(name):
     delay_tolerant_workload = _get_delay_tolerant_workload(name)
 
@@ -1176,14 +1669,66 @@ def load_delay_tolerant_workload(name):
     return _get_delay_tolerant_workload(name)
 
 
-def get_delay_tolerant_workloads(insecure=False, **kwargs):
+def get_delay_tolerant_workloads(insecure=False, deadline_from=None,
+                                 deadline_to=None, **kwargs):
+    criteria = []
+
+    if deadline_from:
+        criteria.append(
+            models.DTWorkload.deadline >= _to_datetime(deadline_from)
+        )
+
+    if deadline_to:
+        criteria.append(
+            models.DTWorkload.deadline < _to_datetime(deadline_to)
+        )
+
     return _get_collection_sorted_by_name(
         models.DTWorkload,
         insecure=insecure,
+        criteria=criteria,
         **kwargs
     )
 
 
+def get_delay_tolerant_workload_names(names):
+    if not names:
+        return set()
+
+    model = models.DTWorkload
+
+    # Names are unique within a project regardless of scope.
+    query = b.model_query(model, (model.name,)).filter(
+        model.project_id == security.get_project_id(),
+        model.name.in_(names)
+    )
+
+    return set(row.name for row in query.all())
+
+
+def get_delay_tolerant_workload_contents(workflow_names, deadlines):
+    if not workflow_names or not deadlines:
+        return []
+
+    model = models.DTWorkload
+
+    columns = (
+        model.workflow_name,
+        model.workflow_input,
+        model.workflow_params,
+        model.deadline,
+        model.job_duration
+    )
+
+    query = b.model_query(model, columns).filter(
+        model.project_id == security.get_project_id(),
+        model.workflow_name.in_(workflow_names),
+        model.deadline.in_(deadlines)
+    )
+
+    return [row._asdict() for row in query.all()]
+
+
 @b.session_aware()
 def create_delay_tolerant_workload(values, session=None):
     delay_tolerant_workload = models.DTWorkload()
@@ -1207,6 +1752,40 @@ def create_delay_tolerant_workload(values, session=None):
     return delay_tolerant_workload
 
 
+@b.session_aware()
+def create_delay_tolerant_workloads(values_list, session=None):
+    if not values_list:
+        return []
+
+    project_id = security.get_project_id()
+
+    rows = []
+
+    for values in values_list:
+        row = dict(values)
+
+        row['id'] = uuidutils.generate_uuid()
+        row['project_id'] = project_id
+
+        # executemany() requires the same keys in every row and hash
+        # column defaults read input and parameters from the row itself.
+        row.setdefault('workflow_input', {})
+        row.setdefault('workflow_params', {})
+
+        rows.append(row)
+
+    try:
+        # Rows are inserted with executemany() bypassing the ORM unit of
+        # work which is much faster for a large number of rows.
+        session.execute(models.DTWorkload.__table__.insert(), rows)
+    except db_exc.DBDuplicateEntry as e:
+        raise exc.DBDuplicateEntryError(
+            "Duplicate entry for delay tolerant workload: %s" % e.columns
+        )
+
+    return [r['id'] for r in rows]
+
+
 @b.session_aware()
 def update_delay_tolerant_workload(name, values, session=None,
                                    query_filter=None):
@@ -1289,10 +1868,222 @@ def get_delay_tolerant_workloads_with_execution(executed, session=None):
     return query.all()
 
 
+@b.session_aware()
+def get_unscheduled_delay_tolerant_workloads(limit, marker=None,
+                                             session=None):
+    model = models.DTWorkload
+
+    query = b.model_query(
+        model,
+        columns=[getattr(model, c) for c in DTW_POLLING_COLUMNS]
+    )
+
+    query = query.filter(model.executed == sa.false())
+
+    if marker:
+        deadline, dtw_id = marker
+
+        query = query.filter(
+            sa.or_(
+                model.deadline > deadline,
+                sa.and_(model.deadline == deadline, model.id > dtw_id)
+            )
+        )
+
+    return query.order_by(model.deadline, model.id).limit(limit).all()
+
+
+@b.session_aware()
+def claim_delay_tolerant_workloads(ids, session=None):
+    if not ids:
+        return []
+
+    table = models.DTWorkload.__table__
+
+    token = utils.generate_unicode_uuid()
+
+    # Conditional UPDATE matches only rows that haven't been claimed yet,
+    # so concurrent callers can't claim the same workload. The token tells
+    # which rows were matched by this call.
+    session.execute(
+        table.update().where(
+            sa.and_(table.c.id.in_(ids), table.c.executed == sa.false())
+        ).values(executed=True, claim_token=token)
+    )
+
+    return [
+        row[0] for row in session.execute(
+            sa.select([table.c.id]).where(table.c.claim_token == token)
+        )
+    ]
+
+
+@b.session_aware()
+def get_planned_delay_tolerant_workloads(start_time=None, end_time=None,
+                                         limit=None, session=None):
+    trigger = models.CronTrigger
+    dtw = models.DTWorkload
+
+    # Last minute scheduling turns workloads into one-time cron triggers
+    # with the same name.
+    query = b.model_query(trigger, (trigger, dtw)).join(
+        dtw,
+        sa.and_(
+            dtw.name == trigger.name,
+            dtw.project_id == trigger.project_id
+        )
+    ).filter(
+        dtw.executed == sa.true(),
+        trigger.remaining_executions == 1
+    )
+
+    if start_time:
+        query = query.filter(trigger.next_execution_time >= start_time)
+
+    if end_time:
+        query = query.filter(trigger.next_execution_time < end_time)
+
+    query = query.order_by(dtw.deadline, dtw.id)
+
+    if limit:
+        query = query.limit(limit)
+
+    return query.all()
+
+
+@b.session_aware()
+def reschedule_delay_tolerant_workload(trigger_id, old_start_time,
+                                       new_start_time, dtw_id, reason,
+                                       session=None):
+    trigger_table = models.CronTrigger.__table__
+    dtw_table = models.DTWorkload.__table__
+
+    # The trigger is moved only if it hasn't fired or been moved by another
+    # process in the meantime.
+    result = session.execute(
+        trigger_table.update().where(
+            sa.and_(
+                trigger_table.c.id == trigger_id,
+                trigger_table.c.next_execution_time == old_start_time
+            )
+        ).values(next_execution_time=new_start_time)
+    )
+
+    if not result.rowcount:
+        return False
+
+    session.execute(
+        dtw_table.update().where(dtw_table.c.id == dtw_id).values(
+            planned_start_time=new_start_time,
+            reschedule_count=(
+                sa.func.coalesce(dtw_table.c.reschedule_count, 0) + 1
+            ),
+            rescheduled_at=timeutils.utcnow(),
+            reschedule_reason=reason
+        )
+    )
+
+    return True
+
+
 def _get_delay_tolerant_workload(name):
     return _get_db_object_by_name(models.DTWorkload, name)
 
 
+# Workflow duration statistics.
+
+@b.session_aware()
+def get_workflow_duration_stats(workflow_ids, session=None):
+    if not workflow_ids:
+        return []
+
+    model = models.WorkflowDurationStats
+
+    return b.model_query(model).filter(
+        model.workflow_id.in_(workflow_ids)
+    ).all()
+
+
+@b.session_aware()
+def add_workflow_duration_sample(workflow_id, input_size_bucket,
+                                 duration_bucket, session=None):
+    model = models.WorkflowDurationStats
+
+    stats = b.model_query(model).filter_by(
+        workflow_id=workflow_id,
+        input_size_bucket=input_size_bucket
+    ).with_for_update().first()
+
+    if not stats:
+        stats = model(
+            workflow_id=workflow_id,
+            input_size_bucket=input_size_bucket,
+            count=0,
+            histogram={}
+        )
+
+        try:
+            stats.save(session=session)
+        except db_exc.DBDuplicateEntry as e:
+            raise exc.DBDuplicateEntryError(
+                "Duplicate entry for workflow duration stats: %s" % e.columns
+            )
+
+    histogram = dict(stats.histogram or {})
+
+    key = str(duration_bucket)
+
+    histogram[key] = histogram.get(key, 0) + 1
+
+    # Assign a new dictionary so that the change is detected.
+    stats.histogram = histogram
+    stats.count += 1
+
+    return stats
+
+
+@b.session_aware()
+def delete_workflow_duration_stats(**kwargs):
+    return _delete_all(models.WorkflowDurationStats, **kwargs)
+
+
+# Fingerprints.
+
+@b.session_aware()
+def get_fingerprint(name, session=None):
+    fingerprint = b.model_query(models.Fingerprint).filter_by(
+        name=name
+    ).first()
+
+    return fingerprint.value if fingerprint else None
+
+
+@b.session_aware()
+def set_fingerprint(name, value, session=None):
+    fingerprint = b.model_query(models.Fingerprint).filter_by(
+        name=name
+    ).first()
+
+    if fingerprint:
+        fingerprint.value = value
+
+        return
+
+    fingerprint = models.Fingerprint(name=name, value=value)
+
+    try:
+        fingerprint.save(session=session)
+    except db_exc.DBDuplicateEntry as e:
+        raise exc.DBDuplicateEntryError(
+            "Duplicate entry for fingerprint %s: %s" % (name, e.columns)
+        )
+
+
+@b.session_aware()
+def delete_fingerprints(session=None, **kwargs):
+    return b.model_query(models.Fingerprint).filter_by(**kwargs).delete()
+
+
 # Environments.
 
 def get_environment(name):
@@ -18,6 +18,7 @@ import json
 import sqlalchemy as sa
 from sqlalchemy import event
 from sqlalchemy.orm import backref
+from sqlalchemy.orm import object_session
 from sqlalchemy.orm import relationship
 import sys
 
@@ -46,6 +47,9 @@ class Definition(mb.MistralSecureModelBase):
     tags = sa.Column(st.JsonListType())
     is_system = sa.Column(sa.Boolean())
 
+    # Incremented on every update, used to answer conditional requests.
+    version = sa.Column(sa.Integer, default=1)
+
 
 # There's no WorkbookExecution so we safely omit "Definition" in the name.
 class Workbook(Definition):
@@ -108,6 +112,8 @@ class Execution(mb.MistralSecureModelBase):
         sa.Index('%s_state' % __tablename__, 'state'),
         sa.Index('%s_type' % __tablename__, 'type'),
         sa.Index('%s_updated_at' % __tablename__, 'updated_at'),
+        sa.Index('%s_workflow_name' % __tablename__, 'workflow_name'),
+        sa.Index('%s_created_at' % __tablename__, 'created_at'),
     )
 
     type = sa.Column(sa.String(50))
@@ -128,6 +134,9 @@ class Execution(mb.MistralSecureModelBase):
     state_info = sa.Column(sa.Text(), nullable=True)
     tags = sa.Column(st.JsonListType())
 
+    # Incremented on every update, used to answer conditional requests.
+    version = sa.Column(sa.Integer, default=1)
+
     # Runtime context like iteration_no of a repeater.
     # Effectively internal engine properties which will be used to determine
     # execution of a task.
@@ -192,6 +201,19 @@ for cls in utils.iter_subclasses(Execution):
     )
 
 
+def _increment_version(mapper, connection, target):
+    # 'before_update' is also fired for objects without net changes,
+    # they won't be updated so the version must stay the same.
+    if not object_session(target).is_modified(target):
+        return
+
+    target.version = (target.version or 0) + 1
+
+
+for cls in list(utils.iter_subclasses(Definition)) + [Execution]:
+    event.listen(cls, 'before_update', _increment_version, propagate=True)
+
+
 def validate_long_type_length(cls, field_name, value):
     """Makes sure the value does not exceeds the maximum size."""
     if value:
@@ -409,6 +431,11 @@ class DTWorkload(mb.MistralSecureModelBase):
         sa.Index('%s_project_id' % __tablename__, 'project_id'),
         sa.Index('%s_scope' % __tablename__, 'scope'),
         sa.Index('%s_workflow_name' % __tablename__, 'workflow_name'),
+        sa.Index(
+            '%s_executed_deadline' % __tablename__,
+            'executed',
+            'deadline'
+        ),
     )
 
     id = mb.id_column()
@@ -423,7 +450,9 @@ class DTWorkload(mb.MistralSecureModelBase):
         sa.String(36),
         sa.ForeignKey(WorkflowDefinition.id)
     )
-    workflow = relationship('WorkflowDefinition', lazy='joined')
+    # Workloads are polled frequently, workflow definition is loaded
+    # only if it's really needed.
+    workflow = relationship('WorkflowDefinition', lazy='select')
 
     workflow_params = sa.Column(st.JsonDictType())
     workflow_params_hash = sa.Column(
@@ -438,13 +467,61 @@ class DTWorkload(mb.MistralSecureModelBase):
 
     trust_id = sa.Column(sa.String(80))
 
+    # Size of serialized workflow input in bytes.
+    workflow_input_size = sa.Column(sa.Integer, nullable=True)
+
+    # Time the workload is planned to start at and the history of changes
+    # of this time made because of the cluster load.
+    planned_start_time = sa.Column(sa.DateTime, nullable=True)
+    reschedule_count = sa.Column(sa.Integer, default=0)
+    rescheduled_at = sa.Column(sa.DateTime, nullable=True)
+    reschedule_reason = sa.Column(sa.String(255), nullable=True)
+
+    # Identifies the claim that marked the workload as executed.
+    claim_token = sa.Column(sa.String(36), nullable=True)
+
     def to_dict(self):
         d = super(DTWorkload, self).to_dict()
 
         mb.datetime_to_str(d, 'deadline')
+        mb.datetime_to_str(d, 'planned_start_time')
+        mb.datetime_to_str(d, 'rescheduled_at')
 
         return d
 
+
+class WorkflowDurationStats(mb.MistralModelBase):
+    """Contains histogram of durations of successful workflow executions."""
+
+    __tablename__ = 'workflow_duration_stats_v2'
+
+    __table_args__ = (
+        sa.UniqueConstraint('workflow_id', 'input_size_bucket'),
+    )
+
+    id = mb.id_column()
+    workflow_id = sa.Column(sa.String(36), nullable=False)
+    input_size_bucket = sa.Column(sa.Integer, nullable=False)
+    count = sa.Column(sa.Integer, nullable=False, default=0)
+
+    # {duration bucket: number of executions}
+    histogram = sa.Column(st.JsonDictType())
+
+
+class Fingerprint(mb.MistralModelBase):
+    """Contains fingerprints of data synchronized with the DB on startup.
+
+    A fingerprint allows to skip synchronization if the data (e.g. system
+    actions provided by installed packages) hasn't changed since the last
+    time.
+    """
+
+    __tablename__ = 'fingerprints_v2'
+
+    id = mb.id_column()
+    name = sa.Column(sa.String(80), nullable=False, unique=True)
+    value = sa.Column(sa.String(64), nullable=False)
+
 # Register all hooks related to secure models.
 mb.register_secure_model_hooks()
 
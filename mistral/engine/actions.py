@@ -20,6 +20,7 @@ from osprofiler import profiler
 import six
 
 from mistral.db.v2 import api as db_api
+from mistral.engine import executor_routing
 from mistral.engine.rpc_backend import rpc
 from mistral.engine import utils as e_utils
 from mistral.engine import workflow_handler as wf_handler
@@ -214,10 +215,12 @@ class PythonAction(Action):
             action_ex_id=action_ex_id
         )
 
+        # If all executors are saturated the action is postponed to let
+        # them process what they already have.
         scheduler.schedule_call(
             None,
             _RUN_EXISTING_ACTION_PATH,
-            0,
+            executor_routing.get_schedule_delay(),
             action_ex_id=self.action_ex.id,
             target=target
         )
@@ -250,7 +253,7 @@ class PythonAction(Action):
             self.action_def.action_class,
             self.action_def.attributes or {},
             input_dict,
-            target,
+            executor_routing.select_target(target),
             async=False
         )
 
@@ -492,7 +495,7 @@ def _run_existing_action(action_ex_id, target):
         action_def.action_class,
         action_def.attributes or {},
         action_ex.input,
-        target
+        executor_routing.select_target(target)
     )
 
     return _get_action_output(result) if result else None
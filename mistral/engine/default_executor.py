@@ -13,25 +13,88 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import time
+
+import eventlet
+from eventlet import semaphore
+from eventlet import tpool
+from oslo_config import cfg
 from oslo_log import log as logging
 from osprofiler import profiler
 
 from mistral.actions import action_factory as a_f
+from mistral import context as auth_ctx
 from mistral import coordination
 from mistral.engine import base
+from mistral.engine import process_pool
 from mistral.utils import inspect_utils as i_u
 from mistral.workflow import utils as wf_utils
 
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+
+def _run_with_context(ctx, func, *args, **kwargs):
+    auth_ctx.set_ctx(ctx)
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        auth_ctx.set_ctx(None)
+
 
 class DefaultExecutor(base.Executor, coordination.Service):
     def __init__(self, engine_client):
         self._engine_client = engine_client
 
+        self._async_mode = CONF.executor.async_mode
+
+        # Number of actions currently being run by this executor.
+        self._in_flight = 0
+
+        if self._async_mode:
+            # Green thread pool running actions concurrently on the single
+            # event loop of the executor process.
+            self._green_pool = eventlet.GreenPool(
+                CONF.executor.async_pool_size
+            )
+
+            # Bounds the number of native threads occupied by actions
+            # which are not known to cooperate with the event loop.
+            self._thread_sem = semaphore.Semaphore(
+                CONF.executor.sync_thread_pool_size
+            )
+
+            tpool.set_num_threads(CONF.executor.sync_thread_pool_size)
+
+        if process_pool.is_enabled():
+            # Fork worker processes in advance so that they are ready
+            # when the first action arrives.
+            process_pool.get_pool()
+
         coordination.Service.__init__(self, 'executor_group')
 
+    def stop(self):
+        process_pool.shutdown()
+
+        coordination.Service.stop(self)
+
+    def _get_capacity(self):
+        if self._async_mode:
+            return CONF.executor.async_pool_size
+
+        # Size of green thread pool oslo.messaging uses to process requests.
+        return getattr(CONF, 'executor_thread_pool_size', 64)
+
+    def get_capabilities(self):
+        return {
+            'host': CONF.executor.host,
+            'in_flight': self._in_flight,
+            'capacity': self._get_capacity()
+        }
+
     @profiler.trace('executor-run-action')
     def run_action(self, action_ex_id, action_class_str, attributes,
                    action_params):
@@ -43,6 +106,71 @@ class DefaultExecutor(base.Executor, coordination.Service):
         :param action_params: Action parameters.
         """
 
+        # If action execution id is given then the result is delivered to
+        # the engine via on_action_complete() and nobody waits for the
+        # return value so in async mode the action can run in background.
+        self._in_flight += 1
+
+        if self._async_mode and action_ex_id:
+            ctx = auth_ctx.ctx() if auth_ctx.has_ctx() else None
+
+            self._green_pool.spawn_n(
+                _run_with_context,
+                ctx,
+                self._run_tracked_action,
+                action_ex_id,
+                action_class_str,
+                attributes,
+                action_params
+            )
+
+            return None
+
+        return self._run_tracked_action(
+            action_ex_id,
+            action_class_str,
+            attributes,
+            action_params
+        )
+
+    def _run_tracked_action(self, *args):
+        try:
+            return self._run_action(*args)
+        finally:
+            self._in_flight -= 1
+
+    def _invoke_action(self, action, action_class_str, attributes,
+                       action_params):
+        """Calls action logic according to the executor mode.
+
+        Actions configured to run in the process pool always run in one of
+        the pre-forked worker processes. In async mode actions that provide
+        method run_async() are known to perform only cooperative (green) I/O
+        and run directly in the green thread. Other actions run in a bounded
+        pool of native threads so that they don't block the event loop.
+        """
+        if process_pool.should_run_in_process(type(action), action_class_str):
+            return process_pool.run_action(
+                action_class_str,
+                attributes,
+                action_params
+            )
+
+        if not self._async_mode:
+            return action.run()
+
+        run_async = getattr(action, 'run_async', None)
+
+        if run_async:
+            return run_async()
+
+        ctx = auth_ctx.ctx() if auth_ctx.has_ctx() else None
+
+        with self._thread_sem:
+            return tpool.execute(_run_with_context, ctx, action.run)
+
+    def _run_action(self, action_ex_id, action_class_str, attributes,
+                    action_params):
         def send_error_back(error_msg):
             error_result = wf_utils.Result(error=error_msg)
 
@@ -56,12 +184,24 @@ class DefaultExecutor(base.Executor, coordination.Service):
 
             return error_result
 
-        action_cls = a_f.construct_action_class(action_class_str, attributes)
+        setup_start = time.time()
+
+        action_cls = a_f.get_action_class(action_class_str, attributes)
 
         # Instantiate action.
 
         try:
             action = action_cls(**action_params)
+
+            setup_time = time.time() - setup_start
+
+            a_f.record_setup_time(action_class_str, setup_time)
+
+            LOG.debug(
+                "Action %s is set up in %.4f sec.",
+                action_class_str,
+                setup_time
+            )
         except Exception as e:
             msg = ("Failed to initialize action %s. Action init params = %s."
                    " Actual init params = %s. More info: %s"
@@ -74,7 +214,12 @@ class DefaultExecutor(base.Executor, coordination.Service):
         # Run action.
 
         try:
-            result = action.run()
+            result = self._invoke_action(
+                action,
+                action_class_str,
+                attributes,
+                action_params
+            )
 
             # Note: it's made for backwards compatibility with already
             # existing Mistral actions which don't return result as
@@ -0,0 +1,210 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Capacity-aware routing of actions to executors.
+
+Executors advertise their load (number of actions in flight and the size of
+their pool) as capabilities of the coordination group 'executor_group'. The
+engine uses this information to send actions directly to the least loaded
+executor and to postpone scheduling of new actions when all executors are
+saturated.
+"""
+
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import tooz.coordination
+
+from mistral import coordination
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+EXECUTOR_GROUP = 'executor_group'
+
+_BALANCER = None
+
+
+class ExecutorLoadBalancer(object):
+    """Keeps track of executor load and selects executors for actions."""
+
+    def __init__(self, refresh_interval, get_capabilities=None):
+        """Creates load balancer.
+
+        :param refresh_interval: Number of seconds the load snapshot
+            is used before it's fetched from the coordination backend again.
+        :param get_capabilities: Function returning dictionary
+            {member_id: capabilities}. By default capabilities are fetched
+            from the coordination group of executors.
+        """
+        self._refresh_interval = refresh_interval
+        self._get_capabilities = (
+            get_capabilities or self._get_capabilities_from_coordinator
+        )
+
+        # {executor_host: [in_flight, capacity]}
+        self._loads = {}
+        self._refreshed_at = None
+
+        # Hosts already reported to be shared by several executors.
+        self._shared_hosts = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_capabilities_from_coordinator():
+        service_coordinator = coordination.get_service_coordinator()
+
+        try:
+            return service_coordinator.get_members_capabilities(
+                EXECUTOR_GROUP
+            )
+        except tooz.coordination.ToozError as e:
+            LOG.warning("Failed to get executors capabilities: %s", e)
+
+            return {}
+
+    def _refresh(self):
+        # Actions are routed to the direct queue of an executor named after
+        # [executor]/host. Executors having the same host consume from the
+        # same queue so they're accounted as a single executor.
+        loads = {}
+        members = {}
+
+        for member_id, caps in self._get_capabilities().items():
+            if not isinstance(caps, dict) or not caps.get('host'):
+                continue
+
+            load = loads.setdefault(caps['host'], [0, 0])
+
+            load[0] += caps.get('in_flight', 0)
+            load[1] += caps.get('capacity', 0)
+
+            members.setdefault(caps['host'], []).append(member_id)
+
+        for host, member_ids in members.items():
+            if len(member_ids) > 1 and host not in self._shared_hosts:
+                self._shared_hosts.add(host)
+
+                LOG.warning(
+                    "Executors %s have the same host '%s', actions can't be"
+                    " routed to them individually. Set unique"
+                    " [executor]/host for every executor to balance load"
+                    " between them.", sorted(member_ids), host
+                )
+
+        self._loads = loads
+        self._refreshed_at = time.time()
+
+        LOG.debug("Executor loads: %s", loads)
+
+    def _ensure_fresh(self):
+        if (self._refreshed_at is None or
+                time.time() - self._refreshed_at >= self._refresh_interval):
+            self._refresh()
+
+    def select_target(self):
+        """Selects the least loaded executor.
+
+        The returned executor is considered to have one more action in
+        flight until the next refresh of the load snapshot so that
+        subsequent calls spread actions across executors.
+
+        :return: Host name of executor or None if the shared executor topic
+            should be used (load is unknown or all executors are saturated).
+        """
+        with self._lock:
+            self._ensure_fresh()
+
+            # Routing makes sense only if there are several executors
+            # distinguishable by their host names.
+            if len(self._loads) < 2:
+                return None
+
+            candidates = [
+                (float(load[0]) / load[1], host)
+                for host, load in self._loads.items()
+                if load[0] < load[1]
+            ]
+
+            if not candidates:
+                return None
+
+            _, host = min(candidates)
+
+            self._loads[host][0] += 1
+
+            return host
+
+    def is_saturated(self):
+        """Checks if all known executors have no free capacity."""
+        with self._lock:
+            self._ensure_fresh()
+
+            return bool(self._loads) and all(
+                load[0] >= load[1] for load in self._loads.values()
+            )
+
+
+def get_load_balancer():
+    global _BALANCER
+
+    if not _BALANCER:
+        _BALANCER = ExecutorLoadBalancer(
+            CONF.engine.executor_load_refresh_interval
+        )
+
+    return _BALANCER
+
+
+def cleanup():
+    """Intends to be used by tests to recreate load balancer."""
+    global _BALANCER
+
+    _BALANCER = None
+
+
+def select_target(target):
+    """Returns executor target for an action.
+
+    :param target: Target explicitly requested for an action (if any).
+    :return: Requested target, the least loaded executor or None.
+    """
+    if target or not CONF.engine.executor_load_balancing:
+        return target
+
+    return get_load_balancer().select_target()
+
+
+def get_schedule_delay():
+    """Returns number of seconds scheduling of a new action is postponed.
+
+    Non-zero delay is returned only when all executors are saturated.
+    """
+    if not CONF.engine.executor_load_balancing:
+        return 0
+
+    if get_load_balancer().is_saturated():
+        LOG.debug(
+            "All executors are saturated, postponing action for %s sec.",
+            CONF.engine.executor_backpressure_delay
+        )
+
+        return CONF.engine.executor_backpressure_delay
+
+    return 0
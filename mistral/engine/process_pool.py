@@ -0,0 +1,258 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Pool of pre-forked processes running CPU-bound actions.
+
+Actions holding the GIL for a long time (e.g. JavaScript evaluation or big
+data transformations) starve the event loop of the executor process which
+also serves RPC. Such actions can be configured to run in a separate
+process either by setting class attribute "run_in_process" to True or by
+listing the action class in [executor]/process_pool_actions.
+"""
+
+import multiprocessing.pool as mp_pool
+import threading
+
+import eventlet
+from eventlet import hubs
+from eventlet import patcher
+from eventlet import tpool
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import importutils
+import six
+
+from mistral.actions import action_factory as a_f
+from mistral import context as auth_ctx
+from mistral import exceptions as exc
+from mistral.workflow import utils as wf_utils
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+_POOL = None
+
+_POOL_LOCK = threading.Lock()
+
+# Pools replaced because of a hung worker process, waiting to be terminated.
+_RETIRED_POOLS = []
+
+_POOL_MODULE_PATCHED = False
+
+
+def _init_worker(action_classes):
+    # Forked worker inherits the event loop of the executor process which
+    # shares the epoll instance and the wake up pipe of tpool with the
+    # parent. Polling it in the worker could steal the parent's events so
+    # the worker starts its own event loop.
+    hubs.use_hub()
+
+    # Import action modules once per worker so that workers are warm
+    # when they receive their first action.
+    for action_class_str in action_classes:
+        try:
+            importutils.import_class(action_class_str)
+        except Exception as e:
+            LOG.warning(
+                "Failed to preload action class %s in worker process: %s",
+                action_class_str, e
+            )
+
+
+def _run_action_in_worker(action_class_str, attributes, action_params,
+                          ctx_dict):
+    auth_ctx.set_ctx(auth_ctx.MistralContext(**ctx_dict) if ctx_dict else None)
+
+    try:
+        action_cls = a_f.get_action_class(action_class_str, attributes)
+
+        result = action_cls(**action_params).run()
+
+        # Return only plain data since an action result is pickled when
+        # it's sent back to the executor process.
+        if isinstance(result, wf_utils.Result):
+            return result.data, result.error
+
+        return result, None
+    finally:
+        auth_ctx.set_ctx(None)
+
+
+def is_enabled():
+    return CONF.executor.process_pool_size > 0
+
+
+def should_run_in_process(action_cls, action_class_str):
+    """Checks if action of the given class must run in the process pool."""
+    if not is_enabled():
+        return False
+
+    return (getattr(action_cls, 'run_in_process', False) or
+            action_class_str in CONF.executor.process_pool_actions)
+
+
+def _patch_pool_module():
+    """Makes multiprocessing.pool use native threads.
+
+    Executor process is monkey patched by eventlet but the pool needs real
+    threads to communicate with worker processes. patcher.original() would
+    return a copy of the module which still imports green threading and
+    whose exception helpers can't be pickled by worker processes, so the
+    module is pointed to unpatched threading and queue modules instead.
+    It's done only once the pool is needed so that processes not running
+    actions in the pool keep the module intact.
+    """
+    global _POOL_MODULE_PATCHED
+
+    if _POOL_MODULE_PATCHED:
+        return
+
+    # The module is named 'Queue' on Python 2.
+    queue_name = six.moves.queue.__name__
+
+    mp_pool.threading = patcher.original('threading')
+    setattr(mp_pool, queue_name, patcher.original(queue_name))
+
+    _POOL_MODULE_PATCHED = True
+
+
+def get_pool():
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is None:
+            _patch_pool_module()
+
+            _POOL = mp_pool.Pool(
+                processes=CONF.executor.process_pool_size,
+                initializer=_init_worker,
+                initargs=(list(CONF.executor.process_pool_actions),),
+                maxtasksperchild=(
+                    CONF.executor.process_pool_max_tasks_per_child or None
+                )
+            )
+
+            LOG.info(
+                "Started action process pool [size=%s, max_tasks_per_child"
+                "=%s]", CONF.executor.process_pool_size,
+                CONF.executor.process_pool_max_tasks_per_child
+            )
+
+        return _POOL
+
+
+def _terminate_pool(pool):
+    pool.terminate()
+    pool.join()
+
+
+def _terminate_retired_pool(pool):
+    with _POOL_LOCK:
+        if pool not in _RETIRED_POOLS:
+            # Already terminated by shutdown().
+            return
+
+        _RETIRED_POOLS.remove(pool)
+
+    # Terminating joins threads of the pool, don't block the event loop.
+    tpool.execute(_terminate_pool, pool)
+
+
+def _retire_pool(pool, delay):
+    """Replaces a pool having a hung worker process with a new one.
+
+    A worker process running a particular action can't be terminated
+    alone so the whole pool is retired. It doesn't accept new actions and
+    its workers are killed after 'delay' seconds which gives other actions
+    running in it a chance to complete.
+    """
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is not pool:
+            # Already retired because of another timed out action.
+            return
+
+        _POOL = None
+
+        _RETIRED_POOLS.append(pool)
+
+    pool.close()
+
+    eventlet.spawn_after(delay, _terminate_retired_pool, pool)
+
+    LOG.warning(
+        "Action process pool has been replaced because of a hung worker "
+        "process, the old pool will be terminated in %s sec.", delay
+    )
+
+
+def run_action(action_class_str, attributes, action_params):
+    """Runs action in a worker process.
+
+    The calling green thread waits for the result without blocking the
+    event loop of the executor.
+
+    :param action_class_str: Path to action class in dot notation.
+    :param attributes: Attributes of action class which will be set to.
+    :param action_params: Action parameters.
+    :return: Action result as an instance of workflow.utils.Result.
+    """
+    ctx = auth_ctx.ctx() if auth_ctx.has_ctx() else None
+
+    pool = get_pool()
+
+    async_res = pool.apply_async(
+        _run_action_in_worker,
+        (
+            action_class_str,
+            attributes,
+            action_params,
+            ctx.to_dict() if ctx else None
+        )
+    )
+
+    timeout = CONF.executor.process_pool_action_timeout or None
+
+    try:
+        data, error = tpool.execute(async_res.get, timeout)
+    except mp_pool.TimeoutError:
+        _retire_pool(pool, timeout)
+
+        raise exc.ActionException(
+            "Action %s has not completed in worker process within %s sec."
+            % (action_class_str, timeout)
+        )
+
+    return wf_utils.Result(data=data, error=error)
+
+
+def shutdown():
+    global _POOL
+
+    with _POOL_LOCK:
+        pools = list(_RETIRED_POOLS)
+
+        if _POOL is not None:
+            pools.append(_POOL)
+
+        _POOL = None
+
+        del _RETIRED_POOLS[:]
+
+    for pool in pools:
+        _terminate_pool(pool)
@@ -541,7 +541,12 @@ class ExecutorClient(base.Executor):
         rpc_client_method = (self._client.async_call
                              if async else self._client.sync_call)
 
-        res = rpc_client_method(auth_ctx.ctx(), 'run_action', **kwargs)
+        res = rpc_client_method(
+            auth_ctx.ctx(),
+            'run_action',
+            target=target,
+            **kwargs
+        )
 
         # TODO(rakhmerov): It doesn't seem a good approach since we have
         # a serializer for Result class. A better solution would be to
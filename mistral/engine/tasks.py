@@ -26,6 +26,7 @@ from mistral.engine import dispatcher
 from mistral.engine import policies
 from mistral import exceptions as exc
 from mistral import expressions as expr
+from mistral.services import state_notifications
 from mistral import utils
 from mistral.utils import wf_trace
 from mistral.workbook import parser as spec_parser
@@ -112,12 +113,22 @@ class Task(object):
             (self.task_ex.id, self.task_ex.state, state, state_info)
         )
 
+        cur_state = self.task_ex.state
+
         self.task_ex.state = state
         self.task_ex.state_info = state_info
 
         if processed is not None:
             self.task_ex.processed = processed
 
+        if cur_state != state:
+            state_notifications.publish(
+                'task',
+                self.task_ex,
+                state,
+                state_info
+            )
+
     @profiler.trace('task-complete')
     def complete(self, state, state_info=None):
         """Complete task and set specified state.
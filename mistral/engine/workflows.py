@@ -26,7 +26,9 @@ from mistral.engine import dispatcher
 from mistral.engine.rpc_backend import rpc
 from mistral.engine import utils as eng_utils
 from mistral import exceptions as exc
+from mistral.services import delay_tolerant_workload as dtw_service
 from mistral.services import scheduler
+from mistral.services import state_notifications
 from mistral.services import workflows as wf_service
 from mistral import utils
 from mistral.utils import wf_trace
@@ -203,6 +205,14 @@ class Workflow(object):
                 "Execution of workflow '%s' [%s -> %s]"
                 % (self.wf_ex.workflow_name, cur_state, state)
             )
+
+            if cur_state != state:
+                state_notifications.publish(
+                    'workflow',
+                    self.wf_ex,
+                    state,
+                    state_info
+                )
         else:
             msg = ("Can't change workflow execution state from %s to %s. "
                    "[workflow=%s, execution_id=%s]" %
@@ -289,6 +299,8 @@ class Workflow(object):
         # Set workflow execution to success until after output is evaluated.
         self.set_state(states.SUCCESS, msg)
 
+        dtw_service.on_workflow_success(self.wf_ex)
+
         if self.wf_ex.task_execution_id:
             self._schedule_send_result_to_parent_workflow()
 
@@ -13,27 +13,47 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
+import hashlib
 import inspect
+import json
+import os
+import tempfile
 
+from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+import pkg_resources as pkg
 from stevedore import extension
 
 from mistral.actions import action_factory
+from mistral.actions import base
 from mistral.actions import generator_factory
+from mistral.actions.openstack.action_generator import base as os_generator
 from mistral.db.v2 import api as db_api
 from mistral import exceptions as exc
 from mistral.services import actions
 from mistral import utils
 from mistral.utils import inspect_utils as i_utils
+from mistral import version
 
 
 # TODO(rakhmerov): Make methods more consistent and granular.
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+CONF.import_opt('openstack_actions_manifest_path', 'mistral.config')
+
 ACTIONS_PATH = 'resources/actions'
 _ACTION_CTX_PARAM = 'action_context'
 
+SYSTEM_ACTIONS_FINGERPRINT = 'system_actions'
+
+# Action definition fields compared to detect changed system actions.
+_SYSTEM_ACTION_FIELDS = ('action_class', 'attributes', 'description', 'input')
+
 
 # TODO(rakhmerov): It's confusing because we have std.xxx actions and actions
 # TODO(rakhmerov): under '../resources/actions' that we also call standard.
@@ -52,9 +72,9 @@ def get_registered_actions(**kwargs):
     return db_api.get_action_definitions(**kwargs)
 
 
-def register_action_class(name, action_class_str, attributes,
-                          description=None, input_str=None):
-    values = {
+def _get_system_action_values(name, action_class_str, attributes,
+                              description=None, input_str=None):
+    return {
         'name': name,
         'action_class': action_class_str,
         'attributes': attributes,
@@ -64,6 +84,17 @@ def register_action_class(name, action_class_str, attributes,
         'scope': 'public'
     }
 
+
+def register_action_class(name, action_class_str, attributes,
+                          description=None, input_str=None):
+    values = _get_system_action_values(
+        name,
+        action_class_str,
+        attributes,
+        description,
+        input_str
+    )
+
     try:
         LOG.debug("Registering action in DB: %s" % name)
 
@@ -72,18 +103,178 @@ def register_action_class(name, action_class_str, attributes,
         LOG.debug("Action %s already exists in DB." % name)
 
 
-def _clear_system_action_db():
-    db_api.delete_action_definitions(is_system=True)
+def _hash(*parts):
+    h = hashlib.sha256()
+
+    for part in parts:
+        h.update(part.encode('utf-8') if not isinstance(part, bytes) else part)
+        h.update(b'\0')
+
+    return h.hexdigest()
+
+
+def _get_extension_manager():
+    return extension.ExtensionManager(
+        namespace='mistral.actions',
+        invoke_on_load=False
+    )
+
+
+def get_openstack_actions_fingerprint():
+    """Returns fingerprint of generated OpenStack actions.
+
+    Generated actions only depend on versions of installed packages
+    (python clients) and the actions mapping.
+    """
+    packages = sorted(
+        '%s==%s' % (d.project_name, d.version) for d in pkg.working_set
+    )
+
+    return _hash(
+        version.version_info.version_string(),
+        '\n'.join(packages),
+        json.dumps(os_generator.get_mapping(), sort_keys=True)
+    )
+
+
+def get_system_actions_fingerprint(openstack_fingerprint=None):
+    """Returns fingerprint of all actions registered by sync_db()."""
+    entry_points = sorted(
+        '%s=%s' % (ext.name, ext.entry_point_target)
+        for ext in _get_extension_manager()
+    )
+
+    standard_actions = []
+
+    for action_path in sorted(utils.get_file_list(ACTIONS_PATH)):
+        with open(action_path) as f:
+            standard_actions.append(f.read())
+
+    return _hash(
+        openstack_fingerprint or get_openstack_actions_fingerprint(),
+        '\n'.join(entry_points),
+        *standard_actions
+    )
 
 
-def sync_db():
+def sync_db(force=False):
+    """Synchronizes system actions with the DB.
+
+    Nothing is done if the fingerprint of system actions is the same as
+    the one stored by the previous synchronization. Otherwise only
+    created, changed or removed actions are written to the DB.
+
+    :param force: If True, actions are synchronized regardless of the
+        fingerprint, e.g. to restore modified system actions.
+    """
+    openstack_fingerprint = get_openstack_actions_fingerprint()
+    fingerprint = get_system_actions_fingerprint(openstack_fingerprint)
+
     with db_api.transaction():
-        _clear_system_action_db()
-        register_action_classes()
+        if (not force and
+                db_api.get_fingerprint(SYSTEM_ACTIONS_FINGERPRINT) ==
+                fingerprint):
+            LOG.info("System actions are up to date, skipping sync.")
+
+            return
+
+        _sync_system_actions(_get_action_classes(openstack_fingerprint))
+
         register_standard_actions()
 
+        db_api.set_fingerprint(SYSTEM_ACTIONS_FINGERPRINT, fingerprint)
+
+
+def _sync_system_actions(values_list):
+    expected = collections.OrderedDict()
+
+    for values in values_list:
+        if values['name'] in expected:
+            LOG.debug("Action %s already registered." % values['name'])
+        else:
+            expected[values['name']] = values
+
+    existing = dict(
+        (a_def.name, a_def)
+        for a_def in db_api.get_action_definitions(is_system=True)
+    )
+
+    to_create = []
+    to_update = []
+
+    for name, values in expected.items():
+        a_def = existing.pop(name, None)
+
+        if a_def is None:
+            to_create.append(values)
+        elif any(getattr(a_def, f) != values[f]
+                 for f in _SYSTEM_ACTION_FIELDS):
+            to_update.append(dict(values, id=a_def.id))
+
+    to_delete = [d.id for d in existing.values()]
+
+    db_api.create_action_definitions(to_create)
+    db_api.update_action_definitions(to_update)
+    db_api.delete_action_definitions_by_ids(to_delete)
+
+    LOG.info(
+        "Synchronized system actions [created=%s, updated=%s, deleted=%s]",
+        len(to_create), len(to_update), len(to_delete)
+    )
+
+
+def _load_manifest(path, fingerprint):
+    try:
+        with open(path, 'rb') as f:
+            manifest = jsonutils.loads(f.read())
+    except (IOError, ValueError) as e:
+        LOG.debug("Failed to load actions manifest %s: %s", path, e)
+
+        return None
+
+    if manifest.get('fingerprint') != fingerprint:
+        return None
+
+    return manifest.get('actions')
+
+
+def _save_manifest(path, fingerprint, actions_values):
+    manifest = {'fingerprint': fingerprint, 'actions': actions_values}
+
+    tmp_path = None
+
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path))
+        )
+
+        with os.fdopen(fd, 'w') as f:
+            jsonutils.dump(manifest, f)
+
+        # Rename is atomic so concurrent processes never read a partially
+        # written manifest.
+        os.rename(tmp_path, path)
+    except (IOError, OSError, TypeError, ValueError) as e:
+        LOG.warning("Failed to save actions manifest %s: %s", path, e)
+
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _get_action_attributes(action_class):
+    # Flags common to all actions (e.g. reusable_client) are inherited by
+    # the action class anyway so they don't belong to action definitions.
+    attrs = i_utils.get_public_fields(action_class)
+
+    for name in i_utils.get_public_fields(base.Action):
+        attrs.pop(name, None)
+
+    return attrs
+
+
+def _introspect_dynamic_action_classes():
+    actions_values = []
 
-def _register_dynamic_action_classes():
     for generator in generator_factory.all_generators():
         actions = generator.create_actions()
 
@@ -93,39 +284,81 @@ def _register_dynamic_action_classes():
         action_class_str = "%s.%s" % (module, class_name)
 
         for action in actions:
-            attrs = i_utils.get_public_fields(action['class'])
-
-            register_action_class(
-                action['name'],
-                action_class_str,
-                attrs,
-                action['description'],
-                action['arg_list']
+            attrs = _get_action_attributes(action['class'])
+
+            actions_values.append(
+                _get_system_action_values(
+                    action['name'],
+                    action_class_str,
+                    attrs,
+                    action['description'],
+                    action['arg_list']
+                )
             )
 
+    return actions_values
+
+
+def _get_dynamic_action_classes(fingerprint=None):
+    """Returns values of generated action definitions.
+
+    Introspecting python clients is expensive so if the manifest path is
+    configured results are cached there until the fingerprint changes.
+    """
+    path = CONF.openstack_actions_manifest_path
+
+    if not path:
+        return _introspect_dynamic_action_classes()
+
+    fingerprint = fingerprint or get_openstack_actions_fingerprint()
+
+    actions_values = _load_manifest(path, fingerprint)
+
+    if actions_values is None:
+        actions_values = _introspect_dynamic_action_classes()
+
+        _save_manifest(path, fingerprint, actions_values)
+
+    return actions_values
+
+
+def _get_action_classes(openstack_fingerprint=None):
+    mgr = _get_extension_manager()
+
+    actions_values = []
 
-def register_action_classes():
-    mgr = extension.ExtensionManager(
-        namespace='mistral.actions',
-        invoke_on_load=False
-    )
     for name in mgr.names():
         action_class_str = mgr[name].entry_point_target.replace(':', '.')
         action_class = mgr[name].plugin
         description = i_utils.get_docstring(action_class)
         input_str = i_utils.get_arg_list_as_str(action_class.__init__)
 
-        attrs = i_utils.get_public_fields(mgr[name].plugin)
+        attrs = _get_action_attributes(action_class)
 
-        register_action_class(
-            name,
-            action_class_str,
-            attrs,
-            description=description,
-            input_str=input_str
+        actions_values.append(
+            _get_system_action_values(
+                name,
+                action_class_str,
+                attrs,
+                description=description,
+                input_str=input_str
+            )
         )
 
-    _register_dynamic_action_classes()
+    actions_values.extend(_get_dynamic_action_classes(openstack_fingerprint))
+
+    return actions_values
+
+
+def register_action_classes():
+    for values in _get_action_classes():
+        register_action_class(
+            values['name'],
+            values['action_class'],
+            values['attributes'],
+            values['description'],
+            values['input']
+        )
 
 
 def get_action_db(action_name):
@@ -0,0 +1,219 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""In-memory schedule of cron trigger fire times.
+
+Instead of querying cron triggers due every second, each process running
+periodic tasks keeps fire times of its share of cron triggers in a timing
+wheel. The wheel is refreshed from the DB incrementally with a lightweight
+projection (ID and next execution time of triggers changed since the last
+refresh) and fully reloaded periodically or when the set of processes
+changes, so the DB is only hit for triggers that are actually due.
+
+Triggers are partitioned between members of the coordination group of
+API processes (which run periodic tasks) by hash of their IDs. Without
+a coordination backend every process handles all triggers, which is
+still safe since firing a trigger is guarded by a compare-and-set.
+"""
+
+import datetime
+import hashlib
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
+import six
+import tooz.coordination
+
+from mistral import coordination
+from mistral.db.v2 import api as db_api
+from mistral.utils import timing_wheel
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+# Periodic tasks run in API processes.
+PERIODIC_TASKS_GROUP = 'api_group'
+
+_WHEEL = None
+
+
+def _to_text(value):
+    if isinstance(value, six.binary_type):
+        return value.decode('utf-8')
+
+    return value
+
+
+def _get_members():
+    """Returns sorted IDs of members sharing triggers and own member ID."""
+    service_coordinator = coordination.get_service_coordinator()
+
+    try:
+        members = service_coordinator.get_members(PERIODIC_TASKS_GROUP)
+    except tooz.coordination.ToozError as e:
+        LOG.warning("Failed to get members of %s: %s", PERIODIC_TASKS_GROUP, e)
+
+        members = []
+
+    return (
+        tuple(sorted(_to_text(m) for m in members)),
+        _to_text(service_coordinator.member_id)
+    )
+
+
+class CronTriggerWheel(object):
+    def __init__(self, refresh_interval, resync_interval, get_members=None):
+        """Creates cron trigger wheel.
+
+        :param refresh_interval: Number of seconds between incremental
+            refreshes from the DB.
+        :param resync_interval: Number of seconds between full reloads.
+        :param get_members: Function returning tuple (sorted member IDs,
+            own member ID). By default members of the coordination group
+            of API processes are used.
+        """
+        self._refresh_interval = refresh_interval
+        self._resync_interval = resync_interval
+        self._get_members = get_members or _get_members
+
+        self._wheel = timing_wheel.TimingWheel(datetime.datetime.now())
+        self._lock = threading.Lock()
+
+        self._members = None
+        self._member_idx = None
+
+        # UTC times used to filter triggers by 'created_at'/'updated_at'.
+        self._refreshed_at = None
+        self._resynced_at = None
+
+    def owns(self, trigger_id):
+        """Checks if the trigger is handled by this process."""
+        if not self._members or self._member_idx is None:
+            return True
+
+        h = int(hashlib.md5(trigger_id.encode('utf-8')).hexdigest(), 16)
+
+        return h % len(self._members) == self._member_idx
+
+    def _update_members(self):
+        members, member_id = self._get_members()
+
+        if members == self._members:
+            return False
+
+        LOG.info(
+            "Members sharing cron triggers changed: %s, own ID: %s",
+            members, member_id
+        )
+
+        self._members = members
+        self._member_idx = (
+            members.index(member_id) if member_id in members else None
+        )
+
+        return True
+
+    def _load(self, changed_since=None):
+        for trigger_id, fire_time in db_api.get_cron_trigger_fire_times(
+                changed_since=changed_since):
+            if fire_time and self.owns(trigger_id):
+                self._wheel.add(trigger_id, fire_time)
+            else:
+                self._wheel.remove(trigger_id)
+
+    def _refresh(self):
+        # Start time of the previous refresh is used so that changes made
+        # while it was running are not missed.
+        now = timeutils.utcnow()
+
+        resync_due = (
+            self._resynced_at is None or
+            (now - self._resynced_at).total_seconds() >=
+            self._resync_interval
+        )
+
+        if self._update_members() or resync_due:
+            self._wheel.clear()
+
+            self._load()
+
+            self._resynced_at = now
+        elif (now - self._refreshed_at).total_seconds() >= \
+                self._refresh_interval:
+            self._load(changed_since=self._refreshed_at)
+        else:
+            return
+
+        self._refreshed_at = now
+
+    def add(self, trigger_id, fire_time):
+        """Adds a trigger created or advanced by this process."""
+        with self._lock:
+            if fire_time and self.owns(trigger_id):
+                self._wheel.add(trigger_id, fire_time)
+
+    def get_next_cron_triggers(self, time):
+        """Returns cron triggers handled by this process due before time."""
+        with self._lock:
+            self._refresh()
+
+            ids = self._wheel.advance(time)
+
+        if not ids:
+            return []
+
+        next_triggers = []
+
+        # Triggers might have been changed or deleted in the meantime.
+        for t in db_api.get_cron_triggers_by_ids(ids):
+            if t.next_execution_time < time:
+                next_triggers.append(t)
+            else:
+                self.add(t.id, t.next_execution_time)
+
+        return next_triggers
+
+
+def is_enabled():
+    return CONF.engine.cron_trigger_timing_wheel
+
+
+def get_wheel():
+    global _WHEEL
+
+    if not _WHEEL:
+        _WHEEL = CronTriggerWheel(
+            CONF.engine.cron_trigger_wheel_refresh_interval,
+            CONF.engine.cron_trigger_wheel_resync_interval
+        )
+
+    return _WHEEL
+
+
+def cleanup():
+    """Intends to be used by tests to recreate cron trigger wheel."""
+    global _WHEEL
+
+    _WHEEL = None
+
+
+def on_trigger_scheduled(trigger_id, fire_time):
+    """Lets the wheel know about new fire time set by this process."""
+    if is_enabled():
+        get_wheel().add(trigger_id, fire_time)
@@ -15,33 +15,585 @@
 # under the License.
 #
 
+import cachetools
+import collections
 import datetime
 from dateutil import parser as date_parser
+import itertools
+import json
+import math
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
 
 from mistral.db.v2 import api as db_api
+from mistral.engine import executor_routing
 from mistral.engine import utils as eng_utils
 from mistral import exceptions as exc
+from mistral.services import cron_trigger_wheel
+from mistral.services import scheduler
 from mistral.services import security
 from mistral.workbook import parser
+from mistral.workflow import states
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_DEADLINE_SCHEDULER = None
+
+_RECORD_DURATION_PATH = (
+    'mistral.services.delay_tolerant_workload.record_workflow_duration'
+)
+
+# Durations are counted in buckets forming a geometric series so that
+# an estimate exceeds actual durations by not more than 20%.
+_DURATION_BUCKET_BASE = 1.2
+
+# {workflow_id: {input size bucket: (count, histogram)}}
+_DURATION_STATS_CACHE = cachetools.TTLCache(maxsize=1000, ttl=60)
+
+_DURATION_STATS_CACHE_LOCK = threading.RLock()
+
+# Names clashing with sub-resources of /v2/delay_tolerant_workloads.
+RESERVED_NAMES = ('bulk',)
+
+# Description of workflow executions started directly by DTW schedulers.
+EXECUTION_DESCRIPTION = "DTW Workflow execution created."
+
+
+class DeadlineScheduler(object):
+    """Capacity-aware earliest deadline first scheduler.
+
+    Time is divided into slots of equal length, every slot can hold at most
+    'capacity' running workloads. On every call of schedule() pending
+    workloads are placed into the slots in the order of their deadlines
+    (ties are broken by the least slack) as early as capacity allows while
+    still finishing before the deadline. Workloads placed into the current
+    slot must be started now, the others are reconsidered on the next call.
+    That way bursts of workloads with similar deadlines are spread over
+    time instead of being started all at once.
+
+    If capacity is not sufficient to meet a deadline the workload is placed
+    where the load is the lowest, workloads with no slack left are started
+    immediately.
+
+    Workloads started by the scheduler occupy capacity for their job
+    duration. This information is kept in memory of the scheduler instance.
+    Executions the scheduler doesn't know about can be taken into account
+    as external load occupying capacity of the current slot. Every process
+    running periodic tasks has its own scheduler, so workloads started by
+    other processes must be passed as external load for the capacity to
+    hold across the cluster (see count_running_workloads()).
+    """
+
+    def __init__(self, capacity, slot_size, get_job_duration=None):
+        """Creates scheduler.
+
+        :param capacity: Maximum number of workloads running concurrently.
+        :param slot_size: Length of a time slot in seconds.
+        :param get_job_duration: Function returning duration of a workload
+            in seconds. By default 'job_duration' of the workload is used.
+        """
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._get_job_duration = (
+            get_job_duration or (lambda w: w.job_duration)
+        )
+
+        # {workload name: slot where it finishes}
+        self._running = {}
+
+    def _to_slot(self, time):
+        return int((time - _EPOCH).total_seconds() // self.slot_size)
+
+    def _num_slots(self, job_duration):
+        if not job_duration:
+            return 1
+
+        return max(1, int(math.ceil(float(job_duration) / self.slot_size)))
+
+    def _find_start(self, usage, earliest, latest, num_slots):
+        # The earliest start with free capacity during the whole job.
+        free = 0
+
+        for slot in range(earliest, latest + num_slots):
+            if usage[slot] < self.capacity:
+                free += 1
+
+                if free == num_slots:
+                    return slot - num_slots + 1
+            else:
+                free = 0
+
+        # Overloaded, the least loaded start.
+        loads = [usage[slot] for slot in range(earliest, latest + num_slots)]
+
+        offset = min(
+            range(latest - earliest + 1),
+            key=lambda i: max(loads[i:i + num_slots])
+        )
+
+        return earliest + offset
+
+    @property
+    def num_running(self):
+        """Number of workloads started by the scheduler still running."""
+        return len(self._running)
+
+    def schedule(self, workloads, now, external_load=0):
+        """Selects workloads that have to be started now.
+
+        :param workloads: Pending workloads, i.e. objects with attributes
+            'name', 'deadline' and 'job_duration' (in seconds).
+        :param now: Current time.
+        :param external_load: Number of running executions not started
+            by the scheduler.
+        :return: List of workloads to start in deadline order.
+        """
+        cur_slot = self._to_slot(now)
+
+        self._running = dict(
+            (name, end) for name, end in self._running.items()
+            if end > cur_slot
+        )
+
+        # {slot: number of workloads planned to run in the slot}
+        usage = collections.defaultdict(int)
+
+        usage[cur_slot] = external_load
+
+        for end in self._running.values():
+            for slot in range(cur_slot, end):
+                usage[slot] += 1
+
+        entries = []
+
+        for w in workloads:
+            num_slots = self._num_slots(self._get_job_duration(w))
+            deadline_slot = self._to_slot(w.deadline)
+
+            entries.append(
+                (deadline_slot, deadline_slot - num_slots, w.name, num_slots,
+                 w)
+            )
+
+        entries.sort(key=lambda e: e[:3])
+
+        to_start = []
+
+        for _, latest, name, num_slots, w in entries:
+            if latest <= cur_slot:
+                start = cur_slot
+            else:
+                start = self._find_start(usage, cur_slot, latest, num_slots)
+
+            for slot in range(start, start + num_slots):
+                usage[slot] += 1
+
+            if start == cur_slot:
+                if latest < cur_slot:
+                    LOG.warning(
+                        "Delay tolerant workload %s is likely to miss its "
+                        "deadline %s.", name, w.deadline
+                    )
+
+                to_start.append(w)
+
+                self._running[name] = cur_slot + num_slots
+
+        return to_start
+
+
+def get_deadline_scheduler():
+    global _DEADLINE_SCHEDULER
+
+    if not _DEADLINE_SCHEDULER:
+        _DEADLINE_SCHEDULER = DeadlineScheduler(
+            CONF.engine.dtw_max_concurrent_executions,
+            CONF.engine.dtw_scheduling_slot,
+            get_effective_job_duration
+        )
+
+    return _DEADLINE_SCHEDULER
+
+
+def cleanup():
+    """Intends to be used by tests to recreate deadline scheduler."""
+    global _DEADLINE_SCHEDULER
+
+    _DEADLINE_SCHEDULER = None
+
+    with _DURATION_STATS_CACHE_LOCK:
+        _DURATION_STATS_CACHE.clear()
+
+
+def get_scheduler_type():
+    """Returns type of DTW scheduler configured."""
+    if CONF.engine.dtw_scheduler:
+        return CONF.engine.dtw_scheduler
+
+    if CONF.engine.dtw_scheduler_last_minute:
+        return 'last_minute'
+
+    return 'immediate'
+
+
+def get_input_size(workflow_input):
+    return len(json.dumps(workflow_input or {}))
+
+
+def _get_input_size_bucket(input_size):
+    return int(input_size or 0).bit_length()
+
+
+def _get_duration_bucket(duration):
+    if duration <= 1:
+        return 0
+
+    return int(math.ceil(math.log(duration, _DURATION_BUCKET_BASE)))
+
+
+def _get_bucket_duration(bucket):
+    return int(math.ceil(_DURATION_BUCKET_BASE ** bucket))
+
+
+def on_workflow_success(wf_ex):
+    """Schedules recording of the workflow execution duration.
+
+    Only top level workflow executions are taken into account since
+    delay tolerant workloads start top level workflows.
+    """
+    if not CONF.engine.dtw_duration_estimates:
+        return
+
+    if wf_ex.task_execution_id or not wf_ex.workflow_id:
+        return
+
+    duration = (timeutils.utcnow() - wf_ex.created_at).total_seconds()
+
+    # Statistics are updated outside of the engine transaction so that
+    # concurrent updates can't break the workflow execution.
+    scheduler.schedule_call(
+        None,
+        _RECORD_DURATION_PATH,
+        0,
+        workflow_id=wf_ex.workflow_id,
+        input_size=get_input_size(wf_ex.input),
+        duration=duration
+    )
+
+
+def record_workflow_duration(workflow_id, input_size, duration):
+    """Adds duration of a successful workflow execution to statistics."""
+    args = (
+        workflow_id,
+        _get_input_size_bucket(input_size),
+        _get_duration_bucket(duration)
+    )
+
+    try:
+        db_api.add_workflow_duration_sample(*args)
+    except exc.DBDuplicateEntryError:
+        # Statistics have just been created by another process.
+        db_api.add_workflow_duration_sample(*args)
+
+
+def _get_duration_stats(workflow_id):
+    with _DURATION_STATS_CACHE_LOCK:
+        stats = _DURATION_STATS_CACHE.get(workflow_id)
+
+    if stats is None:
+        stats = dict(
+            (s.input_size_bucket, (s.count, s.histogram or {}))
+            for s in db_api.get_workflow_duration_stats([workflow_id])
+        )
+
+        with _DURATION_STATS_CACHE_LOCK:
+            _DURATION_STATS_CACHE[workflow_id] = stats
+
+    return stats
+
+
+def _get_percentile(histogram, percent):
+    threshold = sum(histogram.values()) * percent / 100.0
+    count = 0
+
+    for bucket in sorted(histogram, key=int):
+        count += histogram[bucket]
+
+        if count >= threshold:
+            return _get_bucket_duration(int(bucket))
+
+
+def get_duration_estimate(workflow_id, input_size=None):
+    """Estimates duration of workflow execution.
+
+    The estimate is the configured percentile of durations of successful
+    executions of the workflow with input of similar size. If there's
+    not enough such executions durations of all executions of the workflow
+    are taken into account.
+
+    :param workflow_id: Workflow definition ID.
+    :param input_size: Optional. Size of serialized workflow input.
+    :return: Estimated duration in seconds or None if there's not enough
+        statistics.
+    """
+    if not workflow_id:
+        return None
+
+    stats = _get_duration_stats(workflow_id)
+    min_samples = CONF.engine.dtw_duration_min_samples
+
+    bucket_stats = None
+
+    if input_size is not None:
+        bucket_stats = stats.get(_get_input_size_bucket(input_size))
+
+    if bucket_stats and bucket_stats[0] >= min_samples:
+        histogram = bucket_stats[1]
+    else:
+        histogram = collections.Counter()
+
+        for _, h in stats.values():
+            histogram.update(h)
+
+        if sum(histogram.values()) < min_samples:
+            return None
+
+    return _get_percentile(histogram, CONF.engine.dtw_duration_percentile)
+
+
+def get_effective_job_duration(d):
+    """Returns duration of a workload used for scheduling.
+
+    :param d: Delay tolerant workload.
+    :return: Estimated duration if it's larger than the job duration given
+        by the user or if the user didn't specify it, the job duration
+        otherwise.
+    """
+    if not CONF.engine.dtw_duration_estimates:
+        return d.job_duration
+
+    estimate = get_duration_estimate(d.workflow_id, d.workflow_input_size)
+
+    if estimate is None:
+        return d.job_duration
+
+    return max(estimate, d.job_duration or 0)
+
+
+ClusterLoad = collections.namedtuple(
+    'ClusterLoad',
+    ['running', 'capacity', 'saturated']
+)
+
+
+def get_cluster_load():
+    """Returns current load of the cluster.
+
+    The load consists of the number of running top level workflow
+    executions, the number of executions the cluster is supposed to run
+    concurrently and whether all executors reported no free capacity
+    with their last coordination heartbeat.
+    """
+    return ClusterLoad(
+        db_api.count_top_level_workflow_executions(states.RUNNING),
+        CONF.engine.dtw_max_concurrent_executions,
+        executor_routing.get_load_balancer().is_saturated()
+    )
+
+
+def count_running_workloads():
+    """Returns the number of running workloads started by any scheduler.
+
+    Schedulers of all processes start workloads with the same description
+    so their running executions can be counted in the DB. Schedulers
+    polling at the same moment don't see each other's new executions so
+    capacity may be exceeded until the next polling.
+    """
+    return db_api.count_top_level_workflow_executions(
+        states.RUNNING,
+        EXECUTION_DESCRIPTION
+    )
+
+
+def get_external_load(load, own_running):
+    """Returns the number of executions occupying scheduler capacity.
+
+    :param load: ClusterLoad.
+    :param own_running: Number of executions started by the scheduler.
+    """
+    if load.saturated:
+        return load.capacity
+
+    return max(0, load.running - own_running)
+
+
+def _get_latest_start_time(d):
+    return d.deadline - datetime.timedelta(
+        seconds=get_effective_job_duration(d) or 0
+    )
+
+
+def _reschedule(trigger, d, new_start_time, reason):
+    rescheduled = db_api.reschedule_delay_tolerant_workload(
+        trigger.id,
+        trigger.next_execution_time,
+        new_start_time,
+        d.id,
+        reason
+    )
+
+    if rescheduled:
+        cron_trigger_wheel.on_trigger_scheduled(trigger.id, new_start_time)
+
+        LOG.info(
+            "Delay tolerant workload %s rescheduled from %s to %s: %s",
+            d.name, trigger.next_execution_time, new_start_time, reason
+        )
+
+    return rescheduled
+
+
+def rebalance_delay_tolerant_workloads(now, load=None):
+    """Moves planned starts of workloads according to the cluster load.
+
+    On overload the workloads planned to start soon are postponed as long
+    as they still meet their deadlines so that workloads close to their
+    deadlines get the capacity. If there's free capacity the workloads
+    with the earliest deadlines are started right away instead of waiting
+    for their planned start.
+
+    :param now: Current time.
+    :param load: Optional. ClusterLoad, fetched if not given.
+    :return: Number of rescheduled workloads.
+    """
+    load = load or get_cluster_load()
+
+    window_end = now + datetime.timedelta(
+        seconds=CONF.engine.dtw_rebalancing_window
+    )
+
+    soon = db_api.get_planned_delay_tolerant_workloads(
+        start_time=now,
+        end_time=window_end
+    )
+
+    count = 0
+
+    if load.saturated or load.running >= load.capacity:
+        delay = datetime.timedelta(seconds=CONF.engine.dtw_postpone_delay)
+
+        for trigger, d in soon:
+            latest = _get_latest_start_time(d)
+            new_start_time = min(trigger.next_execution_time + delay, latest)
+
+            # Workloads close to their deadlines are not postponed.
+            if new_start_time <= trigger.next_execution_time:
+                continue
+
+            if _reschedule(trigger, d, new_start_time, 'postponed: overload'):
+                count += 1
+
+        return count
+
+    # Workloads starting soon will take a part of free capacity anyway.
+    free = load.capacity - load.running - len(soon)
+
+    if free <= 0:
+        return count
+
+    for trigger, d in db_api.get_planned_delay_tolerant_workloads(
+            start_time=window_end, limit=free):
+        if _reschedule(trigger, d, now, 'pulled forward: free capacity'):
+            count += 1
+
+    return count
+
+
+def get_unscheduled_delay_tolerant_workload_batches():
+    """Yields batches of workload that has not been initiated.
+
+    Workloads are returned in deadline order and contain only the
+    attributes needed for scheduling.
+    """
+    batch_size = CONF.engine.dtw_polling_batch_size
+    marker = None
+
+    while True:
+        batch = db_api.get_unscheduled_delay_tolerant_workloads(
+            batch_size,
+            marker=marker
+        )
+
+        if batch:
+            yield batch
+
+        if len(batch) < batch_size:
+            return
+
+        marker = (batch[-1].deadline, batch[-1].id)
 
 
 def get_unscheduled_delay_tolerant_workload():
     """Return all workload that has not been initiated"""
-    return db_api.get_delay_tolerant_workloads_with_execution(False)
+    return list(
+        itertools.chain.from_iterable(
+            get_unscheduled_delay_tolerant_workload_batches()
+        )
+    )
 
 
-def create_delay_tolerant_workload(name, workflow_name, workflow_input,
-                                   workflow_params=None, deadline=None,
-                                   job_duration=None, workflow_id=None):
+def _parse_deadline(deadline):
     try:
         deadline = date_parser.parse(deadline)
     except ValueError as e:
-        raise exc.InvalidModelException(e.message)
+        raise exc.InvalidModelException(str(e))
+
     if deadline < datetime.datetime.now() + datetime.timedelta(seconds=60):
         raise exc.InvalidModelException(
             'deadline must be at least 1 minute in the future.'
         )
 
+    return deadline
+
+
+def _validate_name(name):
+    if name in RESERVED_NAMES:
+        raise exc.InvalidModelException(
+            'Delay tolerant workload name is reserved: %s' % name
+        )
+
+
+def _get_workload_values(name, wf_def, workflow_input, workflow_params,
+                         deadline, job_duration):
+    return {
+        'name': name,
+        'deadline': deadline,
+        'job_duration': job_duration,
+        'workflow_name': wf_def.name,
+        'workflow_id': wf_def.id,
+        'workflow_input': workflow_input or {},
+        'workflow_input_size': get_input_size(workflow_input),
+        'workflow_params': workflow_params or {},
+        'scope': 'private',
+        'executed': False
+    }
+
+
+def create_delay_tolerant_workload(name, workflow_name, workflow_input,
+                                   workflow_params=None, deadline=None,
+                                   job_duration=None, workflow_id=None):
+    _validate_name(name)
+
+    deadline = _parse_deadline(deadline)
+
     with db_api.transaction():
         wf_def = db_api.get_workflow_definition(
             workflow_id if workflow_id else workflow_name
@@ -53,20 +605,175 @@ def create_delay_tolerant_workload(name, workflow_name, workflow_input,
             parser.get_workflow_spec(wf_def.spec)
         )
 
-        values = {
-            'name': name,
-            'deadline': deadline,
-            'job_duration': job_duration,
-            'workflow_name': wf_def.name,
-            'workflow_id': wf_def.id,
-            'workflow_input': workflow_input or {},
-            'workflow_params': workflow_params or {},
-            'scope': 'private',
-            'executed': False
-        }
+        values = _get_workload_values(
+            name,
+            wf_def,
+            workflow_input,
+            workflow_params,
+            deadline,
+            job_duration
+        )
 
         security.add_trust_id(values)
 
         dtw = db_api.create_delay_tolerant_workload(values)
 
     return dtw
+
+
+def _get_content_key(values):
+    # Mirrors the unique constraint on workflow, input, parameters,
+    # deadline and job duration.
+    return (
+        values['workflow_name'],
+        json.dumps(values['workflow_input'], sort_keys=True),
+        json.dumps(values['workflow_params'], sort_keys=True),
+        values['deadline'],
+        values['job_duration']
+    )
+
+
+def create_delay_tolerant_workloads(workloads):
+    """Creates a number of delay tolerant workloads at once.
+
+    Every workflow definition is fetched and parsed once, one trust is
+    created for all workloads and valid workloads are inserted with a
+    single statement. Invalid workloads don't prevent others from being
+    created.
+
+    :param workloads: List of dictionaries with the same keys as arguments
+        of create_delay_tolerant_workload().
+    :return: List of tuples (workload values, error message) in the same
+        order as the given workloads. Workload values contain 'id' if the
+        workload has been created, error message is None in this case.
+    """
+    max_size = CONF.engine.dtw_bulk_max_size
+
+    if len(workloads) > max_size:
+        raise exc.InputException(
+            'Too many delay tolerant workloads in one request: %s, maximum '
+            'is %s.' % (len(workloads), max_size)
+        )
+
+    results = [(w, None) for w in workloads]
+
+    with db_api.transaction():
+        # {workflow identifier: (workflow definition, spec)}
+        wf_defs = {}
+
+        names = set()
+        content_keys = set()
+        valid = []
+
+        for idx, w in enumerate(workloads):
+            try:
+                if not w.get('name'):
+                    raise exc.InputException('name must be specified.')
+
+                _validate_name(w['name'])
+
+                if w['name'] in names:
+                    raise exc.DBDuplicateEntryError(
+                        'Duplicate delay tolerant workload name in the '
+                        'request: %s' % w['name']
+                    )
+
+                if not w.get('deadline'):
+                    raise exc.InputException('deadline must be specified.')
+
+                deadline = _parse_deadline(w['deadline'])
+
+                wf_identifier = w.get('workflow_id') or w.get('workflow_name')
+
+                if wf_identifier not in wf_defs:
+                    wf_def = db_api.get_workflow_definition(wf_identifier)
+
+                    wf_defs[wf_identifier] = (
+                        wf_def,
+                        parser.get_workflow_spec(wf_def.spec)
+                    )
+
+                wf_def, wf_spec = wf_defs[wf_identifier]
+
+                eng_utils.validate_input(
+                    wf_def,
+                    w.get('workflow_input') or {},
+                    wf_spec
+                )
+
+                values = _get_workload_values(
+                    w['name'],
+                    wf_def,
+                    w.get('workflow_input'),
+                    w.get('workflow_params'),
+                    deadline,
+                    w.get('job_duration')
+                )
+
+                content_key = _get_content_key(values)
+
+                if content_key in content_keys:
+                    raise exc.DBDuplicateEntryError(
+                        'Delay tolerant workload with the same workflow, '
+                        'input, parameters, deadline and job duration is '
+                        'already in the request: %s' % w['name']
+                    )
+            except (exc.MistralException, exc.MistralError) as e:
+                results[idx] = (w, str(e))
+
+                continue
+
+            names.add(values['name'])
+            content_keys.add(content_key)
+
+            valid.append((idx, values))
+
+        existing = db_api.get_delay_tolerant_workload_names(names)
+
+        existing_contents = set(
+            _get_content_key(c)
+            for c in db_api.get_delay_tolerant_workload_contents(
+                set(v['workflow_name'] for _, v in valid),
+                set(v['deadline'] for _, v in valid)
+            )
+        )
+
+        created = []
+
+        for idx, values in valid:
+            if values['name'] in existing:
+                results[idx] = (
+                    workloads[idx],
+                    'Delay tolerant workload already exists: %s'
+                    % values['name']
+                )
+            elif _get_content_key(values) in existing_contents:
+                results[idx] = (
+                    workloads[idx],
+                    'Delay tolerant workload with the same workflow, input, '
+                    'parameters, deadline and job duration already exists: '
+                    '%s' % values['name']
+                )
+            else:
+                created.append((idx, values))
+
+        valid = created
+
+        if valid:
+            trust = {}
+
+            security.add_trust_id(trust)
+
+            for _, values in valid:
+                values.update(trust)
+
+            ids = db_api.create_delay_tolerant_workloads(
+                [v for _, v in valid]
+            )
+
+            for (idx, values), dtw_id in zip(valid, ids):
+                values['id'] = dtw_id
+
+                results[idx] = (values, None)
+
+    return results
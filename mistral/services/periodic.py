@@ -14,8 +14,10 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
 import datetime
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_service import periodic_task
@@ -25,6 +27,7 @@ from mistral import context as auth_ctx
 from mistral.db.v2 import api as db_api_v2
 from mistral.engine.rpc_backend import rpc
 from mistral import exceptions as exc
+from mistral.services import cron_trigger_wheel
 from mistral.services import delay_tolerant_workload as dtw
 from mistral.services import security
 from mistral.services import triggers
@@ -44,9 +47,50 @@ CONF.import_opt('dtw_scheduler_last_minute', 'mistral.config', group='engine')
 class MistralPeriodicTasks(periodic_task.PeriodicTasks):
     @periodic_task.periodic_task(spacing=1, run_immediately=True)
     def process_cron_triggers_v2(self, ctx):
-        for t in triggers.get_next_cron_triggers():
-            LOG.debug("Processing cron trigger: %s" % t)
+        next_triggers = triggers.get_next_cron_triggers()
 
+        if not next_triggers:
+            return
+
+        batch_size = CONF.engine.cron_trigger_batch_size
+
+        pool = eventlet.GreenPool(CONF.engine.cron_trigger_start_pool_size)
+
+        # Seconds between scheduled and actual start of every workflow.
+        fire_lags = []
+
+        for i in range(0, len(next_triggers), batch_size):
+            try:
+                # Triggers not advanced were already processed by
+                # another engine.
+                advanced = advance_cron_triggers(
+                    next_triggers[i:i + batch_size]
+                )
+            except Exception:
+                # Log and continue to next batch of cron triggers.
+                LOG.exception("Failed to advance cron triggers")
+
+                continue
+
+            for t in advanced:
+                pool.spawn_n(self._start_cron_trigger_workflow, t, fire_lags)
+
+        pool.waitall()
+
+        if fire_lags:
+            LOG.info(
+                "Started %s workflow(s) by cron triggers, fire lag: "
+                "avg %.3fs, max %.3fs",
+                len(fire_lags),
+                sum(fire_lags) / len(fire_lags),
+                max(fire_lags)
+            )
+
+    @staticmethod
+    def _start_cron_trigger_workflow(t, fire_lags):
+        LOG.debug("Processing cron trigger: %s" % t)
+
+        try:
             # Setup admin context before schedule triggers.
             ctx = security.create_context(t.trust_id, t.project_id)
 
@@ -54,101 +98,201 @@ class MistralPeriodicTasks(periodic_task.PeriodicTasks):
 
             LOG.debug("Cron trigger security context: %s" % ctx)
 
-            try:
-                # Try to advance the cron trigger next_execution_time and
-                # remaining_executions if relevant.
-                modified = advance_cron_trigger(t)
-
-                # If cron trigger was not already modified by another engine.
-                if modified:
-                    LOG.debug(
-                        "Starting workflow '%s' by cron trigger '%s'",
-                        t.workflow.name, t.name
-                    )
+            LOG.debug(
+                "Starting workflow '%s' by cron trigger '%s'",
+                t.workflow.name, t.name
+            )
 
-                    rpc.get_engine_client().start_workflow(
-                        t.workflow.name,
-                        t.workflow_input,
-                        description="Workflow execution created "
-                                    "by cron trigger.",
-                        **t.workflow_params
-                    )
-            except Exception:
-                # Log and continue to next cron trigger.
-                LOG.exception("Failed to process cron trigger %s" % str(t))
-            finally:
-                auth_ctx.set_ctx(None)
+            fire_lags.append(
+                (datetime.datetime.now() -
+                 t.next_execution_time).total_seconds()
+            )
+
+            rpc.get_engine_client().start_workflow(
+                t.workflow.name,
+                t.workflow_input,
+                description="Workflow execution created "
+                            "by cron trigger.",
+                **t.workflow_params
+            )
+        except Exception:
+            # Log and continue to next cron trigger.
+            LOG.exception("Failed to process cron trigger %s" % str(t))
+        finally:
+            auth_ctx.set_ctx(None)
+
+    @staticmethod
+    def _claim_delay_tolerant_workloads(workloads):
+        """Returns workloads claimed for processing by this process.
+
+        Workloads are marked as executed atomically so that every workload
+        is processed only once even if several processes run the
+        periodic task concurrently.
+        """
+        if not workloads:
+            return []
+
+        claimed = set(
+            db_api_v2.claim_delay_tolerant_workloads(
+                [d.id for d in workloads]
+            )
+        )
+
+        return [d for d in workloads if d.id in claimed]
+
+    @staticmethod
+    def _start_delay_tolerant_workload(d):
+        LOG.debug("Processing delay tolerant workload: %s", d.name)
+
+        # Setup admin context before schedule triggers.
+        ctx = security.create_context(d.trust_id, d.project_id)
+
+        auth_ctx.set_ctx(ctx)
+
+        LOG.debug("Delay tolerant workload security context: %s" % ctx)
+
+        try:
+            # Polling loads only the attributes needed for scheduling.
+            d = db_api_v2.get_delay_tolerant_workload(d.name)
+
+            # execute the workload
+            rpc.get_engine_client().start_workflow(
+                d.workflow_name,
+                d.workflow_input,
+                description=dtw.EXECUTION_DESCRIPTION,
+                **d.workflow_params
+            )
+        except Exception:
+            LOG.exception(
+                "Failed to process delay tolerant workload %s" % str(d))
+
+            # Release the workload so that it's processed again.
+            db_api_v2.update_delay_tolerant_workload(
+                d.name,
+                {'executed': False}
+            )
+        finally:
+            auth_ctx.set_ctx(None)
 
     def _dtw_schedule_immediately(self, ctx):
+        for batch in dtw.get_unscheduled_delay_tolerant_workload_batches():
+            for d in self._claim_delay_tolerant_workloads(batch):
+                self._start_delay_tolerant_workload(d)
 
-        for d in dtw.get_unscheduled_delay_tolerant_workload():
-            LOG.debug("Processing delay tolerant workload: %s" % d)
+    def _dtw_deadline_scheduling(self, ctx):
+        scheduler = dtw.get_deadline_scheduler()
 
-            # Setup admin context before schedule triggers.
-            ctx = security.create_context(d.trust_id, d.project_id)
+        if CONF.engine.dtw_rebalancing:
+            load = dtw.get_cluster_load()
+        else:
+            # Capacity is shared with schedulers of other processes.
+            load = dtw.ClusterLoad(
+                dtw.count_running_workloads(),
+                scheduler.capacity,
+                False
+            )
 
-            auth_ctx.set_ctx(ctx)
+        external_load = dtw.get_external_load(load, scheduler.num_running)
 
-            LOG.debug("Delay tolerant workload security context: %s" % ctx)
+        workloads = self._claim_delay_tolerant_workloads(
+            scheduler.schedule(
+                dtw.get_unscheduled_delay_tolerant_workload(),
+                datetime.datetime.now(),
+                external_load=external_load
+            )
+        )
 
-            try:
-                # execute the workload
+        for d in workloads:
+            self._start_delay_tolerant_workload(d)
 
-                db_api_v2.update_delay_tolerant_workload(
-                    d.name,
-                    {'executed': True}
-                )
+    @staticmethod
+    def _create_delay_tolerant_workload_trigger(d, start_time):
+        LOG.debug("Processing delay tolerant workload: %s", d.name)
 
-                rpc.get_engine_client().start_workflow(
-                    d.workflow.name,
-                    d.workflow_input,
-                    description="DTW Workflow execution created.",
-                    **d.workflow_params
-                )
-            except Exception:
-                # Log and continue to next cron trigger.
-                LOG.exception(
-                    "Failed to process delay tolerant workload %s" % str(d))
-            finally:
-                auth_ctx.set_ctx(None)
+        # Setup admin context before schedule triggers.
+        ctx = security.create_context(d.trust_id, d.project_id)
 
-    def _dtw_last_minute_scheduling(self, ctx):
+        auth_ctx.set_ctx(ctx)
 
-        for d in dtw.get_unscheduled_delay_tolerant_workload():
-            LOG.debug("Processing delay tolerant workload: %s" % d)
+        LOG.debug("Delay tolerant workload security context: %s" % ctx)
 
-            # Setup admin context before schedule triggers.
-            ctx = security.create_context(d.trust_id, d.project_id)
+        try:
+            d = db_api_v2.get_delay_tolerant_workload(d.name)
 
-            auth_ctx.set_ctx(ctx)
+            triggers.create_cron_trigger(
+                d.name,
+                d.workflow_name,
+                d.workflow_input,
+                workflow_params=d.workflow_params,
+                count=1,
+                first_time=start_time,
+                start_time=start_time,
+                workflow_id=d.workflow_id
+            )
+
+            db_api_v2.update_delay_tolerant_workload(
+                d.name,
+                {'planned_start_time': start_time}
+            )
+        except exc.DBDuplicateEntryError:
+            LOG.debug(
+                "Cron trigger for delay tolerant workload %s already "
+                "exists." % d.name
+            )
+        except Exception:
+            LOG.exception(
+                "Failed to process delay tolerant workload %s" % str(d))
+
+            # Release the workload so that it's processed again.
+            db_api_v2.update_delay_tolerant_workload(
+                d.name,
+                {'executed': False}
+            )
+        finally:
+            auth_ctx.set_ctx(None)
+
+    def _dtw_last_minute_scheduling(self, ctx):
+        # Cron trigger can't fire earlier than in a minute.
+        min_start_time = (
+            datetime.datetime.now() + datetime.timedelta(seconds=60)
+        )
 
-            LOG.debug("Delay tolerant workload security context: %s" % ctx)
+        for batch in dtw.get_unscheduled_delay_tolerant_workload_batches():
+            for d in self._claim_delay_tolerant_workloads(batch):
+                # calculate last time for running this - deadline less the
+                # duration of the work
+                # TODO(murp): check the status of the security context on
+                # this
+                start_time = d.deadline - datetime.timedelta(
+                    seconds=dtw.get_effective_job_duration(d) or 0
+                )
 
-            # calculate last time for running this - deadline less the
-            # duration of the work
-            # TODO(murp): check the status of the security context on this
-            # TODO(murp): convert job_duration to timedelta
-            start_time = d.deadline - datetime.timedelta(seconds=d.job_duration)
-            
-            triggers.create_cron_trigger(d.name, d.workflow_name, 
-                                         d.workflow_input,
-                                         workflow_params=d.workflow_params, 
-                                         count=1, 
-                                         first_time=start_time,
-                                         start_time=start_time, 
-                                         workflow_id=d.workflow_id)
+                if start_time < min_start_time:
+                    # It's too late to postpone the workload.
+                    self._start_delay_tolerant_workload(d)
+                else:
+                    self._create_delay_tolerant_workload_trigger(
+                        d,
+                        start_time
+                    )
 
+        if CONF.engine.dtw_rebalancing:
+            dtw.rebalance_delay_tolerant_workloads(datetime.datetime.now())
 
     @periodic_task.periodic_task(spacing=1, run_immediately=True)
     def process_delay_tolerant_workload(self, ctx):
         """This function schedules delay tolerant workload.
 
-        In this initial, basic version, the function just determines if there
-        is new DTW and schedules it immediately.
+        Depending on the configured scheduler new DTWs are started
+        immediately, turned into cron triggers firing at the last possible
+        moment or started in deadline order within the configured capacity.
         """
+        scheduler_type = dtw.get_scheduler_type()
 
-        if CONF.engine.dtw_scheduler_last_minute:
+        if scheduler_type == 'last_minute':
             self._dtw_last_minute_scheduling(ctx)
+        elif scheduler_type == 'deadline':
+            self._dtw_deadline_scheduling(ctx)
         else:
             self._dtw_schedule_immediately(ctx)
 
@@ -213,6 +357,9 @@ def advance_cron_trigger(t):
                     'next_execution_time': t.next_execution_time
                 }
             )
+
+            if modified_count:
+                cron_trigger_wheel.on_trigger_scheduled(t.id, next_time)
     except exc.DBEntityNotFoundError as e:
         # Cron trigger was probably already deleted by a different process.
         LOG.debug(
@@ -224,6 +371,68 @@ def advance_cron_trigger(t):
     return modified_count > 0
 
 
+class _ConcurrentAdvance(Exception):
+    pass
+
+
+def _advance_cron_trigger_group(ids, prev_time, next_time):
+    try:
+        with db_api_v2.transaction():
+            count = db_api_v2.advance_cron_triggers(ids, prev_time, next_time)
+
+            if count != len(ids):
+                # Roll back, it's not known which triggers were advanced.
+                raise _ConcurrentAdvance()
+    except _ConcurrentAdvance:
+        return False
+
+    return True
+
+
+def advance_cron_triggers(cron_triggers):
+    """Advances cron triggers in a set-based manner.
+
+    Triggers with the same current and next execution time are advanced by
+    one compare-and-set statement. If some of them were already advanced by
+    a different process the statement is rolled back and the triggers of
+    this group are advanced one by one.
+
+    :return: List of triggers advanced by this process.
+    """
+    # {(current time, next time or None if deleted): [trigger]}
+    groups = collections.OrderedDict()
+
+    next_times = {}
+
+    for t in cron_triggers:
+        if t.remaining_executions is not None and t.remaining_executions <= 1:
+            next_time = None
+        else:
+            key = (t.pattern, t.next_execution_time)
+
+            if key not in next_times:
+                next_times[key] = triggers.get_next_execution_time(*key)
+
+            next_time = next_times[key]
+
+        groups.setdefault((t.next_execution_time, next_time), []).append(t)
+
+    advanced = []
+
+    for (prev_time, next_time), group in groups.items():
+        if _advance_cron_trigger_group([t.id for t in group], prev_time,
+                                       next_time):
+            advanced.extend(group)
+
+            if next_time:
+                for t in group:
+                    cron_trigger_wheel.on_trigger_scheduled(t.id, next_time)
+        else:
+            advanced.extend(t for t in group if advance_cron_trigger(t))
+
+    return advanced
+
+
 def setup():
     tg = threadgroup.ThreadGroup()
     pt = MistralPeriodicTasks(CONF)
@@ -0,0 +1,237 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Notifications about state changes of workflow and task executions.
+
+The engine publishes a notification whenever state of a workflow or task
+execution changes (see Workflow.set_state() and Task.set_state()). Once
+the DB transaction is committed the notification is delivered to the
+subscribers of the same process, e.g. API requests waiting for a state
+change of an execution. If [engine]/state_change_notifications is enabled
+notifications are also sent through the message bus so that API servers
+running in other processes receive them too (see start_listener()).
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import oslo_messaging as messaging
+from six.moves import queue
+
+from mistral.db.v2 import api as db_api
+from mistral.engine.rpc_backend import rpc
+from mistral import utils
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+EVENT_TYPE = 'execution.state_change'
+
+# {execution_id: [Subscription]}
+_SUBSCRIPTIONS = collections.defaultdict(list)
+_LOCK = threading.Lock()
+
+_NOTIFIER = None
+_LISTENER = None
+
+
+class Subscription(object):
+    """Receives notifications about state changes of an execution.
+
+    Notifications about state changes of task executions are also
+    received by subscribers of their workflow execution.
+    """
+
+    def __init__(self, execution_id):
+        self.execution_id = execution_id
+
+        self._events = queue.Queue()
+
+    def put(self, event):
+        self._events.put(event)
+
+    def get(self, timeout):
+        """Waits for the next notification.
+
+        :param timeout: Number of seconds to wait.
+        :return: Notification (dictionary) or None if timeout expired.
+        """
+        try:
+            return self._events.get(timeout=max(timeout, 0))
+        except queue.Empty:
+            return None
+
+    def wait(self, predicate, timeout):
+        """Waits for a notification matching the predicate.
+
+        :param predicate: Function accepting a notification.
+        :param timeout: Number of seconds to wait.
+        :return: Notification or None if timeout expired.
+        """
+        deadline = time.time() + timeout
+
+        while True:
+            event = self.get(deadline - time.time())
+
+            if event is None or predicate(event):
+                return event
+
+    def close(self):
+        with _LOCK:
+            subscriptions = _SUBSCRIPTIONS.get(self.execution_id, [])
+
+            if self in subscriptions:
+                subscriptions.remove(self)
+
+            if not subscriptions:
+                _SUBSCRIPTIONS.pop(self.execution_id, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def subscribe(execution_id):
+    """Subscribes to notifications about state changes of an execution.
+
+    The returned subscription must be closed when it's not needed anymore,
+    it can be used as a context manager for that.
+    """
+    subscription = Subscription(execution_id)
+
+    with _LOCK:
+        _SUBSCRIPTIONS[execution_id].append(subscription)
+
+    return subscription
+
+
+def notify(event):
+    """Delivers a notification to the subscribers of this process."""
+    ids = {event['id'], event.get('workflow_execution_id')}
+
+    with _LOCK:
+        subscriptions = [
+            s for ex_id in ids if ex_id
+            for s in _SUBSCRIPTIONS.get(ex_id, [])
+        ]
+
+    for s in subscriptions:
+        s.put(event)
+
+
+def _get_notifier():
+    global _NOTIFIER
+
+    if not _NOTIFIER:
+        _NOTIFIER = messaging.Notifier(
+            rpc.get_transport(),
+            publisher_id='mistral.engine.%s' % CONF.engine.host,
+            driver='messaging',
+            topics=[CONF.engine.state_change_notifications_topic]
+        )
+
+    return _NOTIFIER
+
+
+def _dispatch(event):
+    notify(event)
+
+    if not CONF.engine.state_change_notifications:
+        return
+
+    try:
+        _get_notifier().info({}, EVENT_TYPE, event)
+    except Exception as e:
+        LOG.warning(
+            "Failed to send state change notification [event=%s]: %s",
+            event, e
+        )
+
+
+def publish(ex_type, ex, state, state_info=None):
+    """Publishes a state change of an execution.
+
+    The notification is delivered after the current DB transaction is
+    committed so that subscribers read the new state from the DB.
+
+    :param ex_type: Execution type, 'workflow' or 'task'.
+    :param ex: Workflow or task execution DB object.
+    :param state: New state.
+    :param state_info: New state information.
+    """
+    event = {
+        'type': ex_type,
+        'id': ex.id,
+        'name': ex.name,
+        'workflow_execution_id': (
+            ex.workflow_execution_id if ex_type == 'task' else None
+        ),
+        'state': state,
+        'state_info': state_info
+    }
+
+    db_api.after_commit(lambda: _dispatch(event))
+
+
+class _NotificationEndpoint(object):
+    filter_rule = messaging.NotificationFilter(event_type=EVENT_TYPE)
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        notify(payload)
+
+
+def start_listener():
+    """Starts receiving notifications sent by engines of other processes.
+
+    Every process listens in its own pool so that each of them receives
+    all the notifications.
+    """
+    global _LISTENER
+
+    if _LISTENER or not CONF.engine.state_change_notifications:
+        return
+
+    _LISTENER = messaging.get_notification_listener(
+        rpc.get_transport(),
+        [messaging.Target(topic=CONF.engine.state_change_notifications_topic)],
+        [_NotificationEndpoint()],
+        executor='eventlet',
+        pool=utils.get_process_identifier()
+    )
+
+    _LISTENER.start()
+
+
+def cleanup():
+    """Intends to be used by tests to drop subscriptions and notifier."""
+    global _NOTIFIER
+    global _LISTENER
+
+    with _LOCK:
+        _SUBSCRIPTIONS.clear()
+
+    if _LISTENER:
+        _LISTENER.stop()
+        _LISTENER.wait()
+
+    _NOTIFIER = None
+    _LISTENER = None
@@ -12,27 +12,168 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import cachetools
 from croniter import croniter
 import datetime
+from oslo_config import cfg
 import six
+import threading
 
 from mistral.db.v2 import api as db_api
 from mistral.engine import utils as eng_utils
 from mistral import exceptions as exc
+from mistral.services import cron_trigger_wheel
 from mistral.services import security
 from mistral.workbook import parser
 
 
+CONF = cfg.CONF
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+_SCHEDULE_CACHE = None
+_CACHE_LOCK = threading.RLock()
+
+
+def _get_step(field):
+    if field == '*':
+        return 1
+
+    if field.startswith('*/') and field[2:].isdigit():
+        return int(field[2:])
+
+    return None
+
+
+def _get_fixed_interval(pattern):
+    """Returns interval in seconds if the pattern fires at a fixed rate.
+
+    Only patterns like '*/N * * * *' (every N minutes) and
+    '* * * * * */N' (every N seconds) are recognized where N divides 60, so
+    the fire times are multiples of the interval since the epoch.
+    """
+    fields = pattern.split()
+
+    if len(fields) == 5:
+        step, others, unit = _get_step(fields[0]), fields[1:], 60
+    elif len(fields) == 6:
+        step, others, unit = _get_step(fields[5]), fields[:5], 1
+    else:
+        return None
+
+    if not step or 60 % step or any(f != '*' for f in others):
+        return None
+
+    return step * unit
+
+
+class CronSchedule(object):
+    """Precompiled schedule of a cron pattern."""
+
+    def __init__(self, pattern):
+        # Raises ValueError or KeyError if the pattern is not valid.
+        croniter(pattern)
+
+        self.pattern = pattern
+        self.interval = _get_fixed_interval(pattern)
+
+    def get_next_times(self, start_time, count=1):
+        """Returns 'count' fire times following start_time."""
+        if self.interval and start_time.tzinfo is None:
+            delta = start_time - _EPOCH
+            seconds = delta.days * 86400 + delta.seconds
+
+            first = (seconds // self.interval + 1) * self.interval
+
+            return [
+                _EPOCH + datetime.timedelta(
+                    seconds=first + i * self.interval
+                )
+                for i in range(count)
+            ]
+
+        it = croniter(self.pattern, start_time)
+
+        return [it.get_next(datetime.datetime) for _ in range(count)]
+
+
+def _get_schedule_cache():
+    global _SCHEDULE_CACHE
+
+    if _SCHEDULE_CACHE is None:
+        _SCHEDULE_CACHE = cachetools.LRUCache(
+            maxsize=CONF.engine.cron_pattern_cache_size
+        )
+
+    return _SCHEDULE_CACHE
+
+
+def get_schedule(pattern):
+    """Gets schedule of the pattern, compiling it only if not cached yet.
+
+    :raises ValueError, KeyError: If the pattern is not valid.
+    """
+    if CONF.engine.cron_pattern_cache_size <= 0:
+        return CronSchedule(pattern)
+
+    with _CACHE_LOCK:
+        schedule = _get_schedule_cache().get(pattern)
+
+    if schedule is None:
+        schedule = CronSchedule(pattern)
+
+        with _CACHE_LOCK:
+            _get_schedule_cache()[pattern] = schedule
+
+    return schedule
+
+
+def clear_schedule_cache():
+    global _SCHEDULE_CACHE
+
+    with _CACHE_LOCK:
+        _SCHEDULE_CACHE = None
+
+
 def get_next_execution_time(pattern, start_time):
-    return croniter(pattern, start_time).get_next(datetime.datetime)
+    return get_schedule(pattern).get_next_times(start_time)[0]
+
+
+def get_next_execution_times(pattern, start_time, count):
+    return get_schedule(pattern).get_next_times(start_time, count)
+
+
+def get_upcoming_execution_times(cron_trigger, count):
+    """Returns up to 'count' next execution times of the cron trigger."""
+    if cron_trigger.remaining_executions is not None:
+        count = min(count, cron_trigger.remaining_executions)
+
+    if count <= 0 or not cron_trigger.next_execution_time:
+        return []
+
+    times = [cron_trigger.next_execution_time]
+
+    if cron_trigger.pattern and count > 1:
+        times.extend(
+            get_next_execution_times(
+                cron_trigger.pattern,
+                cron_trigger.next_execution_time,
+                count - 1
+            )
+        )
+
+    return times
 
 
 # Triggers v2.
 
 def get_next_cron_triggers():
-    return db_api.get_next_cron_triggers(
-        datetime.datetime.now() + datetime.timedelta(0, 2)
-    )
+    time = datetime.datetime.now() + datetime.timedelta(0, 2)
+
+    if cron_trigger_wheel.is_enabled():
+        return cron_trigger_wheel.get_wheel().get_next_cron_triggers(time)
+
+    return db_api.get_next_cron_triggers(time)
 
 
 def validate_cron_trigger_input(pattern, first_time, count):
@@ -51,7 +192,7 @@ def validate_cron_trigger_input(pattern, first_time, count):
             )
     if pattern:
         try:
-            croniter(pattern)
+            get_schedule(pattern)
         except (ValueError, KeyError):
             raise exc.InvalidModelException(
                 'The specified pattern is not valid: {}'.format(pattern)
@@ -111,4 +252,6 @@ def create_cron_trigger(name, workflow_name, workflow_input,
 
         trig = db_api.create_cron_trigger(values)
 
+    cron_trigger_wheel.on_trigger_scheduled(trig.id, trig.next_execution_time)
+
     return trig
@@ -20,80 +20,92 @@ from mistral.workbook import parser as spec_parser
 
 
 def create_workbook_v2(definition, scope='private'):
-    wb_values = _get_workbook_values(
-        spec_parser.get_workbook_spec_from_yaml(definition),
-        definition,
-        scope
-    )
+    wb_spec = spec_parser.get_workbook_spec_from_yaml(definition)
+
+    wb_values = _get_workbook_values(wb_spec, definition, scope)
 
     with db_api_v2.transaction():
         wb_db = db_api_v2.create_workbook(wb_values)
 
-        _on_workbook_update(wb_db, wb_values)
+        _on_workbook_update(wb_db, wb_spec)
 
     return wb_db
 
 
 def update_workbook_v2(definition, scope='private'):
-    values = _get_workbook_values(
-        spec_parser.get_workbook_spec_from_yaml(definition),
-        definition,
-        scope
-    )
+    wb_spec = spec_parser.get_workbook_spec_from_yaml(definition)
+
+    values = _get_workbook_values(wb_spec, definition, scope)
 
     with db_api_v2.transaction():
         wb_db = db_api_v2.update_workbook(values['name'], values)
 
-        _on_workbook_update(wb_db, values)
+        _on_workbook_update(wb_db, wb_spec)
 
     return wb_db
 
 
-def _on_workbook_update(wb_db, values):
-    wb_spec = spec_parser.get_workbook_spec(values['spec'])
-
+def _on_workbook_update(wb_db, wb_spec):
     _create_or_update_actions(wb_db, wb_spec.get_actions())
     _create_or_update_workflows(wb_db, wb_spec.get_workflows())
 
 
 def _create_or_update_actions(wb_db, actions_spec):
-    if actions_spec:
-        for action_spec in actions_spec:
-            action_name = '%s.%s' % (wb_db.name, action_spec.get_name())
-
-            input_list = actions.get_input_list(
-                action_spec.to_dict().get('input', [])
-            )
-            values = {
-                'name': action_name,
-                'spec': action_spec.to_dict(),
-                'tags': action_spec.get_tags(),
-                'definition': _get_action_definition(wb_db, action_spec),
-                'description': action_spec.get_description(),
-                'is_system': False,
-                'input': ', '.join(input_list) if input_list else None,
-                'scope': wb_db.scope,
-                'project_id': wb_db.project_id
-            }
-
-            db_api_v2.create_or_update_action_definition(action_name, values)
+    if not actions_spec:
+        return
+
+    # Definitions of all actions are extracted in one pass over the
+    # workbook text.
+    definitions = spec_parser.get_action_definitions(
+        wb_db.definition,
+        [a_spec.get_name() for a_spec in actions_spec]
+    )
+
+    values_list = []
+
+    for action_spec in actions_spec:
+        action_name = '%s.%s' % (wb_db.name, action_spec.get_name())
+
+        input_list = actions.get_input_list(
+            action_spec.to_dict().get('input', [])
+        )
+        values_list.append({
+            'name': action_name,
+            'spec': action_spec.to_dict(),
+            'tags': action_spec.get_tags(),
+            'definition': definitions[action_spec.get_name()],
+            'description': action_spec.get_description(),
+            'is_system': False,
+            'input': ', '.join(input_list) if input_list else None,
+            'scope': wb_db.scope,
+            'project_id': wb_db.project_id
+        })
+
+    db_api_v2.create_or_update_action_definitions(values_list)
 
 
 def _create_or_update_workflows(wb_db, workflows_spec):
-    if workflows_spec:
-        for wf_spec in workflows_spec:
-            wf_name = '%s.%s' % (wb_db.name, wf_spec.get_name())
+    if not workflows_spec:
+        return
+
+    definitions = spec_parser.get_workflow_definitions(
+        wb_db.definition,
+        [wf_spec.get_name() for wf_spec in workflows_spec]
+    )
 
-            values = {
-                'name': wf_name,
-                'definition': _get_wf_definition(wb_db, wf_spec),
-                'spec': wf_spec.to_dict(),
-                'scope': wb_db.scope,
-                'project_id': wb_db.project_id,
-                'tags': wf_spec.get_tags()
-            }
+    values_list = []
 
-            db_api_v2.create_or_update_workflow_definition(wf_name, values)
+    for wf_spec in workflows_spec:
+        values_list.append({
+            'name': '%s.%s' % (wb_db.name, wf_spec.get_name()),
+            'definition': definitions[wf_spec.get_name()],
+            'spec': wf_spec.to_dict(),
+            'scope': wb_db.scope,
+            'project_id': wb_db.project_id,
+            'tags': wf_spec.get_tags()
+        })
+
+    db_api_v2.create_or_update_workflow_definitions(values_list)
 
 
 def _get_workbook_values(wb_spec, definition, scope):
@@ -106,21 +118,3 @@ def _get_workbook_values(wb_spec, definition, scope):
     }
 
     return values
-
-
-def _get_wf_definition(wb_db, wf_spec):
-    wf_definition = spec_parser.get_workflow_definition(
-        wb_db.definition,
-        wf_spec.get_name()
-    )
-
-    return wf_definition
-
-
-def _get_action_definition(wb_db, action_spec):
-    action_definition = spec_parser.get_action_definition(
-        wb_db.definition,
-        action_spec.get_name()
-    )
-
-    return action_definition
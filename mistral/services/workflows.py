@@ -74,10 +74,12 @@ def create_workflows(definition, scope='private', is_system=False,
 
 
 def _append_all_workflows(definition, is_system, scope, wf_list_spec, db_wfs):
-    for wf_spec in wf_list_spec.get_workflows():
-        db_wfs.append(
-            _create_workflow(wf_spec, definition, scope, is_system)
-        )
+    db_wfs.extend(
+        db_api.create_workflow_definitions([
+            _get_workflow_values(wf_spec, definition, scope, is_system)
+            for wf_spec in wf_list_spec.get_workflows()
+        ])
+    )
 
 
 def update_workflows(definition, scope='private', identifier=None):
@@ -133,12 +135,6 @@ def _get_workflow_values(wf_spec, definition, scope, is_system=False):
     return values
 
 
-def _create_workflow(wf_spec, definition, scope, is_system):
-    return db_api.create_workflow_definition(
-        _get_workflow_values(wf_spec, definition, scope, is_system)
-    )
-
-
 def _update_workflow(wf_spec, definition, scope, identifier=None):
     values = _get_workflow_values(wf_spec, definition, scope)
 
@@ -0,0 +1,76 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from mistral.actions import action_factory as a_f
+from mistral.actions import std_actions as std
+from mistral.tests.unit import base
+
+
+ECHO_CLS = 'mistral.actions.std_actions.EchoAction'
+
+
+class ActionFactoryTest(base.BaseTest):
+    def setUp(self):
+        super(ActionFactoryTest, self).setUp()
+
+        a_f.clear_cache()
+
+        self.addCleanup(a_f.clear_cache)
+
+    def test_construct_action_class(self):
+        action_cls = a_f.construct_action_class(ECHO_CLS, {'attr': 1})
+
+        self.assertTrue(issubclass(action_cls, std.EchoAction))
+        self.assertEqual(1, action_cls.attr)
+
+    def test_get_action_class_cached(self):
+        cls1 = a_f.get_action_class(ECHO_CLS, {'attr': 1})
+        cls2 = a_f.get_action_class(ECHO_CLS, {'attr': 1})
+        cls3 = a_f.get_action_class(ECHO_CLS, {'attr': 2})
+
+        self.assertIs(cls1, cls2)
+        self.assertIsNot(cls1, cls3)
+        self.assertEqual(2, cls3.attr)
+
+        stats = a_f.get_cache_stats()
+
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(2, stats['size'])
+
+    def test_get_action_class_cache_bounded(self):
+        self.override_config('action_class_cache_size', 2, 'executor')
+
+        for i in range(5):
+            a_f.get_action_class(ECHO_CLS, {'attr': i})
+
+        self.assertEqual(2, a_f.get_cache_stats()['size'])
+
+    def test_get_action_class_cache_disabled(self):
+        self.override_config('action_class_cache_size', 0, 'executor')
+
+        cls1 = a_f.get_action_class(ECHO_CLS, {})
+        cls2 = a_f.get_action_class(ECHO_CLS, {})
+
+        self.assertIsNot(cls1, cls2)
+        self.assertEqual(0, a_f.get_cache_stats()['hits'])
+
+    def test_setup_time_stats(self):
+        a_f.record_setup_time(ECHO_CLS, 0.2)
+        a_f.record_setup_time(ECHO_CLS, 0.4)
+
+        setup_time = a_f.get_cache_stats()['setup_time']
+
+        self.assertAlmostEqual(0.3, setup_time[ECHO_CLS])
@@ -14,8 +14,14 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import os
+import shutil
+import tempfile
+
+import mock
 
 from mistral.actions import std_actions as std
+from mistral.db.v2 import api as db_api
 from mistral.services import action_manager as a_m
 from mistral.tests.unit import base
 
@@ -72,3 +78,80 @@ class ActionManagerTest(base.DbTestCase):
                 std.JavaScriptAction
             )
         )
+
+    def test_sync_db_skipped_if_not_changed(self):
+        with mock.patch.object(a_m, '_get_action_classes') as get_mock:
+            a_m.sync_db()
+
+        get_mock.assert_not_called()
+
+    def test_sync_db_only_changed_actions(self):
+        self.addCleanup(a_m.sync_db, force=True)
+
+        db_api.delete_action_definition('std.echo')
+
+        db_api.update_action_definition(
+            'std.http',
+            {'description': 'Changed.'}
+        )
+
+        a_m.register_action_class('test.stale', 'not.existing.Class', {})
+
+        create_mock = mock.Mock(wraps=db_api.create_action_definitions)
+        update_mock = mock.Mock(wraps=db_api.update_action_definitions)
+
+        with mock.patch.multiple(
+                db_api,
+                create_action_definitions=create_mock,
+                update_action_definitions=update_mock):
+            a_m.sync_db(force=True)
+
+        self.assertEqual(
+            ['std.echo'],
+            [v['name'] for v in create_mock.call_args[0][0]]
+        )
+        self.assertEqual(
+            ['std.http'],
+            [v['name'] for v in update_mock.call_args[0][0]]
+        )
+
+        self.assertIsNotNone(db_api.load_action_definition('std.echo'))
+        self.assertIsNone(db_api.load_action_definition('test.stale'))
+        self.assertNotEqual(
+            'Changed.',
+            db_api.get_action_definition('std.http').description
+        )
+
+    def test_openstack_actions_manifest(self):
+        tmp_dir = tempfile.mkdtemp()
+
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        path = os.path.join(tmp_dir, 'manifest.json')
+
+        self.override_config('openstack_actions_manifest_path', path)
+
+        values = [
+            a_m._get_system_action_values(
+                'nova.servers_list',
+                'mistral.actions.openstack.actions.NovaAction',
+                {'client_method_name': 'servers.list'},
+                'List servers.',
+                'detailed=true'
+            )
+        ]
+
+        with mock.patch.object(
+                a_m,
+                '_introspect_dynamic_action_classes',
+                return_value=values) as introspect_mock:
+            self.assertEqual(values, a_m._get_dynamic_action_classes('fp1'))
+            self.assertEqual(values, a_m._get_dynamic_action_classes('fp1'))
+
+            self.assertEqual(1, introspect_mock.call_count)
+            self.assertTrue(os.path.exists(path))
+
+            # Introspection is required again if packages have changed.
+            a_m._get_dynamic_action_classes('fp2')
+
+            self.assertEqual(2, introspect_mock.call_count)
@@ -18,6 +18,7 @@ import json
 
 import mock
 import requests
+import requests_mock
 
 from mistral.actions import std_actions as std
 from mistral.tests.unit import base
@@ -162,3 +163,29 @@ class HTTPActionTest(base.BaseTest):
             proxies=None,
             verify=None
         )
+
+    @requests_mock.Mocker()
+    def test_http_action_pooled_session_keeps_no_cookies(self, req_mock):
+        self.override_config('pool_action_clients', True, 'executor')
+
+        req_mock.get(URL)
+
+        std.HTTPAction(url=URL, cookies={'user': 'bob'}).run()
+
+        # Cookies given to the action are sent.
+        self.assertEqual(
+            'user=bob',
+            req_mock.last_request.headers['Cookie']
+        )
+
+        # Cookies set by responses are not kept by the shared session.
+        jar = std._get_http_session().cookies
+
+        jar.set_cookie_if_ok(
+            requests.cookies.create_cookie('session_id', 'secret'),
+            requests.cookies.MockRequest(
+                requests.Request('GET', URL).prepare()
+            )
+        )
+
+        self.assertEqual(0, len(jar))
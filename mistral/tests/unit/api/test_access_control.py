@@ -35,6 +35,9 @@ class PolicyTestCase(base.BaseTest):
 
         self.policy.set_rules(rules)
 
+        acl.clear_cache()
+        self.addCleanup(acl.clear_cache)
+
     def test_admin_api_allowed(self):
         auth_ctx = base.get_context(default=True, admin=True)
 
@@ -71,3 +74,60 @@ class PolicyTestCase(base.BaseTest):
             auth_ctx,
             target
         )
+
+    def test_decisions_cached(self):
+        auth_ctx = base.get_context(default=True)
+
+        for _ in range(3):
+            self.assertTrue(acl.enforce('example:admin_or_owner', auth_ctx))
+
+        self.assertRaises(
+            exc.NotAllowedException,
+            acl.enforce,
+            'example:admin',
+            auth_ctx
+        )
+        self.assertFalse(
+            acl.enforce('example:admin', auth_ctx, do_raise=False)
+        )
+
+        stats = acl.get_stats()
+
+        self.assertEqual(5, stats['calls'])
+        self.assertEqual(3, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(2, stats['evaluations'])
+
+        # Decisions are made for each admin flag separately.
+        admin_ctx = base.get_context(default=True, admin=True)
+
+        self.assertTrue(acl.enforce('example:admin', admin_ctx))
+
+    def test_cache_dropped_on_rules_change(self):
+        auth_ctx = base.get_context(default=True)
+
+        self.assertTrue(acl.enforce('example:admin_or_owner', auth_ctx))
+
+        self.policy.set_rules({"example:admin_or_owner": "is_admin:True"})
+
+        self.assertRaises(
+            exc.NotAllowedException,
+            acl.enforce,
+            'example:admin_or_owner',
+            auth_ctx
+        )
+
+        self.assertEqual(2, acl.get_stats()['misses'])
+
+    def test_cache_disabled(self):
+        self.override_config('policy_cache_size', 0, 'api')
+
+        auth_ctx = base.get_context(default=True)
+
+        self.assertTrue(acl.enforce('example:admin_or_owner', auth_ctx))
+        self.assertTrue(acl.enforce('example:admin_or_owner', auth_ctx))
+
+        stats = acl.get_stats()
+
+        self.assertEqual(0, stats['calls'])
+        self.assertEqual(2, stats['evaluations'])
@@ -0,0 +1,66 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import mock
+from oslo_concurrency import processutils
+
+from mistral.api import service
+from mistral.tests.unit import base
+
+
+class WSGIServiceTest(base.BaseTest):
+    def setUp(self):
+        super(WSGIServiceTest, self).setUp()
+
+        self.override_config('host', '127.0.0.1', 'api')
+        self.override_config('port', 0, 'api')
+
+    def _create_service(self):
+        api_service = service.WSGIService('mistral_api')
+
+        self.addCleanup(api_service.server.socket.close)
+
+        return api_service
+
+    def test_workers(self):
+        self.override_config('api_workers', 3, 'api')
+
+        self.assertEqual(3, self._create_service().workers)
+
+    def test_workers_default(self):
+        self.assertEqual(
+            processutils.get_worker_count(),
+            self._create_service().workers
+        )
+
+    @mock.patch('mistral.api.app.setup_app')
+    def test_app_created_on_start(self, setup_app):
+        api_service = self._create_service()
+
+        # The application must not be created before workers are forked.
+        self.assertIsNone(api_service.server.app)
+        self.assertFalse(setup_app.called)
+
+        api_service.start()
+        self.addCleanup(api_service.stop)
+
+        self.assertEqual(setup_app.return_value, api_service.server.app)
+
+        # Restart after SIGHUP reuses the application.
+        api_service.stop()
+        api_service.reset()
+        api_service.start()
+
+        self.assertEqual(1, setup_app.call_count)
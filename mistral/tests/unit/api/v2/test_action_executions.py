@@ -375,6 +375,15 @@ class TestActionExecutionsController(base.APITest):
         self.assertEqual(1, len(resp.json['action_executions']))
         self.assertDictEqual(ACTION_EX, resp.json['action_executions'][0])
 
+    @mock.patch.object(db_api, 'get_action_executions', MOCK_ACTIONS)
+    def test_get_all_stream(self):
+        resp = self.app.get('/v2/action_executions?stream=true')
+
+        self.assertEqual(200, resp.status_int)
+
+        self.assertEqual(1, len(resp.json['action_executions']))
+        self.assertDictEqual(ACTION_EX, resp.json['action_executions'][0])
+
     @mock.patch.object(db_api, 'get_action_executions', MOCK_EMPTY)
     def test_get_all_empty(self):
         resp = self.app.get('/v2/action_executions')
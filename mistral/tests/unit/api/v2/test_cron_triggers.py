@@ -15,6 +15,7 @@
 #    limitations under the License.
 
 import copy
+import datetime
 import json
 import mock
 
@@ -154,3 +155,60 @@ class TestCronTriggerController(base.APITest):
         self.assertEqual(200, resp.status_int)
 
         self.assertEqual(0, len(resp.json['cron_triggers']))
+
+    @mock.patch.object(db_api, "get_cron_trigger")
+    def test_get_next(self, mock_get):
+        trigger = models.CronTrigger()
+        trigger.update(trigger_values)
+        trigger.update({
+            'next_execution_time': datetime.datetime(2016, 1, 1, 0, 1),
+            'remaining_executions': 3
+        })
+
+        mock_get.return_value = trigger
+
+        resp = self.app.get(
+            '/v2/cron_triggers/my_cron_trigger?next_executions=5'
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual('my_cron_trigger', resp.json['name'])
+        self.assertEqual('* * * * *', resp.json['pattern'])
+        self.assertEqual(
+            [
+                '2016-01-01 00:01:00',
+                '2016-01-01 00:02:00',
+                '2016-01-01 00:03:00'
+            ],
+            resp.json['next_execution_times']
+        )
+
+    @mock.patch.object(db_api, "get_cron_trigger", MOCK_NOT_FOUND)
+    def test_get_next_not_found(self):
+        resp = self.app.get(
+            '/v2/cron_triggers/my_cron_trigger?next_executions=5',
+            expect_errors=True
+        )
+
+        self.assertEqual(404, resp.status_int)
+
+    @mock.patch.object(db_api, "get_cron_trigger")
+    def test_get_trigger_named_next(self, mock_get):
+        trigger = models.CronTrigger()
+        trigger.update(trigger_values)
+        trigger.update({'name': 'next'})
+
+        mock_get.return_value = trigger
+
+        resp = self.app.get('/v2/cron_triggers/next')
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual('next', resp.json['name'])
+        self.assertNotIn('next_execution_times', resp.json)
+        mock_get.assert_called_once_with('next')
+
+    @mock.patch.object(db_api, "delete_cron_trigger", MOCK_DELETE)
+    def test_delete_trigger_named_next(self):
+        resp = self.app.delete('/v2/cron_triggers/next')
+
+        self.assertEqual(204, resp.status_int)
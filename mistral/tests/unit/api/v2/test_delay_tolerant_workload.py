@@ -23,6 +23,7 @@ import mock
 from mistral.db.v2 import api as db_api
 from mistral.db.v2.sqlalchemy import models
 from mistral import exceptions as exc
+from mistral.services import delay_tolerant_workload as dtw
 from mistral.tests.unit.api import base
 
 WF = models.WorkflowDefinition(
@@ -80,6 +81,23 @@ class TestDelayTolerantWorkloadController(base.APITest):
         self.assertEqual(200, resp.status_int)
         self.assertDictEqual(DTW, resp.json)
 
+    @mock.patch.object(db_api, "get_delay_tolerant_workload", MOCK_DTW)
+    @mock.patch.object(dtw, "get_duration_estimate")
+    def test_get_estimated_duration(self, get_estimate):
+        get_estimate.return_value = 60
+
+        resp = self.app.get('/v2/delay_tolerant_workloads/dtw_test')
+
+        # Estimates are disabled by default.
+        self.assertNotIn('estimated_duration', resp.json)
+        self.assertFalse(get_estimate.called)
+
+        self.override_config('dtw_duration_estimates', True, 'engine')
+
+        resp = self.app.get('/v2/delay_tolerant_workloads/dtw_test')
+
+        self.assertEqual(60, resp.json['estimated_duration'])
+
     @mock.patch.object(db_api, "get_delay_tolerant_workload", MOCK_NOT_FOUND)
     def test_get_not_found(self):
         resp = self.app.get(
@@ -174,3 +192,132 @@ class TestDelayTolerantWorkloadController(base.APITest):
         self.assertEqual(200, resp.status_int)
 
         self.assertEqual(0, len(resp.json['delay_tolerant_workloads']))
+
+    @mock.patch.object(db_api, "get_workflow_definition")
+    @mock.patch.object(
+        db_api,
+        "get_delay_tolerant_workload_names",
+        mock.MagicMock(return_value=set(['dtw_taken']))
+    )
+    @mock.patch.object(db_api, "get_delay_tolerant_workload_contents")
+    @mock.patch.object(db_api, "create_delay_tolerant_workloads")
+    def test_post_bulk(self, mock_create, mock_get_contents, mock_get_wf):
+        mock_get_wf.return_value = WF
+        mock_create.side_effect = lambda values_list: [
+            'id-%s' % v['name'] for v in values_list
+        ]
+
+        def _dtw(name, **kwargs):
+            d = {
+                'name': name,
+                'workflow_name': WF.name,
+                'workflow_input': {},
+                'deadline': DTW['deadline'],
+                'job_duration': 4
+            }
+
+            d.update(kwargs)
+
+            return d
+
+        # Content of an existing workload with a different name.
+        mock_get_contents.return_value = [{
+            'workflow_name': WF.name,
+            'workflow_input': {},
+            'workflow_params': {},
+            'deadline': datetime.datetime.strptime(
+                DTW['deadline'],
+                "%Y-%m-%dT%H:%M:%S"
+            ),
+            'job_duration': 8
+        }]
+
+        resp = self.app.post_json(
+            '/v2/delay_tolerant_workloads/bulk',
+            {
+                'delay_tolerant_workloads': [
+                    _dtw('dtw1'),
+                    _dtw('dtw1', job_duration=5),
+                    _dtw('dtw_taken', job_duration=6),
+                    _dtw('dtw2', deadline='2000-01-01T00:00:00'),
+                    _dtw('dtw3', workflow_input={'unexpected': 1}),
+                    _dtw('dtw5', job_duration=8),
+                    _dtw('bulk', job_duration=9),
+                    _dtw('dtw4', job_duration=7)
+                ]
+            }
+        )
+
+        self.assertEqual(200, resp.status_int)
+
+        results = resp.json['results']
+
+        self.assertEqual(
+            [
+                'dtw1', 'dtw1', 'dtw_taken', 'dtw2', 'dtw3', 'dtw5', 'bulk',
+                'dtw4'
+            ],
+            [r['name'] for r in results]
+        )
+        self.assertEqual('id-dtw1', results[0]['id'])
+        self.assertEqual('id-dtw4', results[7]['id'])
+
+        self.assertIsNone(results[0].get('error'))
+
+        for r in results[1:7]:
+            self.assertIsNone(r.get('id'))
+            self.assertIsNotNone(r.get('error'))
+
+        self.assertIn('already exists', results[5]['error'])
+        self.assertIn('reserved', results[6]['error'])
+
+        # Workflow definition is fetched once, valid workloads are
+        # inserted with one call.
+        self.assertEqual(1, mock_get_wf.call_count)
+        self.assertEqual(1, mock_create.call_count)
+
+    def test_post_reserved_name(self):
+        dtw = copy.deepcopy(DTW)
+        dtw['name'] = 'bulk'
+
+        resp = self.app.post_json(
+            '/v2/delay_tolerant_workloads',
+            dtw,
+            expect_errors=True
+        )
+
+        self.assertEqual(400, resp.status_int)
+        self.assertIn('reserved', resp.json['faultstring'])
+
+    def test_post_bulk_too_many(self):
+        self.override_config('dtw_bulk_max_size', 1, 'engine')
+
+        resp = self.app.post_json(
+            '/v2/delay_tolerant_workloads/bulk',
+            {'delay_tolerant_workloads': [DTW, DTW]},
+            expect_errors=True
+        )
+
+        self.assertEqual(400, resp.status_int)
+
+    @mock.patch.object(db_api, "get_delay_tolerant_workloads", MOCK_DTWs)
+    def test_get_all_by_deadline(self):
+        resp = self.app.get(
+            '/v2/delay_tolerant_workloads'
+            '?deadline_from=2016-01-01&deadline_to=2016-01-02T12:00:00'
+        )
+
+        self.assertEqual(200, resp.status_int)
+
+        kwargs = MOCK_DTWs.call_args[1]
+
+        self.assertEqual('2016-01-01T00:00:00', kwargs['deadline_from'])
+        self.assertEqual('2016-01-02T12:00:00', kwargs['deadline_to'])
+
+    def test_get_all_by_invalid_deadline(self):
+        resp = self.app.get(
+            '/v2/delay_tolerant_workloads?deadline_from=not-a-date',
+            expect_errors=True
+        )
+
+        self.assertEqual(400, resp.status_int)
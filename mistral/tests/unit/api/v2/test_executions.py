@@ -21,14 +21,17 @@ import json
 import mock
 from oslo_config import cfg
 import oslo_messaging
+from sqlalchemy.orm import query as sa_query
 import uuid
 from webtest import app as webtest_app
 
+from mistral.api.controllers.v2 import execution_stats
 from mistral.db.v2 import api as db_api
 from mistral.db.v2.sqlalchemy import api as sql_db_api
 from mistral.db.v2.sqlalchemy import models
 from mistral.engine.rpc_backend import rpc
 from mistral import exceptions as exc
+from mistral.services import state_notifications
 from mistral.tests.unit.api import base
 from mistral import utils
 from mistral.workflow import states
@@ -133,6 +136,46 @@ class TestExecutionsController(base.APITest):
         self.assertEqual(200, resp.status_int)
         self.assertDictEqual(WF_EX_JSON_WITH_DESC, resp.json)
 
+    @mock.patch.object(db_api, 'get_workflow_execution', MOCK_WF_EX)
+    @mock.patch.object(db_api, 'get_workflow_execution_version', MOCK_WF_EX)
+    def test_get_not_modified_since(self):
+        resp = self.app.get(
+            '/v2/executions/123',
+            headers={'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'}
+        )
+
+        self.assertEqual(304, resp.status_int)
+
+        resp = self.app.get(
+            '/v2/executions/123',
+            headers={'If-Modified-Since': 'Wed, 31 Dec 1969 23:00:00 GMT'}
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertDictEqual(WF_EX_JSON_WITH_DESC, resp.json)
+
+    @mock.patch.object(db_api, 'get_workflow_execution', MOCK_WF_EX)
+    @mock.patch.object(state_notifications.Subscription, 'wait')
+    def test_get_wait_for_state_change(self, mock_wait):
+        self.override_config('max_wait_for_state_change', 5, 'api')
+
+        resp = self.app.get(
+            '/v2/executions/123?wait_for_state_change=30'
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertDictEqual(WF_EX_JSON_WITH_DESC, resp.json)
+
+        mock_wait.assert_called_once_with(mock.ANY, 5)
+
+        predicate = mock_wait.call_args[0][0]
+
+        self.assertFalse(predicate({'id': '123', 'state': states.RUNNING}))
+        self.assertTrue(predicate({'id': '123', 'state': states.SUCCESS}))
+
+        # Subscription has been closed.
+        self.assertEqual({}, dict(state_notifications._SUBSCRIPTIONS))
+
     @mock.patch.object(db_api, 'get_workflow_execution', MOCK_SUB_WF_EX)
     def test_get_sub_wf_ex(self):
         resp = self.app.get('/v2/executions/123')
@@ -457,6 +500,76 @@ class TestExecutionsController(base.APITest):
 
         self.assertEqual(0, len(resp.json['executions']))
 
+    @mock.patch.object(db_api, 'get_workflow_executions', MOCK_WF_EXECUTIONS)
+    def test_get_all_stream(self):
+        resp = self.app.get('/v2/executions?stream=true')
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual('application/json', resp.content_type)
+
+        self.assertEqual(1, len(resp.json['executions']))
+        self.assertDictEqual(WF_EX_JSON_WITH_DESC, resp.json['executions'][0])
+        self.assertNotIn('next', resp.json)
+
+        self.assertIn('yield_per', MOCK_WF_EXECUTIONS.call_args[1])
+
+    @mock.patch.object(db_api, 'get_workflow_executions', MOCK_WF_EXECUTIONS)
+    def test_get_all_stream_pagination(self):
+        resp = self.app.get('/v2/executions?stream=true&limit=1')
+
+        self.assertEqual(200, resp.status_int)
+
+        self.assertEqual(1, len(resp.json['executions']))
+
+        expected = self.app.get('/v2/executions?limit=1').json
+
+        self.assertEqual(expected['next'], resp.json['next'])
+
+    @mock.patch.object(db_api, 'get_workflow_executions', MOCK_EMPTY)
+    def test_get_all_stream_empty(self):
+        resp = self.app.get('/v2/executions?stream=true')
+
+        self.assertEqual(200, resp.status_int)
+
+        self.assertEqual({'executions': []}, resp.json)
+
+    @mock.patch.object(
+        sa_query.Query,
+        'yield_per',
+        autospec=True,
+        side_effect=sa_query.Query.yield_per
+    )
+    def test_get_all_stream_db(self, mock_yield_per):
+        self.override_config('streaming_batch_size', 2, 'api')
+
+        for i in range(5):
+            db_api.create_workflow_execution({
+                'name': 'wf%s' % i,
+                'workflow_name': 'wf%s' % i,
+                'spec': {},
+                'state': states.SUCCESS,
+                'params': {},
+                'input': {'i': i}
+            })
+
+        expected = self.app.get('/v2/executions').json
+
+        resp = self.app.get('/v2/executions?stream=true')
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual(5, len(resp.json['executions']))
+        self.assertEqual(expected, resp.json)
+
+        self.assertEqual(1, mock_yield_per.call_count)
+        self.assertEqual(2, mock_yield_per.call_args[0][1])
+
+        expected = self.app.get('/v2/executions?limit=3').json
+
+        resp = self.app.get('/v2/executions?stream=true&limit=3')
+
+        self.assertEqual(3, len(resp.json['executions']))
+        self.assertEqual(expected, resp.json)
+
     @mock.patch.object(db_api, "get_workflow_executions", MOCK_WF_EXECUTIONS)
     def test_get_all_pagination(self):
         resp = self.app.get(
@@ -524,3 +637,63 @@ class TestExecutionsController(base.APITest):
         self.assertEqual(400, resp.status_int)
 
         self.assertIn("Unknown sort direction", resp.body.decode())
+
+    @mock.patch.object(db_api, 'get_workflow_execution_stats')
+    def test_get_stats(self, mock_get_stats):
+        mock_get_stats.return_value = [
+            {
+                'state': 'SUCCESS',
+                'period': '2016-01-01T10:00:00',
+                'count': 2,
+                'avg_duration': 20.0,
+                'min_duration': 10.0,
+                'max_duration': 30.0
+            }
+        ]
+
+        resp = self.app.get(
+            '/v2/executions/stats?group_by=state&interval=hour'
+            '&workflow_name=some'
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual(1, len(resp.json['stats']))
+        self.assertDictEqual(
+            mock_get_stats.return_value[0],
+            resp.json['stats'][0]
+        )
+
+        mock_get_stats.assert_called_once_with(
+            ['state'],
+            interval='hour',
+            created_from=None,
+            created_to=None,
+            workflow_name='some'
+        )
+
+    @mock.patch.object(db_api, 'get_workflow_execution_stats', MOCK_EMPTY)
+    def test_get_stats_invalid_group_by(self):
+        resp = self.app.get(
+            '/v2/executions/stats?group_by=input',
+            expect_errors=True
+        )
+
+        self.assertEqual(400, resp.status_int)
+        self.assertIn('Invalid group_by columns: input', resp.body.decode())
+
+    @mock.patch.object(db_api, 'get_workflow_execution_stats')
+    def test_get_stats_cached(self, mock_get_stats):
+        self.override_config('execution_stats_cache_ttl', 60, 'api')
+
+        execution_stats.clear_stats_cache()
+        self.addCleanup(execution_stats.clear_stats_cache)
+
+        mock_get_stats.return_value = [{'state': 'RUNNING', 'count': 1}]
+
+        for _ in range(2):
+            resp = self.app.get('/v2/executions/stats')
+
+            self.assertEqual(200, resp.status_int)
+            self.assertEqual(1, resp.json['stats'][0]['count'])
+
+        self.assertEqual(1, mock_get_stats.call_count)
@@ -14,13 +14,20 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import base64
 import datetime
+import json
+import time
+
+import eventlet
+from eventlet import wsgi
 import mock
 from oslo_config import cfg
 import pecan
 import pecan.testing
 import requests_mock
 
+from mistral import context
 from mistral.db.v2 import api as db_api
 from mistral.db.v2.sqlalchemy import models
 from mistral.services import periodic
@@ -124,6 +131,10 @@ class TestKeyCloakOIDCAuth(base.DbTestCase):
 
         self.policy = self.useFixture(policy_fixtures.PolicyFixture())
 
+        context.clear_keycloak_token_cache()
+
+        self.addCleanup(context.clear_keycloak_token_cache)
+
     @requests_mock.Mocker()
     @mock.patch.object(db_api, 'get_workflow_definition', MOCK_WF)
     def test_get_workflow_success_auth(self, req_mock):
@@ -165,3 +176,148 @@ class TestKeyCloakOIDCAuth(base.DbTestCase):
         self.assertEqual('401 Unauthorized', resp.status)
         self.assertIn('Failed to validate access token', resp.text)
         self.assertIn('Access token is invalid', resp.text)
+
+    @requests_mock.Mocker()
+    @mock.patch.object(db_api, 'get_workflow_definition', MOCK_WF)
+    def test_get_workflow_cached_auth(self, req_mock):
+        req_mock.get(USER_INFO_ENDPOINT, json=USER_CLAIMS)
+
+        headers = {
+            'X-Auth-Token': 'cvbcvbasrtqlwkjasdfasdf',
+            'X-Project-Id': REALM_NAME
+        }
+
+        for _ in range(3):
+            resp = self.app.get('/v2/workflows/123', headers=headers)
+
+            self.assertEqual(200, resp.status_code)
+
+        self.assertEqual(1, req_mock.call_count)
+
+        # Same token of another realm must be validated separately.
+        req_mock.get(
+            "%s/realms/%s/protocol/openid-connect/userinfo" %
+            (AUTH_URL, 'other_realm'),
+            status_code=401
+        )
+
+        headers['X-Project-Id'] = 'other_realm'
+
+        resp = self.app.get(
+            '/v2/workflows/123',
+            headers=headers,
+            expect_errors=True
+        )
+
+        self.assertEqual(401, resp.status_code)
+        self.assertEqual(2, req_mock.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch.object(db_api, 'get_workflow_definition', MOCK_WF)
+    def test_get_workflow_failed_auth_not_cached(self, req_mock):
+        req_mock.get(USER_INFO_ENDPOINT, status_code=401)
+
+        headers = {
+            'X-Auth-Token': 'cvbcvbasrtqlwkjasdfasdf',
+            'X-Project-Id': REALM_NAME
+        }
+
+        resp = self.app.get(
+            '/v2/workflows/123',
+            headers=headers,
+            expect_errors=True
+        )
+
+        self.assertEqual(401, resp.status_code)
+
+        req_mock.get(USER_INFO_ENDPOINT, json=USER_CLAIMS)
+
+        resp = self.app.get('/v2/workflows/123', headers=headers)
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, req_mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_expired_token_not_cached(self, req_mock):
+        req_mock.get(USER_INFO_ENDPOINT, json=USER_CLAIMS)
+
+        token = _make_jwt(exp=int(time.time()) - 10)
+
+        context._validate_keycloak_token(REALM_NAME, token)
+        context._validate_keycloak_token(REALM_NAME, token)
+
+        self.assertEqual(2, req_mock.call_count)
+
+        token = _make_jwt(exp=int(time.time()) + 3600)
+
+        context._validate_keycloak_token(REALM_NAME, token)
+        context._validate_keycloak_token(REALM_NAME, token)
+
+        self.assertEqual(3, req_mock.call_count)
+
+    def test_concurrent_validations_coalesced(self):
+        server = _StubOIDCServer()
+
+        self.addCleanup(server.stop)
+
+        self.override_config('auth_url', server.url, 'keycloak_oidc')
+
+        pool = eventlet.GreenPool()
+
+        results = list(
+            pool.imap(
+                lambda token: context._validate_keycloak_token(
+                    REALM_NAME,
+                    token
+                ),
+                ['token1'] * 5 + ['token2'] * 5
+            )
+        )
+
+        self.assertEqual([USER_CLAIMS] * 10, results)
+        self.assertEqual(
+            {'token1': 1, 'token2': 1},
+            server.requests
+        )
+
+
+def _make_jwt(**claims):
+    def _encode(obj):
+        return base64.urlsafe_b64encode(
+            json.dumps(obj).encode('utf-8')
+        ).decode('utf-8').rstrip('=')
+
+    return '%s.%s.signature' % (_encode({'alg': 'RS256'}), _encode(claims))
+
+
+class _StubOIDCServer(object):
+    """Local OIDC provider answering slowly to user info requests."""
+
+    def __init__(self):
+        self.requests = {}
+
+        sock = eventlet.listen(('127.0.0.1', 0))
+
+        self.url = 'http://127.0.0.1:%s/auth' % sock.getsockname()[1]
+
+        self._thread = eventlet.spawn(
+            wsgi.server,
+            sock,
+            self._app,
+            log_output=False
+        )
+
+    def _app(self, environ, start_response):
+        token = environ.get('HTTP_AUTHORIZATION', '').replace('Bearer ', '')
+
+        self.requests[token] = self.requests.get(token, 0) + 1
+
+        # Let concurrent validations of the same token pile up.
+        eventlet.sleep(0.1)
+
+        start_response('200 OK', [('Content-Type', 'application/json')])
+
+        return [json.dumps(USER_CLAIMS).encode('utf-8')]
+
+    def stop(self):
+        self._thread.kill()
@@ -136,6 +136,11 @@ MOCK_ERROR_ITEMS_TASK = mock.MagicMock(return_value=ERROR_ITEMS_TASK_EX)
     data_flow,
     'get_task_execution_result', mock.Mock(return_value=RESULT)
 )
+@mock.patch.object(
+    data_flow,
+    'get_task_execution_results',
+    mock.Mock(return_value={TASK_EX.id: RESULT})
+)
 class TestTasksController(base.APITest):
     @mock.patch.object(db_api, 'get_task_execution', MOCK_TASK)
     def test_get(self):
@@ -159,6 +164,29 @@ class TestTasksController(base.APITest):
         self.assertEqual(1, len(resp.json['tasks']))
         self.assertDictEqual(TASK, resp.json['tasks'][0])
 
+    @mock.patch.object(db_api, 'get_task_executions', MOCK_TASKS)
+    def test_get_all_stream(self):
+        resp = self.app.get('/v2/tasks?stream=true')
+
+        self.assertEqual(200, resp.status_int)
+
+        self.assertEqual(1, len(resp.json['tasks']))
+        self.assertDictEqual(TASK, resp.json['tasks'][0])
+
+    @mock.patch.object(db_api, 'get_task_executions', MOCK_TASKS)
+    @mock.patch.object(data_flow, 'get_task_execution_results')
+    def test_get_all_without_result(self, get_results_mock):
+        resp = self.app.get('/v2/tasks?fields=name,state')
+
+        self.assertEqual(200, resp.status_int)
+
+        self.assertDictEqual(
+            {'id': '123', 'name': 'task', 'state': 'RUNNING'},
+            resp.json['tasks'][0]
+        )
+
+        get_results_mock.assert_not_called()
+
     @mock.patch.object(db_api, 'get_task_executions', MOCK_EMPTY)
     def test_get_all_empty(self):
         resp = self.app.get('/v2/tasks')
@@ -329,3 +357,28 @@ class TestTasksController(base.APITest):
         self.assertEqual(400, resp.status_int)
         self.assertIn('faultstring', resp.json)
         self.assertIn('Workflow name does not match', resp.json['faultstring'])
+
+    @mock.patch.object(db_api, 'get_task_execution_stats')
+    def test_get_stats(self, mock_get_stats):
+        mock_get_stats.return_value = [
+            {'name': 'task', 'state': 'ERROR', 'count': 3}
+        ]
+
+        resp = self.app.get(
+            '/v2/tasks/stats?group_by=name,state'
+            '&workflow_execution_id=123'
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertDictEqual(
+            mock_get_stats.return_value[0],
+            resp.json['stats'][0]
+        )
+
+        mock_get_stats.assert_called_once_with(
+            ['name', 'state'],
+            interval=None,
+            created_from=None,
+            created_to=None,
+            workflow_execution_id='123'
+        )
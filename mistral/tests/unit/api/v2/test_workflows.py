@@ -172,6 +172,36 @@ class TestWorkflowsController(base.APITest):
         self.assertEqual(200, resp.status_int)
         self.assertDictEqual(WF, resp.json)
 
+    @mock.patch.object(db_api, "get_workflow_definition", MOCK_WF)
+    @mock.patch.object(db_api, "get_workflow_definition_version", MOCK_WF)
+    def test_get_not_modified(self):
+        resp = self.app.get('/v2/workflows/123')
+
+        self.assertEqual(200, resp.status_int)
+        self.assertIsNotNone(resp.etag)
+        self.assertIsNotNone(resp.last_modified)
+
+        MOCK_WF.reset_mock()
+
+        resp = self.app.get(
+            '/v2/workflows/123',
+            headers={'If-None-Match': '"%s"' % resp.etag}
+        )
+
+        self.assertEqual(304, resp.status_int)
+        self.assertEqual(b'', resp.body)
+
+        # Only the version has been fetched.
+        self.assertEqual(1, MOCK_WF.call_count)
+
+        resp = self.app.get(
+            '/v2/workflows/123',
+            headers={'If-None-Match': '"outdated"'}
+        )
+
+        self.assertEqual(200, resp.status_int)
+        self.assertDictEqual(WF, resp.json)
+
     @mock.patch.object(db_api, "get_workflow_definition", MOCK_WF_WITH_INPUT)
     def test_get_with_input(self):
         resp = self.app.get('/v2/workflows/123')
@@ -306,9 +336,9 @@ class TestWorkflowsController(base.APITest):
             resp.body.decode()
         )
 
-    @mock.patch.object(db_api, "create_workflow_definition")
+    @mock.patch.object(db_api, "create_workflow_definitions")
     def test_post(self, mock_mtd):
-        mock_mtd.return_value = WF_DB
+        mock_mtd.return_value = [WF_DB]
 
         resp = self.app.post(
             '/v2/workflows',
@@ -321,14 +351,14 @@ class TestWorkflowsController(base.APITest):
 
         self.assertEqual(1, mock_mtd.call_count)
 
-        spec = mock_mtd.call_args[0][0]['spec']
+        spec = mock_mtd.call_args[0][0][0]['spec']
 
         self.assertIsNotNone(spec)
         self.assertEqual(WF_DB.name, spec['name'])
 
-    @mock.patch.object(db_api, "create_workflow_definition")
+    @mock.patch.object(db_api, "create_workflow_definitions")
     def test_post_public(self, mock_mtd):
-        mock_mtd.return_value = WF_DB
+        mock_mtd.return_value = [WF_DB]
 
         resp = self.app.post(
             '/v2/workflows?scope=public',
@@ -339,7 +369,7 @@ class TestWorkflowsController(base.APITest):
         self.assertEqual(201, resp.status_int)
         self.assertEqual({"workflows": [WF]}, resp.json)
 
-        self.assertEqual("public", mock_mtd.call_args[0][0]['scope'])
+        self.assertEqual("public", mock_mtd.call_args[0][0][0]['scope'])
 
     @mock.patch.object(db_api, "create_action_definition")
     def test_post_wrong_scope(self, mock_mtd):
@@ -355,7 +385,7 @@ class TestWorkflowsController(base.APITest):
         self.assertEqual(400, resp.status_int)
         self.assertIn("Scope must be one of the following", resp.body.decode())
 
-    @mock.patch.object(db_api, "create_workflow_definition", MOCK_DUPLICATE)
+    @mock.patch.object(db_api, "create_workflow_definitions", MOCK_DUPLICATE)
     def test_post_dup(self):
         resp = self.app.post(
             '/v2/workflows',
@@ -197,6 +197,12 @@ class BaseTest(base.BaseTestCase):
     def _sleep(self, seconds):
         time.sleep(seconds)
 
+    def override_config(self, name, override, group=None):
+        """Overrides config option and restores it after the test."""
+        cfg.CONF.set_override(name, override, group)
+
+        self.addCleanup(cfg.CONF.clear_override, name, group)
+
 
 class DbTestCase(BaseTest):
     is_heavy_init_called = False
@@ -231,7 +237,8 @@ class DbTestCase(BaseTest):
 
         db_api_v2.setup_db()
 
-        action_manager.sync_db()
+        # Restore system actions changed by previous test cases.
+        action_manager.sync_db(force=True)
 
     def _clean_db(self):
         contexts = [
@@ -249,6 +256,7 @@ class DbTestCase(BaseTest):
                     db_api_v2.delete_executions()
                     db_api_v2.delete_workbooks()
                     db_api_v2.delete_delay_tolerant_workloads()
+                    db_api_v2.delete_workflow_duration_stats()
                     db_api_v2.delete_cron_triggers()
                     db_api_v2.delete_workflow_definitions()
                     db_api_v2.delete_environments()
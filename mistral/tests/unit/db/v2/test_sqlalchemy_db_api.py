@@ -366,6 +366,59 @@ class WorkflowDefinitionTest(SQLAlchemyTest):
 
         self.assertEqual(updated, fetched)
 
+    def test_create_workflow_definitions(self):
+        created = db_api.create_workflow_definitions(WF_DEFINITIONS)
+
+        self.assertEqual(
+            ['my_wf1', 'my_wf2'],
+            [wf_def.name for wf_def in created]
+        )
+
+        for wf_def in created:
+            self.assertEqual(
+                wf_def,
+                db_api.get_workflow_definition(wf_def.name)
+            )
+
+    def test_create_workflow_definitions_duplicate(self):
+        db_api.create_workflow_definition(WF_DEFINITIONS[0])
+
+        self.assertRaises(
+            exc.DBDuplicateEntryError,
+            db_api.create_workflow_definitions,
+            WF_DEFINITIONS
+        )
+
+    def test_create_or_update_workflow_definitions(self):
+        existing = db_api.create_workflow_definition(WF_DEFINITIONS[1])
+
+        values_list = [
+            dict(WF_DEFINITIONS[0]),
+            dict(WF_DEFINITIONS[1], definition='my new definition')
+        ]
+
+        result = db_api.create_or_update_workflow_definitions(values_list)
+
+        self.assertEqual(['my_wf1', 'my_wf2'], [d.name for d in result])
+        self.assertEqual(existing.id, result[1].id)
+        self.assertEqual(
+            'my new definition',
+            db_api.get_workflow_definition('my_wf2').definition
+        )
+        self.assertEqual(2, len(db_api.get_workflow_definitions()))
+
+    def test_create_or_update_workflow_definitions_other_project(self):
+        db_api.create_workflow_definition(WF_DEFINITIONS[0])
+
+        # Switch to another project.
+        auth_context.set_ctx(test_base.get_context(default=False))
+
+        self.assertRaises(
+            exc.NotAllowedException,
+            db_api.create_or_update_workflow_definitions,
+            [WF_DEFINITIONS[0]]
+        )
+
     def test_update_wf_scope_cron_trigger_associated_in_diff_tenant(self):
         created = db_api.create_workflow_definition(WF_DEFINITIONS[0])
 
@@ -589,6 +642,24 @@ class ActionDefinitionTest(SQLAlchemyTest):
 
         self.assertIsNone(db_api.load_action_definition("not-existing-id"))
 
+    def test_create_or_update_action_definitions(self):
+        existing = db_api.create_action_definition(ACTION_DEFINITIONS[1])
+
+        values_list = [
+            dict(ACTION_DEFINITIONS[1], description='New description'),
+            dict(ACTION_DEFINITIONS[0])
+        ]
+
+        result = db_api.create_or_update_action_definitions(values_list)
+
+        self.assertEqual(['action2', 'action1'], [d.name for d in result])
+        self.assertEqual(existing.id, result[0].id)
+        self.assertEqual(
+            'New description',
+            db_api.get_action_definition('action2').description
+        )
+        self.assertEqual(2, len(db_api.get_action_definitions()))
+
     def test_create_action_definition_duplicate_without_auth(self):
         cfg.CONF.set_default('auth_enable', False, group='pecan')
         db_api.create_action_definition(ACTION_DEFINITIONS[0])
@@ -960,6 +1031,81 @@ class WorkflowExecutionTest(SQLAlchemyTest):
             len(state_info)
         )
 
+    def test_workflow_execution_version(self):
+        created = db_api.create_workflow_execution(WF_EXECS[0])
+
+        self.assertEqual(1, created.version)
+
+        updated = db_api.update_workflow_execution(
+            created.id,
+            {'state': 'RUNNING'}
+        )
+
+        self.assertEqual(2, updated.version)
+
+        version = db_api.get_workflow_execution_version(created.id)
+
+        self.assertEqual(created.id, version.id)
+        self.assertEqual(2, version.version)
+        self.assertEqual(updated.updated_at, version.updated_at)
+
+        self.assertRaises(
+            exc.DBEntityNotFoundError,
+            db_api.get_workflow_execution_version,
+            'not-existing-id'
+        )
+
+    def test_get_workflow_execution_stats(self):
+        created_at = datetime.datetime(2016, 1, 1, 10, 30)
+
+        for state, seconds in (('SUCCESS', 10), ('SUCCESS', 30),
+                               ('RUNNING', None)):
+            values = copy.deepcopy(WF_EXECS[0])
+
+            values.update({
+                'workflow_name': 'wf',
+                'state': state,
+                'created_at': created_at,
+                'updated_at': (
+                    created_at + datetime.timedelta(seconds=seconds)
+                    if seconds else None
+                )
+            })
+
+            db_api.create_workflow_execution(values)
+
+        stats = db_api.get_workflow_execution_stats(
+            ['state'],
+            interval='hour'
+        )
+
+        self.assertEqual(2, len(stats))
+
+        running, success = stats
+
+        self.assertEqual('RUNNING', running['state'])
+        self.assertEqual(1, running['count'])
+        self.assertIsNone(running['avg_duration'])
+
+        self.assertEqual('SUCCESS', success['state'])
+        self.assertEqual('2016-01-01T10:00:00', success['period'])
+        self.assertEqual(2, success['count'])
+        self.assertAlmostEqual(20, success['avg_duration'], places=3)
+        self.assertAlmostEqual(10, success['min_duration'], places=3)
+        self.assertAlmostEqual(30, success['max_duration'], places=3)
+
+        stats = db_api.get_workflow_execution_stats(
+            ['workflow_name'],
+            created_from=created_at + datetime.timedelta(minutes=1)
+        )
+
+        self.assertEqual([], stats)
+
+        # Executions of other projects are not counted.
+        auth_context.set_ctx(test_base.get_context(default=False))
+
+        self.assertEqual([], db_api.get_workflow_execution_stats(['state']))
+
     def test_task_executions(self):
         # Add an associated object into collection.
         with db_api.transaction():
@@ -1582,6 +1728,119 @@ class DTWorkloadTest(SQLAlchemyTest):
         fetched = db_api.get_delay_tolerant_workloads_with_execution(True)
         self.assertEqual(0, len(fetched))
 
+    def test_get_unscheduled_delay_tolerant_workloads(self):
+        now = datetime.datetime.now()
+
+        for i in range(5):
+            values = copy.deepcopy(DELAY_TOLERANT_WORKLOADS[0])
+
+            values.update({
+                'name': 'dtw-%s' % i,
+                'job_duration': i,
+                'deadline': now + datetime.timedelta(hours=5 - i)
+            })
+
+            db_api.create_delay_tolerant_workload(values)
+
+        db_api.update_delay_tolerant_workload('dtw-0', {'executed': True})
+
+        page = db_api.get_unscheduled_delay_tolerant_workloads(3)
+
+        self.assertEqual(
+            ['dtw-4', 'dtw-3', 'dtw-2'],
+            [d.name for d in page]
+        )
+
+        # Only the columns needed for scheduling are loaded.
+        self.assertFalse(hasattr(page[0], 'workflow_input'))
+
+        page = db_api.get_unscheduled_delay_tolerant_workloads(
+            3,
+            marker=(page[-1].deadline, page[-1].id)
+        )
+
+        self.assertEqual(['dtw-1'], [d.name for d in page])
+
+    def test_claim_delay_tolerant_workloads(self):
+        created0 = db_api.create_delay_tolerant_workload(
+            DELAY_TOLERANT_WORKLOADS[0])
+        created1 = db_api.create_delay_tolerant_workload(
+            DELAY_TOLERANT_WORKLOADS[1])
+
+        claimed = db_api.claim_delay_tolerant_workloads([created0.id])
+
+        self.assertEqual([created0.id], claimed)
+
+        # The workload claimed once can't be claimed again.
+        claimed = db_api.claim_delay_tolerant_workloads(
+            [created0.id, created1.id]
+        )
+
+        self.assertEqual([created1.id], claimed)
+
+        fetched = db_api.get_delay_tolerant_workloads_with_execution(True)
+
+        self.assertEqual(2, len(fetched))
+
+        # Released workload can be claimed again.
+        db_api.update_delay_tolerant_workload(
+            created0.name,
+            {'executed': False}
+        )
+
+        claimed = db_api.claim_delay_tolerant_workloads(
+            [created0.id, created1.id]
+        )
+
+        self.assertEqual([created0.id], claimed)
+        self.assertEqual([], db_api.claim_delay_tolerant_workloads([]))
+
+    def test_create_delay_tolerant_workloads_in_bulk(self):
+        ids = db_api.create_delay_tolerant_workloads(
+            copy.deepcopy(DELAY_TOLERANT_WORKLOADS)
+        )
+
+        self.assertEqual(2, len(ids))
+
+        fetched = db_api.get_delay_tolerant_workloads()
+
+        self.assertEqual(['dtw1', 'dtw2'], [d.name for d in fetched])
+        self.assertEqual(set(ids), set(d.id for d in fetched))
+        self.assertEqual({'param': 'val'}, fetched[1].workflow_input)
+        self.assertIsNotNone(fetched[0].workflow_input_hash)
+        self.assertIsNotNone(fetched[0].created_at)
+
+        self.assertEqual(
+            set(['dtw1']),
+            db_api.get_delay_tolerant_workload_names(['dtw1', 'dtw3'])
+        )
+
+        self.assertRaises(
+            exc.DBDuplicateEntryError,
+            db_api.create_delay_tolerant_workloads,
+            DELAY_TOLERANT_WORKLOADS[:1]
+        )
+
+    def test_get_delay_tolerant_workloads_by_deadline(self):
+        now = datetime.datetime.now().replace(microsecond=0)
+
+        for i in range(3):
+            values = copy.deepcopy(DELAY_TOLERANT_WORKLOADS[0])
+
+            values.update({
+                'name': 'dtw-%s' % i,
+                'deadline': now + datetime.timedelta(hours=i)
+            })
+
+            db_api.create_delay_tolerant_workload(values)
+
+        fetched = db_api.get_delay_tolerant_workloads(
+            deadline_from=now + datetime.timedelta(hours=1),
+            deadline_to=(now + datetime.timedelta(hours=2)).isoformat()
+        )
+
+        self.assertEqual(['dtw-1'], [d.name for d in fetched])
+
 
 ENVIRONMENTS = [
     {
@@ -1713,6 +1972,32 @@ class EnvironmentTest(SQLAlchemyTest):
         self.assertIn("'name': 'env1'", s)
 
 
+class FingerprintTest(SQLAlchemyTest):
+    def test_set_and_get_fingerprint(self):
+        self.assertIsNone(db_api.get_fingerprint('actions'))
+
+        db_api.set_fingerprint('actions', 'abc')
+
+        self.assertEqual('abc', db_api.get_fingerprint('actions'))
+
+        db_api.set_fingerprint('actions', 'def')
+
+        self.assertEqual('def', db_api.get_fingerprint('actions'))
+
+    def test_delete_fingerprints(self):
+        db_api.set_fingerprint('actions', 'abc')
+        db_api.set_fingerprint('other', 'def')
+
+        db_api.delete_fingerprints(name='actions')
+
+        self.assertIsNone(db_api.get_fingerprint('actions'))
+        self.assertEqual('def', db_api.get_fingerprint('other'))
+
+        db_api.delete_fingerprints()
+
+        self.assertIsNone(db_api.get_fingerprint('other'))
+
+
 class TXTest(SQLAlchemyTest):
     def test_rollback(self):
         db_api.start_tx()
@@ -0,0 +1,437 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Offline simulator of delay tolerant workload scheduling.
+
+The simulator replays a workload trace against the real DTW service and
+MistralPeriodicTasks using a virtual clock. Workflows are not executed,
+instead every started execution is considered finished after the duration
+given in the trace. This way scheduling policies can be compared in seconds
+without waiting for wall clock deadlines.
+
+The simulator patches DTW and periodic task modules while it runs, so it's
+kept with the tests and the tools rather than in the service code. It only
+runs against an in-memory SQLite database and removes only what it
+created.
+"""
+
+import collections
+import csv
+import datetime
+import random
+import time
+
+from oslo_config import cfg
+from oslo_utils import timeutils
+from sqlalchemy.engine import url as sa_url
+
+from mistral import context as auth_ctx
+from mistral.db.v2 import api as db_api
+from mistral import exceptions as exc
+from mistral.services import delay_tolerant_workload as dtw
+from mistral.services import periodic
+from mistral.services import triggers
+
+
+CONF = cfg.CONF
+
+POLICIES = ('immediate', 'last_minute', 'deadline')
+
+# Start of the virtual time.
+BASE_TIME = datetime.datetime(2016, 1, 1)
+
+_WF_PARAM = 'dtw_simulation_id'
+
+_cpu_time = getattr(time, 'process_time', None) or time.clock
+
+
+TraceEntry = collections.namedtuple(
+    'TraceEntry',
+    ['name', 'arrival', 'deadline', 'duration', 'job_duration', 'workflow']
+)
+TraceEntry.__doc__ = """Workload of a trace.
+
+Arrival and deadline are given in seconds since the start of the simulation,
+duration is the actual execution duration while job_duration is the one
+declared by the user (None if not declared).
+"""
+
+SimulationResult = collections.namedtuple(
+    'SimulationResult',
+    [
+        'policy',
+        'workloads',
+        'rejected',
+        'not_started',
+        'missed',
+        'miss_rate',
+        'peak_concurrency',
+        'avg_queue_delay',
+        'max_queue_delay',
+        'scheduler_cpu_time'
+    ]
+)
+
+
+def load_trace(path):
+    """Loads a trace from a CSV file.
+
+    The file must have a header with columns 'arrival', 'deadline' and
+    'duration' (seconds). Columns 'name', 'job_duration' and 'workflow'
+    are optional.
+    """
+    entries = []
+
+    with open(path) as f:
+        for idx, row in enumerate(csv.DictReader(f)):
+            job_duration = row.get('job_duration')
+
+            entries.append(
+                TraceEntry(
+                    row.get('name') or 'dtw-%s' % idx,
+                    int(row['arrival']),
+                    int(row['deadline']),
+                    int(row['duration']),
+                    int(job_duration) if job_duration else None,
+                    row.get('workflow') or 'wf'
+                )
+            )
+
+    return entries
+
+
+def generate_trace(seed=42, num_bursts=10, burst_size=100, interval=600,
+                   max_duration=300, min_slack=120, max_slack=3600):
+    """Generates bursts of workloads with similar deadlines."""
+    rnd = random.Random(seed)
+
+    entries = []
+
+    for burst in range(num_bursts):
+        arrival = burst * interval
+
+        for i in range(burst_size):
+            duration = rnd.randint(1, max_duration)
+
+            entries.append(
+                TraceEntry(
+                    'dtw-%s-%s' % (burst, i),
+                    arrival,
+                    arrival + duration + rnd.randint(min_slack, max_slack),
+                    duration,
+                    duration,
+                    'wf'
+                )
+            )
+
+    return entries
+
+
+class VirtualClock(object):
+    def __init__(self, now=BASE_TIME):
+        self.now = now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+        timeutils.set_time_override(self.now)
+
+
+class _VirtualDatetimeModule(object):
+    """Replaces 'datetime' module in modules using datetime.now()."""
+
+    def __init__(self, clock):
+        class VirtualDatetime(datetime.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now
+
+            @classmethod
+            def utcnow(cls):
+                return clock.now
+
+        self.datetime = VirtualDatetime
+        self.timedelta = datetime.timedelta
+
+
+class _FakeEngineClient(object):
+    """Records workflow starts instead of running workflows."""
+
+    def __init__(self, simulation):
+        self._simulation = simulation
+
+    def start_workflow(self, wf_identifier, wf_input, description='',
+                       **params):
+        self._simulation.on_workflow_start(params[_WF_PARAM])
+
+
+class _FakeRPC(object):
+    def __init__(self, client):
+        self._client = client
+
+    def get_engine_client(self):
+        return self._client
+
+
+class Simulation(object):
+    """Replays a trace using the given DTW scheduling policy."""
+
+    def __init__(self, trace, policy, tick=1):
+        if policy not in POLICIES:
+            raise exc.InputException(
+                'Unknown DTW scheduling policy: %s' % policy
+            )
+
+        self.trace = sorted(trace, key=lambda e: e.arrival)
+        self.policy = policy
+        self.tick = tick
+
+        self.clock = VirtualClock()
+
+        self._entries = dict((e.name, e) for e in self.trace)
+        self._workflows = set(e.workflow for e in self.trace)
+
+        self._patches = []
+        self._overrides = []
+
+        # Names of workloads and workflows created by the simulation.
+        self._created_workloads = []
+        self._created_workflows = []
+
+        # {entry name: start time in seconds}
+        self._started = {}
+        # {finish time in seconds: number of executions}
+        self._finishing = collections.defaultdict(int)
+
+        self._rejected = 0
+        self._running = 0
+        self._peak = 0
+        self._cpu_time = 0.0
+
+    def _patch(self, obj, attr, value):
+        self._patches.append((obj, attr, getattr(obj, attr)))
+
+        setattr(obj, attr, value)
+
+    def _override_config(self, name, value, group):
+        CONF.set_override(name, value, group)
+
+        self._overrides.append((name, group))
+
+    @staticmethod
+    def _check_db():
+        url = sa_url.make_url(CONF.database.connection)
+
+        if (url.drivername != 'sqlite' or
+                url.database not in (None, '', ':memory:')):
+            raise exc.MistralException(
+                'DTW simulation runs only against in-memory SQLite database'
+                ' [driver=%s, database=%s]' % (url.drivername, url.database)
+            )
+
+    def _clean_db(self):
+        with db_api.transaction():
+            for name in self._created_workloads:
+                # Last minute scheduling creates cron triggers named after
+                # workloads.
+                if db_api.load_cron_trigger(name):
+                    db_api.delete_cron_trigger(name)
+
+                db_api.delete_delay_tolerant_workload(name)
+
+            for wf_name in self._created_workflows:
+                db_api.delete_workflow_definition(wf_name)
+
+    def _setup(self):
+        self._override_config('auth_enable', False, 'pecan')
+
+        self._override_config('dtw_scheduler', self.policy, 'engine')
+
+        clock_module = _VirtualDatetimeModule(self.clock)
+
+        for module in (dtw, periodic, triggers):
+            self._patch(module, 'datetime', clock_module)
+
+        self._patch(periodic, 'rpc', _FakeRPC(_FakeEngineClient(self)))
+
+        timeutils.set_time_override(self.clock.now)
+
+        dtw.cleanup()
+
+        auth_ctx.set_ctx(
+            auth_ctx.MistralContext(
+                user_id=None,
+                project_id=None,
+                auth_token=None,
+                is_admin=True
+            )
+        )
+
+        db_api.setup_db()
+
+        for wf_name in self._workflows:
+            if db_api.load_workflow_definition(wf_name):
+                continue
+
+            self._created_workflows.append(wf_name)
+
+            db_api.create_workflow_definition({
+                'name': wf_name,
+                'definition': '',
+                'spec': {
+                    'version': '2.0',
+                    'name': wf_name,
+                    'tasks': {'task1': {'action': 'std.noop'}}
+                },
+                'tags': [],
+                'scope': 'private'
+            })
+
+    def _teardown(self):
+        try:
+            self._clean_db()
+        finally:
+            while self._patches:
+                obj, attr, value = self._patches.pop()
+
+                setattr(obj, attr, value)
+
+            while self._overrides:
+                CONF.clear_override(*self._overrides.pop())
+
+            timeutils.clear_time_override()
+
+            auth_ctx.set_ctx(None)
+
+            dtw.cleanup()
+
+    def _seconds(self):
+        return int((self.clock.now - BASE_TIME).total_seconds())
+
+    def on_workflow_start(self, name):
+        now = self._seconds()
+        entry = self._entries[name]
+
+        self._started[name] = now
+        self._finishing[now + entry.duration] += 1
+
+        self._running += 1
+        self._peak = max(self._peak, self._running)
+
+    def _submit(self, entry):
+        try:
+            dtw.create_delay_tolerant_workload(
+                entry.name,
+                entry.workflow,
+                {},
+                workflow_params={_WF_PARAM: entry.name},
+                deadline=str(
+                    BASE_TIME + datetime.timedelta(seconds=entry.deadline)
+                ),
+                job_duration=entry.job_duration
+            )
+        except exc.MistralException:
+            self._rejected += 1
+        else:
+            self._created_workloads.append(entry.name)
+
+    def _run_periodic_tasks(self, periodic_tasks):
+        ctx = auth_ctx.ctx()
+
+        started = _cpu_time()
+
+        periodic_tasks.process_delay_tolerant_workload(ctx)
+        periodic_tasks.process_cron_triggers_v2(ctx)
+
+        self._cpu_time += _cpu_time() - started
+
+        # Periodic tasks reset the context.
+        auth_ctx.set_ctx(ctx)
+
+    def run(self):
+        """Runs the simulation.
+
+        :return: SimulationResult.
+        """
+        self._check_db()
+
+        try:
+            self._setup()
+
+            periodic_tasks = periodic.MistralPeriodicTasks(CONF)
+
+            end = max(e.deadline for e in self.trace) if self.trace else 0
+
+            pending = collections.deque(self.trace)
+
+            while True:
+                now = self._seconds()
+
+                for t in [t for t in self._finishing if t <= now]:
+                    self._running -= self._finishing.pop(t)
+
+                while pending and pending[0].arrival <= now:
+                    self._submit(pending.popleft())
+
+                self._run_periodic_tasks(periodic_tasks)
+
+                if now >= end and not pending and not self._running:
+                    break
+
+                self.clock.advance(self.tick)
+
+            return self._get_result()
+        finally:
+            self._teardown()
+
+    def _get_result(self):
+        delays = [
+            start - self._entries[name].arrival
+            for name, start in self._started.items()
+        ]
+
+        missed = len([
+            name for name, start in self._started.items()
+            if start + self._entries[name].duration >
+            self._entries[name].deadline
+        ])
+
+        accepted = len(self.trace) - self._rejected
+        not_started = accepted - len(self._started)
+
+        return SimulationResult(
+            policy=self.policy,
+            workloads=len(self.trace),
+            rejected=self._rejected,
+            not_started=not_started,
+            missed=missed,
+            miss_rate=(
+                float(missed + not_started) / accepted if accepted else 0.0
+            ),
+            peak_concurrency=self._peak,
+            avg_queue_delay=(
+                float(sum(delays)) / len(delays) if delays else 0.0
+            ),
+            max_queue_delay=max(delays) if delays else 0,
+            scheduler_cpu_time=self._cpu_time
+        )
+
+
+def simulate(trace, policies=POLICIES, tick=1):
+    """Replays the trace with every given policy.
+
+    :return: List of SimulationResult.
+    """
+    return [Simulation(trace, p, tick=tick).run() for p in policies]
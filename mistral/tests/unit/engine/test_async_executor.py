@@ -0,0 +1,128 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json
+
+import eventlet
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from mistral.engine import default_executor as def_exec
+from mistral.tests.unit import base
+
+
+HTTP_ACTION = 'mistral.actions.std_actions.HTTPAction'
+ECHO_ACTION = 'mistral.actions.std_actions.EchoAction'
+
+# Number of actions running concurrently in a test.
+ACTION_COUNT = 200
+
+# Delay of the stub server response in seconds.
+RESPONSE_DELAY = 0.5
+
+
+class StubHTTPHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_GET(self):
+        eventlet.sleep(RESPONSE_DELAY)
+
+        body = json.dumps({'path': self.path}).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    request_queue_size = ACTION_COUNT
+
+
+class FakeEngineClient(object):
+    def __init__(self):
+        self.results = {}
+
+    def on_action_complete(self, action_ex_id, result):
+        self.results[action_ex_id] = result
+
+
+class AsyncExecutorTest(base.BaseTest):
+    def setUp(self):
+        super(AsyncExecutorTest, self).setUp()
+
+        self.override_config('async_mode', True, 'executor')
+
+        self.server = StubHTTPServer(('127.0.0.1', 0), StubHTTPHandler)
+        self.url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+
+        self.server_thread = eventlet.spawn(self.server.serve_forever)
+
+        self.addCleanup(self.server_thread.kill)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.engine_client = FakeEngineClient()
+        self.executor = def_exec.DefaultExecutor(self.engine_client)
+
+    def test_run_http_actions_concurrently(self):
+        for i in range(ACTION_COUNT):
+            res = self.executor.run_action(
+                'action-%s' % i,
+                HTTP_ACTION,
+                {},
+                {'url': '%s/%s' % (self.url, i)}
+            )
+
+            # Result is delivered to the engine, not returned.
+            self.assertIsNone(res)
+
+        # All requests are processed concurrently so it should take much
+        # less than ACTION_COUNT * RESPONSE_DELAY seconds.
+        self._await(
+            lambda: len(self.engine_client.results) == ACTION_COUNT,
+            delay=0.1,
+            timeout=ACTION_COUNT * RESPONSE_DELAY / 4
+        )
+
+        for i in range(ACTION_COUNT):
+            result = self.engine_client.results['action-%s' % i]
+
+            self.assertTrue(result.is_success())
+            self.assertEqual(200, result.data['status'])
+            self.assertEqual({'path': '/%s' % i}, result.data['content'])
+
+    def test_run_sync_action_in_thread_pool(self):
+        self.executor.run_action('action-1', ECHO_ACTION, {}, {'output': 1})
+
+        self._await(lambda: 'action-1' in self.engine_client.results)
+
+        self.assertEqual(1, self.engine_client.results['action-1'].data)
+
+    def test_run_action_without_action_ex_id(self):
+        # Nobody receives the result via engine so it must be returned.
+        result = self.executor.run_action(
+            None,
+            HTTP_ACTION,
+            {},
+            {'url': self.url}
+        )
+
+        self.assertTrue(result.is_success())
+        self.assertEqual(200, result.data['status'])
+        self.assertDictEqual({}, self.engine_client.results)
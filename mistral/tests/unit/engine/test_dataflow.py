@@ -539,3 +539,42 @@ class DataFlowTest(test_base.BaseTest):
                 [1, 1],
                 data_flow.get_task_execution_result(task_ex)
             )
+
+    def test_get_task_execution_results(self):
+        with_items_task_ex = models.TaskExecution(
+            id='1',
+            name='task1',
+            runtime_context={
+                'with_items_context': {'count': 2}
+            }
+        )
+
+        task_ex = models.TaskExecution(
+            id='2',
+            name='task2',
+            runtime_context={}
+        )
+
+        empty_task_ex = models.TaskExecution(
+            id='3',
+            name='task3',
+            runtime_context={}
+        )
+
+        outputs = [
+            ('1', {'index': 1}, {'result': 2}),
+            ('2', {}, {'result': 'x'}),
+            ('1', {'index': 0}, {'result': 1})
+        ]
+
+        with mock.patch.object(db_api,
+                               'get_accepted_action_execution_outputs',
+                               return_value=outputs) as get_outputs:
+            results = data_flow.get_task_execution_results(
+                [with_items_task_ex, task_ex, empty_task_ex]
+            )
+
+        # Outputs of all the tasks are fetched with one query.
+        get_outputs.assert_called_once_with(['1', '2', '3'])
+
+        self.assertEqual({'1': [1, 2], '2': 'x', '3': []}, results)
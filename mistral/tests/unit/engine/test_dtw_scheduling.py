@@ -24,6 +24,7 @@ from mistral.services import security
 from mistral.services import workflows
 from mistral.tests.unit.engine import base
 from mistral import utils
+from mistral.workflow import states
 
 
 WORKFLOW_LIST = """
@@ -145,9 +146,10 @@ class ProcessDelayTolerantWorkload(base.EngineTestCase):
         periodic.MistralPeriodicTasks(
             cfg.CONF).process_delay_tolerant_workload(None)
 
+        # The workload is marked so that it's not processed again.
         unscheduled_workload_after = dtw \
             .get_unscheduled_delay_tolerant_workload()
-        self.assertEqual(1, len(unscheduled_workload_after))
+        self.assertEqual(0, len(unscheduled_workload_after))
 
         # so we should check if we have a cron trigger associated with this
         # workload now
@@ -159,6 +161,248 @@ class ProcessDelayTolerantWorkload(base.EngineTestCase):
             cron_trigger_db.name
         )
 
+    def test_workload_processed_once(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler_last_minute', False, 'engine')
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        dtw.create_delay_tolerant_workload(
+            'dtw-%s' % utils.generate_unicode_uuid(),
+            wf.name,
+            {},
+            {},
+            (datetime.datetime.now() + datetime.timedelta(hours=2))
+            .strftime('%Y-%m-%dT%H:%M:%S'),
+            None,
+            None
+        )
+
+        # Two engines read the same unscheduled workload concurrently.
+        workloads = dtw.get_unscheduled_delay_tolerant_workload()
+
+        with mock.patch.object(
+                dtw,
+                'get_unscheduled_delay_tolerant_workload_batches',
+                side_effect=lambda: iter([workloads])):
+            for _ in range(2):
+                periodic.MistralPeriodicTasks(
+                    cfg.CONF).process_delay_tolerant_workload(None)
+
+        self.assertEqual(1, len(db_api.get_workflow_executions()))
+
+    def test_workload_released_if_not_started(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler_last_minute', False, 'engine')
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        dtw.create_delay_tolerant_workload(
+            'dtw-1',
+            wf.name,
+            {},
+            {},
+            (datetime.datetime.now() + datetime.timedelta(hours=2))
+            .strftime('%Y-%m-%dT%H:%M:%S'),
+            None,
+            None
+        )
+
+        with mock.patch.object(periodic.rpc, 'get_engine_client') as client:
+            client.return_value.start_workflow.side_effect = Exception()
+
+            periodic.MistralPeriodicTasks(
+                cfg.CONF).process_delay_tolerant_workload(None)
+
+        # The workload is processed again next time.
+        self.assertFalse(db_api.get_delay_tolerant_workload('dtw-1').executed)
+
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        self.assertTrue(db_api.get_delay_tolerant_workload('dtw-1').executed)
+        self.assertEqual(1, len(db_api.get_workflow_executions()))
+
+    @mock.patch.object(security,
+                       'create_trust',
+                       type('trust', (object,), {'id': 'my_trust_id'}))
+    def test_last_minute_workload_without_slack(self):
+        self.override_config('dtw_scheduler_last_minute', True, 'engine')
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        name = 'dtw-%s' % utils.generate_unicode_uuid()
+
+        # The workload must be started right away to meet the deadline.
+        dtw.create_delay_tolerant_workload(
+            name,
+            wf.name,
+            {},
+            {},
+            (datetime.datetime.now() + datetime.timedelta(hours=1))
+            .strftime('%Y-%m-%dT%H:%M:%S'),
+            3600,
+            None
+        )
+
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        self.assertTrue(db_api.get_delay_tolerant_workload(name).executed)
+        self.assertIsNone(db_api.load_cron_trigger(name))
+        self.assertEqual(1, len(db_api.get_workflow_executions()))
+
+    def test_deadline_scheduled_workload(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler', 'deadline', 'engine')
+        self.override_config('dtw_max_concurrent_executions', 1, 'engine')
+
+        self.addCleanup(dtw.cleanup)
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        now = datetime.datetime.now()
+
+        # Both workloads take an hour, only one of them may run at a time.
+        for name, hours in [('dtw-late', 5), ('dtw-urgent', 2)]:
+            dtw.create_delay_tolerant_workload(
+                name,
+                wf.name,
+                {},
+                {},
+                (now + datetime.timedelta(hours=hours))
+                .strftime('%Y-%m-%dT%H:%M:%S'),
+                3600,
+                None
+            )
+
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        # The workload with the earliest deadline is started first.
+        self.assertTrue(db_api.get_delay_tolerant_workload('dtw-urgent')
+                        .executed)
+
+        unscheduled_workload = dtw.get_unscheduled_delay_tolerant_workload()
+
+        self.assertEqual(1, len(unscheduled_workload))
+        self.assertEqual('dtw-late', unscheduled_workload[0].name)
+
+    def test_deadline_scheduling_capacity_shared_by_processes(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler', 'deadline', 'engine')
+        self.override_config('dtw_max_concurrent_executions', 1, 'engine')
+
+        self.addCleanup(dtw.cleanup)
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        # Workload started by the scheduler of another process.
+        db_api.create_workflow_execution({
+            'name': wf.name,
+            'description': dtw.EXECUTION_DESCRIPTION,
+            'state': states.RUNNING
+        })
+
+        now = datetime.datetime.now()
+
+        dtw.create_delay_tolerant_workload(
+            'dtw-1',
+            wf.name,
+            {},
+            {},
+            (now + datetime.timedelta(hours=5)).strftime('%Y-%m-%dT%H:%M:%S'),
+            3600,
+            None
+        )
+
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        # Capacity is taken so the workload with slack is postponed.
+        self.assertFalse(db_api.get_delay_tolerant_workload('dtw-1').executed)
+
+    def test_last_minute_workload_pulled_forward(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler_last_minute', True, 'engine')
+        self.override_config('dtw_rebalancing', True, 'engine')
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        now = datetime.datetime.now()
+
+        dtw.create_delay_tolerant_workload(
+            'dtw-1',
+            wf.name,
+            {},
+            {},
+            (now + datetime.timedelta(hours=5)).strftime('%Y-%m-%dT%H:%M:%S'),
+            3600,
+            None
+        )
+
+        # There are no running executions so the workload planned to start
+        # in 4 hours is started right away.
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        cron_trigger = db_api.get_cron_trigger('dtw-1')
+
+        self.assertLess(
+            cron_trigger.next_execution_time,
+            now + datetime.timedelta(minutes=1)
+        )
+
+        d = db_api.get_delay_tolerant_workload('dtw-1')
+
+        self.assertEqual(1, d.reschedule_count)
+        self.assertEqual(
+            cron_trigger.next_execution_time,
+            d.planned_start_time
+        )
+        self.assertIn('pulled forward', d.reschedule_reason)
+
+    @mock.patch.object(
+        dtw,
+        'get_cluster_load',
+        mock.MagicMock(return_value=dtw.ClusterLoad(2, 1, False))
+    )
+    def test_deadline_scheduling_on_overload(self):
+        self.override_config('auth_enable', False, 'pecan')
+        self.override_config('dtw_scheduler', 'deadline', 'engine')
+        self.override_config('dtw_max_concurrent_executions', 1, 'engine')
+        self.override_config('dtw_rebalancing', True, 'engine')
+
+        self.addCleanup(dtw.cleanup)
+
+        wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+        now = datetime.datetime.now()
+
+        for name, hours in [('dtw-late', 5), ('dtw-urgent', 1)]:
+            dtw.create_delay_tolerant_workload(
+                name,
+                wf.name,
+                {},
+                {},
+                (now + datetime.timedelta(hours=hours))
+                .strftime('%Y-%m-%dT%H:%M:%S'),
+                3600,
+                None
+            )
+
+        periodic.MistralPeriodicTasks(
+            cfg.CONF).process_delay_tolerant_workload(None)
+
+        # Capacity is taken by other executions, only the workload that
+        # can't be postponed is started.
+        self.assertTrue(
+            db_api.get_delay_tolerant_workload('dtw-urgent').executed
+        )
+        self.assertFalse(
+            db_api.get_delay_tolerant_workload('dtw-late').executed
+        )
+
     # @mock.patch('mistral.services.triggers.validate_cron_trigger_input')
     # def test_create_cron_trigger_with_pattern_and_first_time(self,
     #                                                          validate_mock):
@@ -0,0 +1,292 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import itertools
+
+import mock
+
+from mistral import context as auth_ctx
+from mistral.engine import executor_routing as routing
+from mistral.engine.rpc_backend.oslo import oslo_client
+from mistral.engine.rpc_backend import rpc
+from mistral.tests.unit import base
+
+
+class FakeExecutor(object):
+    """Executor processing a fixed number of actions per simulation tick."""
+
+    def __init__(self, host, rate, capacity):
+        self.host = host
+        self.rate = rate
+        self.capacity = capacity
+        self.queue = 0
+        self.processed = 0
+        self.max_queue = 0
+
+    def receive(self):
+        self.queue += 1
+        self.max_queue = max(self.max_queue, self.queue)
+
+    def tick(self):
+        done = min(self.rate, self.queue)
+
+        self.queue -= done
+        self.processed += done
+
+    def get_capabilities(self):
+        return {
+            'host': self.host,
+            'in_flight': self.queue,
+            'capacity': self.capacity
+        }
+
+
+def _make_executors():
+    # One fast and two slow executors of the same size.
+    return [
+        FakeExecutor('fast', rate=20, capacity=50),
+        FakeExecutor('slow-1', rate=2, capacity=50),
+        FakeExecutor('slow-2', rate=2, capacity=50)
+    ]
+
+
+def _simulate(executors, route, ticks=100, arrivals=20):
+    """Runs simulation.
+
+    :param executors: Fake executors.
+    :param route: Function returning executor for the next action or None
+        if the action has to be postponed (backpressure).
+    :param ticks: Number of simulation ticks.
+    :param arrivals: Number of new actions per tick.
+    :return: Number of postponed action dispatches.
+    """
+    postponed = 0
+    backlog = 0
+
+    for _ in range(ticks):
+        backlog += arrivals
+
+        while backlog:
+            executor = route()
+
+            if executor is None:
+                postponed += 1
+
+                break
+
+            executor.receive()
+
+            backlog -= 1
+
+        for e in executors:
+            e.tick()
+
+    return postponed
+
+
+class ExecutorRoutingSimulationTest(base.BaseTest):
+    def test_round_robin_overloads_slow_executors(self):
+        # Shared topic delivers messages to consumers in round-robin
+        # manner regardless of their load.
+        executors = _make_executors()
+        rr = itertools.cycle(executors)
+
+        _simulate(executors, lambda: next(rr))
+
+        slow = [e for e in executors if e.host != 'fast']
+
+        # Slow executors accumulate huge queues.
+        for e in slow:
+            self.assertGreater(e.max_queue, 400)
+
+    def test_capacity_aware_routing_balances_load(self):
+        executors = _make_executors()
+        by_host = dict((e.host, e) for e in executors)
+
+        balancer = routing.ExecutorLoadBalancer(
+            0,
+            lambda: dict((e.host, e.get_capabilities()) for e in executors)
+        )
+
+        def route():
+            host = balancer.select_target()
+
+            return by_host[host] if host else None
+
+        _simulate(executors, route)
+
+        # No executor ever gets more than it can hold.
+        for e in executors:
+            self.assertLessEqual(e.max_queue, e.capacity)
+
+        # Nearly all actions are processed: 100 ticks * 20 arrivals
+        # minus what's still queued at the end of the simulation.
+        total = sum(e.processed for e in executors)
+
+        self.assertGreater(total, 1800)
+
+        # Fast executor does most of the work.
+        self.assertGreater(by_host['fast'].processed, total / 2)
+
+    def test_select_target_with_single_executor(self):
+        balancer = routing.ExecutorLoadBalancer(
+            0,
+            lambda: {'m1': {'host': 'h1', 'in_flight': 0, 'capacity': 10}}
+        )
+
+        # Shared topic is used if there's nothing to choose from.
+        self.assertIsNone(balancer.select_target())
+
+    @mock.patch.object(routing, 'LOG')
+    def test_select_target_with_shared_host(self, log):
+        caps = {
+            'm1': {'host': 'h1', 'in_flight': 0, 'capacity': 10},
+            'm2': {'host': 'h1', 'in_flight': 0, 'capacity': 10}
+        }
+
+        balancer = routing.ExecutorLoadBalancer(0, lambda: caps)
+
+        # Executors with the same host can't be told apart.
+        self.assertIsNone(balancer.select_target())
+        self.assertIsNone(balancer.select_target())
+
+        self.assertEqual(1, log.warning.call_count)
+
+        caps['m3'] = {'host': 'h2', 'in_flight': 15, 'capacity': 20}
+
+        # Load of executors sharing a host is summed up.
+        self.assertEqual('h1', balancer.select_target())
+
+    def test_select_target_spreads_between_refreshes(self):
+        balancer = routing.ExecutorLoadBalancer(
+            3600,
+            lambda: {
+                'm1': {'host': 'h1', 'in_flight': 0, 'capacity': 10},
+                'm2': {'host': 'h2', 'in_flight': 0, 'capacity': 10}
+            }
+        )
+
+        targets = [balancer.select_target() for _ in range(10)]
+
+        self.assertEqual(5, targets.count('h1'))
+        self.assertEqual(5, targets.count('h2'))
+
+    def test_is_saturated(self):
+        caps = {
+            'm1': {'host': 'h1', 'in_flight': 10, 'capacity': 10},
+            'm2': {'host': 'h2', 'in_flight': 9, 'capacity': 10}
+        }
+
+        balancer = routing.ExecutorLoadBalancer(0, lambda: caps)
+
+        self.assertFalse(balancer.is_saturated())
+
+        caps['m2']['in_flight'] = 10
+
+        self.assertTrue(balancer.is_saturated())
+        self.assertIsNone(balancer.select_target())
+
+    def test_is_saturated_without_load_info(self):
+        balancer = routing.ExecutorLoadBalancer(0, lambda: {})
+
+        self.assertFalse(balancer.is_saturated())
+
+    @mock.patch.object(routing.ExecutorLoadBalancer, 'is_saturated')
+    def test_get_schedule_delay(self, is_saturated):
+        self.addCleanup(routing.cleanup)
+
+        is_saturated.return_value = True
+
+        # Load balancing is disabled by default.
+        self.assertEqual(0, routing.get_schedule_delay())
+
+        self.override_config('executor_load_balancing', True, 'engine')
+        self.override_config('executor_backpressure_delay', 3, 'engine')
+
+        self.assertEqual(3, routing.get_schedule_delay())
+
+        is_saturated.return_value = False
+
+        self.assertEqual(0, routing.get_schedule_delay())
+
+    def test_select_target_keeps_explicit_target(self):
+        self.override_config('executor_load_balancing', True, 'engine')
+
+        self.assertEqual('my_host', routing.select_target('my_host'))
+
+
+class ExecutorClientRoutingTest(base.BaseTest):
+    def setUp(self):
+        super(ExecutorClientRoutingTest, self).setUp()
+
+        self.override_config('executor_load_balancing', True, 'engine')
+
+        self.addCleanup(routing.cleanup)
+
+        caps = {
+            'm1': {'host': 'h1', 'in_flight': 8, 'capacity': 10},
+            'm2': {'host': 'h2', 'in_flight': 1, 'capacity': 10}
+        }
+
+        routing._BALANCER = routing.ExecutorLoadBalancer(3600, lambda: caps)
+
+        auth_ctx.set_ctx(base.get_context())
+
+        self.addCleanup(auth_ctx.set_ctx, None)
+
+    @mock.patch('oslo_messaging.RPCClient')
+    @mock.patch.object(rpc, 'get_transport', mock.MagicMock())
+    @mock.patch.object(
+        rpc,
+        'get_rpc_client_driver',
+        mock.MagicMock(return_value=oslo_client.OsloRPCClient)
+    )
+    def _run_action(self, target, async, rpc_client_cls):
+        client = rpc.ExecutorClient({'topic': 'executor'})
+
+        client.run_action(
+            'action-1',
+            'mistral.actions.std_actions.EchoAction',
+            {},
+            {'output': 'x'},
+            routing.select_target(target),
+            async=async
+        )
+
+        return rpc_client_cls.return_value
+
+    def test_run_action_at_least_loaded_executor(self):
+        rpc_client = self._run_action(None, True)
+
+        rpc_client.prepare.assert_called_once_with(
+            topic='executor',
+            server='h2'
+        )
+        rpc_client.prepare.return_value.cast.assert_called_once_with(
+            mock.ANY,
+            'run_action',
+            action_ex_id='action-1',
+            action_class_str='mistral.actions.std_actions.EchoAction',
+            attributes={},
+            params={'output': 'x'}
+        )
+
+    def test_run_action_at_explicit_target(self):
+        rpc_client = self._run_action('my_host', False)
+
+        rpc_client.prepare.assert_called_once_with(
+            topic='executor',
+            server='my_host'
+        )
@@ -0,0 +1,141 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import eventlet
+import os
+import time
+
+from mistral.actions import base as actions_base
+from mistral.engine import default_executor as def_exec
+from mistral.engine import process_pool
+from mistral.tests.unit import base
+
+
+class PidAction(actions_base.Action):
+    run_in_process = True
+
+    def __init__(self, sleep=0):
+        self.sleep = sleep
+
+    def run(self):
+        if self.sleep:
+            time.sleep(self.sleep)
+
+        return os.getpid()
+
+    def test(self):
+        return None
+
+
+class InProcessPidAction(PidAction):
+    run_in_process = False
+
+
+PID_ACTION = '%s.%s' % (PidAction.__module__, PidAction.__name__)
+IN_PROCESS_PID_ACTION = '%s.%s' % (
+    InProcessPidAction.__module__,
+    InProcessPidAction.__name__
+)
+
+
+class FakeEngineClient(object):
+    def __init__(self):
+        self.results = {}
+
+    def on_action_complete(self, action_ex_id, result):
+        self.results[action_ex_id] = result
+
+
+class ProcessPoolTest(base.BaseTest):
+    def setUp(self):
+        super(ProcessPoolTest, self).setUp()
+
+        self.override_config('process_pool_size', 2, 'executor')
+        self.override_config('process_pool_max_tasks_per_child', 1, 'executor')
+
+        self.addCleanup(process_pool.shutdown)
+
+        self.engine_client = FakeEngineClient()
+        self.executor = def_exec.DefaultExecutor(self.engine_client)
+
+    def test_run_action_in_worker_process(self):
+        result = self.executor.run_action(None, PID_ACTION, {}, {})
+
+        self.assertTrue(result.is_success())
+        self.assertNotEqual(os.getpid(), result.data)
+
+    def test_run_action_in_executor_process(self):
+        result = self.executor.run_action(None, IN_PROCESS_PID_ACTION, {}, {})
+
+        self.assertEqual(os.getpid(), result.data)
+
+    def test_run_action_configured_by_class_path(self):
+        self.override_config(
+            'process_pool_actions',
+            [IN_PROCESS_PID_ACTION],
+            'executor'
+        )
+
+        result = self.executor.run_action(None, IN_PROCESS_PID_ACTION, {}, {})
+
+        self.assertNotEqual(os.getpid(), result.data)
+
+    def test_max_tasks_per_child(self):
+        pids = set(
+            self.executor.run_action(None, PID_ACTION, {}, {}).data
+            for _ in range(4)
+        )
+
+        # Every worker process is replaced after running one action.
+        self.assertEqual(4, len(pids))
+
+    def test_result_sent_to_engine(self):
+        self.executor.run_action('action-1', PID_ACTION, {}, {})
+
+        result = self.engine_client.results['action-1']
+
+        self.assertTrue(result.is_success())
+        self.assertNotEqual(os.getpid(), result.data)
+
+    def test_timeout(self):
+        self.override_config('process_pool_action_timeout', 1, 'executor')
+
+        self.executor.run_action('action-1', PID_ACTION, {}, {'sleep': 5})
+
+        result = self.engine_client.results['action-1']
+
+        self.assertTrue(result.is_error())
+        self.assertIn('has not completed', result.error)
+
+    def test_timeout_replaces_pool(self):
+        self.override_config('process_pool_action_timeout', 1, 'executor')
+
+        pool = process_pool.get_pool()
+
+        self.executor.run_action('action-1', PID_ACTION, {}, {'sleep': 5})
+
+        # The hung worker process is terminated along with its pool while
+        # following actions run in a new pool.
+        self.assertIsNot(pool, process_pool.get_pool())
+        self.assertIn(pool, process_pool._RETIRED_POOLS)
+
+        result = self.executor.run_action(None, PID_ACTION, {}, {})
+
+        self.assertTrue(result.is_success())
+
+        # Let the old pool be terminated.
+        eventlet.sleep(1.5)
+
+        self.assertEqual([], process_pool._RETIRED_POOLS)
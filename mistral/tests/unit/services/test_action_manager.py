@@ -47,3 +47,11 @@ class ActionManagerTest(base.DbTestCase):
 
         self.assertIn("This action just returns a configured value",
                       std_echo.description)
+
+    def test_action_attributes(self):
+        std_http = db_api.get_action_definition("std.http")
+        std_echo = db_api.get_action_definition("std.echo")
+
+        # Flags declared by the base action class are not attributes.
+        self.assertNotIn('reusable_client', std_http.attributes or {})
+        self.assertEqual({}, std_echo.attributes or {})
@@ -0,0 +1,512 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+import datetime
+import random
+
+import mock
+
+from mistral.db.v2 import api as db_api
+from mistral.services import delay_tolerant_workload as dtw
+from mistral.tests.unit import base
+
+
+BASE_TIME = datetime.datetime(2016, 1, 1)
+
+Workload = collections.namedtuple(
+    'Workload',
+    ['name', 'deadline', 'job_duration']
+)
+
+
+def _generate_workloads(seed, num_bursts, burst_size):
+    """Generates bursts of workloads with similar deadlines.
+
+    :return: Dictionary {arrival second: [workloads]}.
+    """
+    rnd = random.Random(seed)
+
+    arrivals = collections.defaultdict(list)
+
+    for burst in range(num_bursts):
+        arrival = burst * 100
+
+        for i in range(burst_size):
+            duration = rnd.randint(1, 10)
+            slack = rnd.randint(60, 120)
+
+            arrivals[arrival].append(
+                Workload(
+                    'dtw-%s-%s' % (burst, i),
+                    BASE_TIME + datetime.timedelta(
+                        seconds=arrival + duration + slack
+                    ),
+                    duration
+                )
+            )
+
+    return arrivals
+
+
+def _simulate(schedule, arrivals, duration):
+    """Runs simulation with one second ticks.
+
+    :param schedule: Function selecting workloads to start from the list
+        of pending workloads at the given time.
+    :param arrivals: Dictionary {arrival second: [workloads]}.
+    :param duration: Simulation duration in seconds.
+    :return: Tuple (peak concurrency, number of missed deadlines,
+        number of workloads not started).
+    """
+    pending = []
+    finished_at = collections.defaultdict(int)
+
+    running = 0
+    peak = 0
+    missed = 0
+
+    for second in range(duration):
+        running -= finished_at.pop(second, 0)
+
+        pending.extend(arrivals.get(second, []))
+
+        now = BASE_TIME + datetime.timedelta(seconds=second)
+
+        started = schedule(pending, now)
+
+        started_names = set(w.name for w in started)
+
+        pending = [w for w in pending if w.name not in started_names]
+
+        for w in started:
+            finished_at[second + w.job_duration] += 1
+            running += 1
+
+            finish = now + datetime.timedelta(seconds=w.job_duration)
+
+            if finish > w.deadline:
+                missed += 1
+
+        peak = max(peak, running)
+
+    return peak, missed, len(pending)
+
+
+class DeadlineSchedulerTest(base.BaseTest):
+    def test_simulation_smooths_bursts(self):
+        # 30 bursts of 100 workloads each.
+        arrivals = _generate_workloads(42, 30, 100)
+
+        scheduler = dtw.DeadlineScheduler(capacity=10, slot_size=1)
+
+        peak, missed, not_started = _simulate(
+            scheduler.schedule,
+            arrivals,
+            3200
+        )
+
+        self.assertEqual(0, missed)
+        self.assertEqual(0, not_started)
+        self.assertLessEqual(peak, 10)
+
+        # Starting workloads immediately meets deadlines too but all
+        # workloads of a burst run at the same time.
+        peak, missed, not_started = _simulate(
+            lambda pending, now: list(pending),
+            arrivals,
+            3200
+        )
+
+        self.assertEqual(0, missed)
+        self.assertEqual(100, peak)
+
+    def test_simulation_overload(self):
+        arrivals = _generate_workloads(7, 5, 100)
+
+        # Capacity is not sufficient to meet all deadlines within it.
+        scheduler = dtw.DeadlineScheduler(capacity=2, slot_size=1)
+
+        peak, missed, not_started = _simulate(
+            scheduler.schedule,
+            arrivals,
+            1000
+        )
+
+        # Workloads with no slack left are started regardless of capacity
+        # so deadlines are still met at the cost of exceeding capacity.
+        self.assertEqual(0, not_started)
+        self.assertEqual(0, missed)
+        self.assertGreater(peak, 2)
+
+    def test_earliest_deadline_first(self):
+        scheduler = dtw.DeadlineScheduler(capacity=1, slot_size=60)
+
+        late = Workload(
+            'late',
+            BASE_TIME + datetime.timedelta(hours=3),
+            600
+        )
+        urgent = Workload(
+            'urgent',
+            BASE_TIME + datetime.timedelta(hours=1),
+            600
+        )
+
+        self.assertEqual(
+            [urgent],
+            scheduler.schedule([late, urgent], BASE_TIME)
+        )
+
+        # 'urgent' occupies capacity for 10 minutes.
+        now = BASE_TIME + datetime.timedelta(minutes=5)
+
+        self.assertEqual([], scheduler.schedule([late], now))
+
+        now = BASE_TIME + datetime.timedelta(minutes=10)
+
+        self.assertEqual([late], scheduler.schedule([late], now))
+
+    def test_no_slack_started_immediately(self):
+        scheduler = dtw.DeadlineScheduler(capacity=1, slot_size=60)
+
+        workloads = [
+            Workload(
+                'dtw-%s' % i,
+                BASE_TIME + datetime.timedelta(minutes=10),
+                600
+            )
+            for i in range(3)
+        ]
+
+        # There's no capacity for all of them, still they are started
+        # because they can't be postponed any longer.
+        self.assertEqual(
+            workloads,
+            scheduler.schedule(workloads, BASE_TIME)
+        )
+
+    def test_external_load(self):
+        scheduler = dtw.DeadlineScheduler(capacity=2, slot_size=60)
+
+        with_slack = Workload(
+            'with-slack',
+            BASE_TIME + datetime.timedelta(hours=3),
+            600
+        )
+        without_slack = Workload(
+            'without-slack',
+            BASE_TIME + datetime.timedelta(minutes=10),
+            600
+        )
+
+        # Capacity is occupied by executions started elsewhere.
+        self.assertEqual(
+            [without_slack],
+            scheduler.schedule(
+                [with_slack, without_slack],
+                BASE_TIME,
+                external_load=2
+            )
+        )
+        self.assertEqual(1, scheduler.num_running)
+
+        self.assertEqual(
+            [with_slack],
+            scheduler.schedule([with_slack], BASE_TIME, external_load=0)
+        )
+
+    def test_external_load_from_cluster_load(self):
+        load = dtw.ClusterLoad(running=5, capacity=10, saturated=False)
+
+        self.assertEqual(3, dtw.get_external_load(load, 2))
+        self.assertEqual(0, dtw.get_external_load(load, 7))
+
+        load = dtw.ClusterLoad(running=0, capacity=10, saturated=True)
+
+        self.assertEqual(10, dtw.get_external_load(load, 0))
+
+    def test_get_scheduler_type(self):
+        self.override_config('dtw_scheduler_last_minute', True, 'engine')
+
+        self.assertEqual('last_minute', dtw.get_scheduler_type())
+
+        self.override_config('dtw_scheduler_last_minute', False, 'engine')
+
+        self.assertEqual('immediate', dtw.get_scheduler_type())
+
+        self.override_config('dtw_scheduler', 'deadline', 'engine')
+
+        self.assertEqual('deadline', dtw.get_scheduler_type())
+
+
+class DurationEstimateTest(base.DbTestCase):
+    def setUp(self):
+        super(DurationEstimateTest, self).setUp()
+
+        self.override_config('dtw_duration_estimates', True, 'engine')
+        self.override_config('dtw_duration_percentile', 90, 'engine')
+        self.override_config('dtw_duration_min_samples', 5, 'engine')
+
+        self.addCleanup(dtw.cleanup)
+
+    def _record(self, durations, input_size=10, workflow_id='wf-1'):
+        for duration in durations:
+            dtw.record_workflow_duration(workflow_id, input_size, duration)
+
+        dtw.cleanup()
+
+    def test_percentile(self):
+        self._record([10] * 9 + [1000])
+
+        estimate = dtw.get_duration_estimate('wf-1', 10)
+
+        # 10 seconds rounded up to the bucket boundary.
+        self.assertGreaterEqual(estimate, 10)
+        self.assertLessEqual(estimate, 12)
+
+        self.override_config('dtw_duration_percentile', 100, 'engine')
+
+        estimate = dtw.get_duration_estimate('wf-1', 10)
+
+        self.assertGreaterEqual(estimate, 1000)
+        self.assertLessEqual(estimate, 1200)
+
+    def test_not_enough_samples(self):
+        self._record([10] * 4)
+
+        self.assertIsNone(dtw.get_duration_estimate('wf-1', 10))
+        self.assertIsNone(dtw.get_duration_estimate('wf-2', 10))
+
+    def test_input_size_buckets(self):
+        self._record([10] * 5, input_size=10)
+        self._record([600] * 5, input_size=100000)
+
+        self.assertLessEqual(dtw.get_duration_estimate('wf-1', 10), 12)
+        self.assertGreaterEqual(
+            dtw.get_duration_estimate('wf-1', 100000),
+            600
+        )
+
+        stats = db_api.get_workflow_duration_stats(['wf-1'])
+
+        self.assertEqual(2, len(stats))
+        self.assertEqual([5, 5], [s.count for s in stats])
+
+    def test_all_input_sizes_used_if_not_enough_samples(self):
+        self._record([10] * 3, input_size=10)
+        self._record([600] * 3, input_size=100000)
+
+        # There's no executions with input of this size.
+        estimate = dtw.get_duration_estimate('wf-1', 1000)
+
+        self.assertGreaterEqual(estimate, 600)
+
+        self.assertIsNotNone(dtw.get_duration_estimate('wf-1'))
+
+    def test_effective_job_duration(self):
+        self._record([600] * 5)
+
+        d = mock.MagicMock(
+            workflow_id='wf-1',
+            workflow_input_size=10,
+            job_duration=60
+        )
+
+        self.assertGreaterEqual(dtw.get_effective_job_duration(d), 600)
+
+        d.job_duration = 3600
+
+        self.assertEqual(3600, dtw.get_effective_job_duration(d))
+
+        d.workflow_id = 'wf-2'
+
+        self.assertEqual(3600, dtw.get_effective_job_duration(d))
+
+        d.job_duration = None
+
+        self.assertIsNone(dtw.get_effective_job_duration(d))
+
+        self.override_config('dtw_duration_estimates', False, 'engine')
+
+        d.workflow_id = 'wf-1'
+        d.job_duration = 60
+
+        self.assertEqual(60, dtw.get_effective_job_duration(d))
+
+    @mock.patch('mistral.services.scheduler.schedule_call')
+    def test_on_workflow_success(self, schedule_call):
+        wf_ex = mock.MagicMock(
+            workflow_id='wf-1',
+            task_execution_id=None,
+            input={'param': 'value'},
+            created_at=BASE_TIME
+        )
+
+        dtw.on_workflow_success(wf_ex)
+
+        self.assertEqual(1, schedule_call.call_count)
+
+        kwargs = schedule_call.call_args[1]
+
+        self.assertEqual('wf-1', kwargs['workflow_id'])
+        self.assertEqual(
+            dtw.get_input_size({'param': 'value'}),
+            kwargs['input_size']
+        )
+
+        # Subworkflows are not taken into account.
+        wf_ex.task_execution_id = 'task-ex-1'
+
+        dtw.on_workflow_success(wf_ex)
+
+        self.assertEqual(1, schedule_call.call_count)
+
+        self.override_config('dtw_duration_estimates', False, 'engine')
+
+        wf_ex.task_execution_id = None
+
+        dtw.on_workflow_success(wf_ex)
+
+        self.assertEqual(1, schedule_call.call_count)
+
+
+class RebalancingTest(base.DbTestCase):
+    def setUp(self):
+        super(RebalancingTest, self).setUp()
+
+        self.now = datetime.datetime.now().replace(microsecond=0)
+
+        self.wf = db_api.create_workflow_definition({'name': 'my_wf'})
+
+    def _create_planned_workload(self, name, start, deadline, job_duration):
+        d = db_api.create_delay_tolerant_workload({
+            'name': name,
+            'workflow_name': self.wf.name,
+            'workflow_id': self.wf.id,
+            'workflow_input': {},
+            'workflow_params': {},
+            'deadline': self.now + datetime.timedelta(seconds=deadline),
+            'job_duration': job_duration,
+            'planned_start_time': self.now + datetime.timedelta(seconds=start),
+            'scope': 'private',
+            'executed': True
+        })
+
+        db_api.create_cron_trigger({
+            'name': name,
+            'workflow_name': self.wf.name,
+            'workflow_id': self.wf.id,
+            'workflow_input': {},
+            'workflow_params': {},
+            'first_execution_time': d.planned_start_time,
+            'next_execution_time': d.planned_start_time,
+            'remaining_executions': 1,
+            'scope': 'private'
+        })
+
+        return d
+
+    def test_postpone_on_overload(self):
+        self._create_planned_workload('dtw-slack', 60, 7200, 600)
+        self._create_planned_workload('dtw-urgent', 120, 720, 600)
+
+        count = dtw.rebalance_delay_tolerant_workloads(
+            self.now,
+            dtw.ClusterLoad(running=10, capacity=10, saturated=False)
+        )
+
+        self.assertEqual(1, count)
+
+        postponed = db_api.get_delay_tolerant_workload('dtw-slack')
+
+        self.assertEqual(
+            self.now + datetime.timedelta(seconds=120),
+            postponed.planned_start_time
+        )
+        self.assertEqual(
+            postponed.planned_start_time,
+            db_api.get_cron_trigger('dtw-slack').next_execution_time
+        )
+        self.assertEqual(1, postponed.reschedule_count)
+        self.assertEqual('postponed: overload', postponed.reschedule_reason)
+        self.assertIsNotNone(postponed.rescheduled_at)
+
+        # The workload without slack keeps its planned start.
+        self.assertEqual(
+            self.now + datetime.timedelta(seconds=120),
+            db_api.get_cron_trigger('dtw-urgent').next_execution_time
+        )
+        self.assertFalse(
+            db_api.get_delay_tolerant_workload('dtw-urgent').reschedule_count
+        )
+
+    def test_pull_forward_on_free_capacity(self):
+        for i in range(3):
+            self._create_planned_workload(
+                'dtw-%s' % i,
+                3600 * (i + 1),
+                3600 * (i + 2),
+                3600
+            )
+
+        count = dtw.rebalance_delay_tolerant_workloads(
+            self.now,
+            dtw.ClusterLoad(running=8, capacity=10, saturated=False)
+        )
+
+        # Only free capacity is used, earliest deadlines first.
+        self.assertEqual(2, count)
+
+        for name in ['dtw-0', 'dtw-1']:
+            self.assertEqual(
+                self.now,
+                db_api.get_cron_trigger(name).next_execution_time
+            )
+
+        self.assertEqual(
+            self.now + datetime.timedelta(hours=3),
+            db_api.get_cron_trigger('dtw-2').next_execution_time
+        )
+
+    def test_stale_trigger_not_rescheduled(self):
+        self._create_planned_workload('dtw-1', 60, 7200, 600)
+
+        planned = db_api.get_planned_delay_tolerant_workloads()
+
+        self.assertEqual(1, len(planned))
+
+        trigger, d = planned[0]
+
+        self.assertTrue(
+            db_api.reschedule_delay_tolerant_workload(
+                trigger.id,
+                trigger.next_execution_time,
+                self.now,
+                d.id,
+                'test'
+            )
+        )
+
+        # Another process has already moved the trigger.
+        self.assertFalse(
+            db_api.reschedule_delay_tolerant_workload(
+                trigger.id,
+                trigger.next_execution_time,
+                self.now,
+                d.id,
+                'test'
+            )
+        )
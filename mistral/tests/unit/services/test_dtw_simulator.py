@@ -0,0 +1,138 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import datetime
+
+from mistral.db.v2 import api as db_api
+from mistral import exceptions as exc
+from mistral.services import delay_tolerant_workload as dtw
+from mistral.tests.unit import base
+from mistral.tests.unit import dtw_simulator
+
+
+class DTWSimulatorTest(base.DbTestCase):
+    def setUp(self):
+        super(DTWSimulatorTest, self).setUp()
+
+        self.override_config('dtw_max_concurrent_executions', 3, 'engine')
+        self.override_config('dtw_scheduling_slot', 1, 'engine')
+
+        # 2 bursts of 10 workloads.
+        self.trace = dtw_simulator.generate_trace(
+            seed=1,
+            num_bursts=2,
+            burst_size=10,
+            interval=60,
+            max_duration=30,
+            min_slack=70,
+            max_slack=200
+        )
+
+    def _simulate(self, policy):
+        return dtw_simulator.Simulation(self.trace, policy).run()
+
+    def test_immediate(self):
+        result = self._simulate('immediate')
+
+        self.assertEqual(20, result.workloads)
+        self.assertEqual(0, result.rejected)
+        self.assertEqual(0, result.not_started)
+        self.assertEqual(0, result.missed)
+        self.assertEqual(0, result.max_queue_delay)
+        self.assertGreaterEqual(result.peak_concurrency, 10)
+
+    def test_deadline(self):
+        result = self._simulate('deadline')
+
+        self.assertEqual(0, result.not_started)
+        self.assertEqual(0, result.missed)
+        # Workloads without slack left are started regardless of
+        # capacity so peak concurrency is not strictly limited.
+        self.assertLess(result.peak_concurrency, 10)
+        self.assertGreater(result.avg_queue_delay, 0)
+
+    def test_last_minute(self):
+        result = self._simulate('last_minute')
+
+        self.assertEqual(0, result.not_started)
+        self.assertEqual(0, result.missed)
+        self.assertGreater(result.avg_queue_delay, 0)
+
+    def test_environment_restored(self):
+        scheduler_type = dtw.get_scheduler_type()
+
+        self._simulate('last_minute')
+
+        self.assertEqual([], db_api.get_delay_tolerant_workloads())
+        self.assertEqual([], db_api.get_cron_triggers())
+        self.assertIsNone(db_api.load_workflow_definition('wf'))
+        self.assertEqual(scheduler_type, dtw.get_scheduler_type())
+        self.assertIs(datetime, dtw.datetime)
+
+    def test_rejected(self):
+        # Deadline must be at least one minute after arrival.
+        self.trace = [
+            dtw_simulator.TraceEntry('dtw-1', 0, 30, 10, 10, 'wf'),
+            dtw_simulator.TraceEntry('dtw-2', 0, 300, 10, 10, 'wf')
+        ]
+
+        result = self._simulate('immediate')
+
+        self.assertEqual(1, result.rejected)
+        self.assertEqual(0, result.not_started)
+
+    def test_existing_data_kept(self):
+        self.override_config('auth_enable', False, 'pecan')
+
+        wf = db_api.create_workflow_definition({
+            'name': 'wf',
+            'definition': '',
+            'spec': {
+                'version': '2.0',
+                'name': 'wf',
+                'tasks': {'task1': {'action': 'std.noop'}}
+            },
+            'tags': [],
+            'scope': 'private'
+        })
+
+        dtw.create_delay_tolerant_workload(
+            'existing',
+            'wf',
+            {},
+            {},
+            str(datetime.datetime.now() + datetime.timedelta(hours=1)),
+            None,
+            None
+        )
+
+        self._simulate('immediate')
+
+        self.assertEqual(
+            ['existing'],
+            [d.name for d in db_api.get_delay_tolerant_workloads()]
+        )
+        self.assertEqual(wf.id, db_api.get_workflow_definition('wf').id)
+
+    def test_persistent_database_refused(self):
+        self.override_config('connection', 'sqlite:////tmp/mistral.db',
+                             'database')
+
+        self.assertRaises(exc.MistralException, self._simulate, 'immediate')
+
+        self.override_config('connection', 'mysql://mistral@db/mistral',
+                             'database')
+
+        self.assertRaises(exc.MistralException, self._simulate, 'immediate')
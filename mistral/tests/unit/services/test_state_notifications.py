@@ -0,0 +1,110 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import mock
+
+from mistral.db.v2 import api as db_api
+from mistral.services import state_notifications
+from mistral.tests.unit import base
+from mistral.workflow import states
+
+
+class StateNotificationsTest(base.DbTestCase):
+    def setUp(self):
+        super(StateNotificationsTest, self).setUp()
+
+        self.addCleanup(state_notifications.cleanup)
+
+        self.wf_ex = db_api.create_workflow_execution({
+            'name': 'wf',
+            'state': states.RUNNING
+        })
+
+        self.task_ex = db_api.create_task_execution({
+            'name': 'task1',
+            'state': states.RUNNING,
+            'workflow_execution_id': self.wf_ex.id
+        })
+
+    def test_publish_after_commit(self):
+        with state_notifications.subscribe(self.wf_ex.id) as subscription:
+            with db_api.transaction():
+                state_notifications.publish(
+                    'workflow',
+                    self.wf_ex,
+                    states.SUCCESS
+                )
+
+                # Nothing is delivered before the transaction is committed.
+                self.assertIsNone(subscription.get(0))
+
+            event = subscription.get(0)
+
+        self.assertEqual('workflow', event['type'])
+        self.assertEqual(self.wf_ex.id, event['id'])
+        self.assertEqual(states.SUCCESS, event['state'])
+
+    def test_publish_rollback(self):
+        with state_notifications.subscribe(self.wf_ex.id) as subscription:
+            db_api.start_tx()
+
+            try:
+                state_notifications.publish(
+                    'workflow',
+                    self.wf_ex,
+                    states.ERROR
+                )
+
+                db_api.rollback_tx()
+            finally:
+                db_api.end_tx()
+
+            self.assertIsNone(subscription.get(0))
+
+    def test_task_notifications_received_by_workflow_subscribers(self):
+        wf_sub = state_notifications.subscribe(self.wf_ex.id)
+        other_sub = state_notifications.subscribe('other-id')
+
+        state_notifications.publish(
+            'task',
+            self.task_ex,
+            states.ERROR,
+            'Failed'
+        )
+
+        event = wf_sub.wait(lambda e: e['type'] == 'task', 1)
+
+        self.assertEqual(self.task_ex.id, event['id'])
+        self.assertEqual(self.wf_ex.id, event['workflow_execution_id'])
+        self.assertEqual('Failed', event['state_info'])
+
+        self.assertIsNone(other_sub.get(0))
+
+        wf_sub.close()
+        other_sub.close()
+
+        self.assertEqual({}, dict(state_notifications._SUBSCRIPTIONS))
+
+    @mock.patch.object(state_notifications, '_get_notifier')
+    def test_publish_remote(self, get_notifier):
+        self.override_config('state_change_notifications', True, 'engine')
+
+        state_notifications.publish('workflow', self.wf_ex, states.PAUSED)
+
+        get_notifier.return_value.info.assert_called_once_with(
+            {},
+            state_notifications.EVENT_TYPE,
+            mock.ANY
+        )
@@ -12,13 +12,16 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from croniter import croniter
 import datetime
 import eventlet
 import mock
 from oslo_config import cfg
 
+from mistral.db.v2 import api as db_api
 from mistral.engine.rpc_backend import rpc
 from mistral import exceptions as exc
+from mistral.services import cron_trigger_wheel
 from mistral.services import periodic
 from mistral.services import security
 from mistral.services import triggers as t_s
@@ -61,6 +64,22 @@ def new_advance_cron_trigger(ct):
     return modified
 
 
+advance_cron_triggers_orig = db_api.advance_cron_triggers
+
+
+def new_advance_cron_triggers(ids, prev_time, next_time):
+    """Wrap the original DB API method advancing a group of cron triggers.
+
+    Same as new_advance_cron_trigger() but for the set-based advancing
+    that process_cron_triggers_v2 tries first.
+    """
+    eventlet.sleep()
+    count = advance_cron_triggers_orig(ids, prev_time, next_time)
+    eventlet.sleep()
+
+    return count
+
+
 class TriggerServiceV2Test(base.DbTestCase):
     def setUp(self):
         super(TriggerServiceV2Test, self).setUp()
@@ -281,12 +300,96 @@ class TriggerServiceV2Test(base.DbTestCase):
 
         self.assertEqual([t2_name, t1_name, t3_name], trigger_names)
 
+    def _create_triggers(self, counts):
+        return [
+            t_s.create_cron_trigger(
+                'trigger-%s' % i,
+                self.wf.name,
+                {},
+                {},
+                '*/5 * * * *',
+                None,
+                count,
+                datetime.datetime(2010, 8, 25)
+            )
+            for i, count in enumerate(counts)
+        ]
+
+    def test_advance_cron_triggers(self):
+        trigger_list = self._create_triggers([None, 2, 1])
+
+        advanced = periodic.advance_cron_triggers(trigger_list)
+
+        self.assertEqual(
+            set(t.name for t in trigger_list),
+            set(t.name for t in advanced)
+        )
+
+        t0 = db_api.get_cron_trigger('trigger-0')
+        t1 = db_api.get_cron_trigger('trigger-1')
+
+        self.assertIsNone(t0.remaining_executions)
+        self.assertEqual(1, t1.remaining_executions)
+
+        for t in (t0, t1):
+            self.assertEqual(
+                datetime.datetime(2010, 8, 25, 0, 10),
+                t.next_execution_time
+            )
+
+        self.assertRaises(
+            exc.DBEntityNotFoundError,
+            db_api.get_cron_trigger,
+            'trigger-2'
+        )
+
+    def test_advance_cron_triggers_concurrently(self):
+        trigger_list = self._create_triggers([None, None, None])
+
+        # Another process has already advanced one of the triggers.
+        self.assertTrue(
+            periodic.advance_cron_trigger(
+                db_api.get_cron_trigger('trigger-1')
+            )
+        )
+
+        advanced = periodic.advance_cron_triggers(trigger_list)
+
+        self.assertEqual(
+            ['trigger-0', 'trigger-2'],
+            sorted(t.name for t in advanced)
+        )
+
+        # Every trigger is advanced only once.
+        for t in db_api.get_cron_triggers():
+            self.assertEqual(
+                datetime.datetime(2010, 8, 25, 0, 10),
+                t.next_execution_time
+            )
+
+    @mock.patch.object(rpc.EngineClient, 'start_workflow')
+    def test_process_cron_triggers_in_batches(self, start_wf_mock):
+        self.override_config('cron_trigger_batch_size', 2, 'engine')
+
+        self._create_triggers([1] * 5)
+
+        periodic.MistralPeriodicTasks(cfg.CONF).process_cron_triggers_v2(None)
+
+        self.assertEqual(5, start_wf_mock.call_count)
+        self.assertEqual([], db_api.get_cron_triggers())
+
     @mock.patch(
         'mistral.services.periodic.advance_cron_trigger',
         mock.MagicMock(side_effect=new_advance_cron_trigger)
     )
+    @mock.patch.object(
+        db_api,
+        'advance_cron_triggers',
+        side_effect=new_advance_cron_triggers
+    )
     @mock.patch.object(rpc.EngineClient, 'start_workflow')
-    def test_single_execution_with_multiple_processes(self, start_wf_mock):
+    def test_single_execution_with_multiple_processes(self, start_wf_mock,
+                                                      advance_mock):
         def stop_thread_groups():
             print('Killing cron trigger threads...')
             [tg.stop() for tg in self.trigger_threads]
@@ -324,8 +427,195 @@ class TriggerServiceV2Test(base.DbTestCase):
 
         self.assertEqual(trigger_count, start_wf_mock.call_count)
 
+        # Processes compete in set-based advancing of triggers.
+        self.assertGreater(advance_mock.call_count, trigger_count)
+
     def _wait_for_single_execution_with_multiple_processes(self, trigger_count,
                                                            start_wf_mock):
         eventlet.sleep(1)
 
         return trigger_count == start_wf_mock.call_count
+
+
+class CronTriggerWheelTest(base.DbTestCase):
+    def setUp(self):
+        super(CronTriggerWheelTest, self).setUp()
+
+        self.override_config('cron_trigger_timing_wheel', True, 'engine')
+
+        cron_trigger_wheel.cleanup()
+
+        self.addCleanup(cron_trigger_wheel.cleanup)
+
+        self.wf = workflows.create_workflows(WORKFLOW_LIST)[0]
+
+    def _create_trigger(self, name, first_time=None):
+        return t_s.create_cron_trigger(
+            name,
+            self.wf.name,
+            {},
+            {},
+            '*/5 * * * *',
+            first_time,
+            None,
+            datetime.datetime(2010, 8, 25)
+        )
+
+    def test_get_next_cron_triggers(self):
+        trigger = self._create_trigger('ct1')
+        self._create_trigger('ct2', '4242-12-25 13:37')
+
+        next_triggers = t_s.get_next_cron_triggers()
+
+        self.assertEqual([trigger.id], [t.id for t in next_triggers])
+
+        # Fired triggers are removed from the wheel until advanced.
+        self.assertEqual([], t_s.get_next_cron_triggers())
+
+    @mock.patch.object(db_api, 'get_cron_triggers_by_ids')
+    def test_no_query_if_nothing_due(self, get_triggers_mock):
+        self._create_trigger('ct1', '4242-12-25 13:37')
+
+        self.assertEqual([], t_s.get_next_cron_triggers())
+
+        get_triggers_mock.assert_not_called()
+
+    def test_deleted_trigger(self):
+        self._create_trigger('ct1')
+
+        # Wheel is loaded before the trigger is deleted.
+        cron_trigger_wheel.get_wheel().get_next_cron_triggers(
+            datetime.datetime(2000, 1, 1)
+        )
+
+        db_api.delete_cron_trigger('ct1')
+
+        self.assertEqual([], t_s.get_next_cron_triggers())
+
+    def test_advanced_trigger(self):
+        trigger = self._create_trigger('ct1')
+
+        next_triggers = t_s.get_next_cron_triggers()
+
+        self.assertTrue(periodic.advance_cron_trigger(next_triggers[0]))
+
+        next_triggers = t_s.get_next_cron_triggers()
+
+        self.assertEqual([trigger.id], [t.id for t in next_triggers])
+        self.assertEqual(
+            datetime.datetime(2010, 8, 25, 0, 10),
+            next_triggers[0].next_execution_time
+        )
+
+    def test_partitioning(self):
+        names = ['ct%s' % i for i in range(20)]
+
+        for name in names:
+            self._create_trigger(name)
+
+        members = ('member-1', 'member-2')
+
+        wheels = [
+            cron_trigger_wheel.CronTriggerWheel(
+                10,
+                300,
+                get_members=lambda m=m: (members, m)
+            )
+            for m in members
+        ]
+
+        time = datetime.datetime.now()
+
+        fired = [
+            set(t.name for t in w.get_next_cron_triggers(time))
+            for w in wheels
+        ]
+
+        self.assertEqual(set(names), fired[0] | fired[1])
+        self.assertEqual(set(), fired[0] & fired[1])
+        self.assertTrue(fired[0])
+        self.assertTrue(fired[1])
+
+    def test_membership_change(self):
+        names = ['ct%s' % i for i in range(20)]
+
+        for name in names:
+            self._create_trigger(name)
+
+        members = [('member-1', 'member-2')]
+
+        wheel = cron_trigger_wheel.CronTriggerWheel(
+            10,
+            300,
+            get_members=lambda: (members[0], 'member-1')
+        )
+
+        # Trigger times are not changed, wheel is only loaded.
+        wheel.get_next_cron_triggers(datetime.datetime(2000, 1, 1))
+
+        self.assertLess(len(wheel._wheel), len(names))
+
+        # The other member left, all triggers are taken over.
+        members[0] = ('member-1',)
+
+        fired = wheel.get_next_cron_triggers(datetime.datetime.now())
+
+        self.assertEqual(set(names), set(t.name for t in fired))
+
+
+class CronScheduleTest(base.BaseTest):
+    def setUp(self):
+        super(CronScheduleTest, self).setUp()
+
+        t_s.clear_schedule_cache()
+
+        self.addCleanup(t_s.clear_schedule_cache)
+
+    def test_fixed_interval(self):
+        self.assertEqual(60, t_s.get_schedule('* * * * *').interval)
+        self.assertEqual(300, t_s.get_schedule('*/5 * * * *').interval)
+        self.assertEqual(10, t_s.get_schedule('* * * * * */10').interval)
+
+        self.assertIsNone(t_s.get_schedule('*/7 * * * *').interval)
+        self.assertIsNone(t_s.get_schedule('0 * * * *').interval)
+        self.assertIsNone(t_s.get_schedule('*/5 1 * * *').interval)
+
+    def test_next_times_match_croniter(self):
+        start_times = [
+            datetime.datetime(2016, 2, 28, 23, 59, 59, 500),
+            datetime.datetime(2016, 12, 31, 23, 55),
+            datetime.datetime(2017, 1, 1, 10, 7, 31)
+        ]
+
+        for pattern in ('* * * * *', '*/15 * * * *', '* * * * * */20',
+                        '*/7 * * * *', '0 */2 * * 1'):
+            for start_time in start_times:
+                it = croniter(pattern, start_time)
+
+                self.assertEqual(
+                    [it.get_next(datetime.datetime) for _ in range(5)],
+                    t_s.get_next_execution_times(pattern, start_time, 5)
+                )
+
+    def test_cache(self):
+        schedule = t_s.get_schedule('*/5 * * * *')
+
+        self.assertIs(schedule, t_s.get_schedule('*/5 * * * *'))
+
+    def test_cache_disabled(self):
+        self.override_config('cron_pattern_cache_size', 0, 'engine')
+
+        schedule = t_s.get_schedule('*/5 * * * *')
+
+        self.assertIsNot(schedule, t_s.get_schedule('*/5 * * * *'))
+
+    def test_invalid_pattern(self):
+        self.assertRaises(ValueError, t_s.get_schedule, '*/5 * *')
+
+        self.assertRaises(
+            exc.InvalidModelException,
+            t_s.validate_cron_trigger_input,
+            'invalid pattern',
+            None,
+            None
+        )
@@ -249,3 +249,29 @@ class WorkbookServiceTest(base.DbTestCase):
         self.assertEqual('wf2', wf2_spec.get_name())
         self.assertEqual('reverse', wf2_spec.get_type())
         self.assertEqual(UPDATED_WORKBOOK_WF2_DEFINITION, wf2_db.definition)
+
+    def test_create_workbook_many_workflows(self):
+        wfs = ''.join(
+            "\n  wf%s:\n    tasks:\n      task1:\n        action: std.noop\n"
+            % i for i in range(50)
+        )
+        wb_def = "---\nversion: '2.0'\n\nname: big_wb\n\nworkflows:%s" % wfs
+
+        wb_service.create_workbook_v2(wb_def)
+
+        db_wfs = db_api.get_workflow_definitions()
+
+        self.assertEqual(50, len(db_wfs))
+
+        for i in range(50):
+            wf_db = self._assert_single_item(db_wfs, name='big_wb.wf%s' % i)
+
+            self.assertEqual(
+                spec_parser.get_workflow_definition(wb_def, 'wf%s' % i),
+                wf_db.definition
+            )
+
+        # Update must not create duplicates.
+        wb_service.update_workbook_v2(wb_def)
+
+        self.assertEqual(50, len(db_api.get_workflow_definitions()))
@@ -119,6 +119,23 @@ class ServiceCoordinatorTest(base.BaseTest):
         self.assertEqual(0, len(members_after))
         self.assertEqual(set([]), members_after)
 
+    def test_update_and_get_capabilities(self):
+        cfg.CONF.set_default(
+            'backend_url',
+            'zake://',
+            'coordination'
+        )
+
+        coordinator = coordination.ServiceCoordinator(my_id='fake_id')
+        coordinator.start()
+
+        coordinator.join_group('fake_group', {'in_flight': 0})
+        coordinator.update_capabilities('fake_group', {'in_flight': 5})
+
+        caps = coordinator.get_members_capabilities('fake_group')
+
+        self.assertDictEqual({six.b('fake_id'): {'in_flight': 5}}, caps)
+
 
 class ServiceTest(base.BaseTest):
     def setUp(self):
@@ -0,0 +1,109 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import json
+import subprocess
+import sys
+
+from mistral.cmd import startup_profiler
+from mistral.tests.unit import base
+
+
+# Packages which must not be imported just to launch an executor.
+EXECUTOR_FORBIDDEN_IMPORTS = (
+    'barbicanclient',
+    'ceilometerclient',
+    'cinderclient',
+    'designateclient',
+    'glanceclient',
+    'heatclient',
+    'ironic_inspector_client',
+    'ironicclient',
+    'magnumclient',
+    'mistral.actions.openstack.actions',
+    'mistral.api.controllers',
+    'mistralclient',
+    'muranoclient',
+    'neutronclient',
+    'novaclient',
+    'swiftclient',
+    'tackerclient',
+    'troveclient',
+    'zaqarclient',
+)
+
+_IMPORT_EXECUTOR_SCRIPT = """
+import json
+import sys
+
+from mistral.engine import default_executor
+
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+
+        return self.now
+
+
+class StartupProfilerTest(base.BaseTest):
+    def test_phases(self):
+        profiler = startup_profiler.StartupProfiler(timer=FakeTimer())
+
+        with profiler.phase('engine: init'):
+            pass
+
+        self.assertEqual({'engine: init': 1}, dict(profiler.phases))
+        self.assertIn('engine: init', profiler.report())
+
+    def test_imports(self):
+        sys.modules.pop('colorsys', None)
+
+        profiler = startup_profiler.StartupProfiler()
+
+        profiler.start()
+
+        try:
+            import colorsys  # noqa
+        finally:
+            profiler.stop()
+
+        self.assertIn('colorsys', profiler.imports)
+
+        self_time, total = profiler.imports['colorsys']
+
+        self.assertLessEqual(self_time, total)
+        self.assertIn('colorsys', profiler.report())
+
+    def test_executor_imports(self):
+        output = subprocess.check_output(
+            [sys.executable, '-c', _IMPORT_EXECUTOR_SCRIPT]
+        )
+
+        modules = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+        heavy_modules = [
+            m for m in modules if m.startswith(EXECUTOR_FORBIDDEN_IMPORTS)
+        ]
+
+        # Import time depends too much on the test node to be asserted,
+        # absence of heavy modules is what keeps executor startup fast.
+        self.assertEqual([], heavy_modules)
@@ -0,0 +1,40 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import sys
+
+from mistral.tests.unit import base
+from mistral.utils import lazy_import
+
+
+class LazyModuleTest(base.BaseTest):
+    def test_import_on_first_access(self):
+        sys.modules.pop('colorsys', None)
+
+        module = lazy_import.LazyModule('colorsys')
+
+        self.assertFalse(module.is_loaded())
+        self.assertNotIn('colorsys', sys.modules)
+
+        self.assertEqual((0.0, 0.0, 1.0), module.rgb_to_hsv(1.0, 1.0, 1.0))
+
+        self.assertTrue(module.is_loaded())
+        self.assertIn('colorsys', sys.modules)
+
+    def test_missing_module(self):
+        module = lazy_import.LazyModule('mistral_not_existing_module')
+
+        self.assertFalse(module)
+        self.assertRaises(ImportError, getattr, module, 'Client')
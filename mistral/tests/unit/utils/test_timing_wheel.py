@@ -0,0 +1,109 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import datetime
+import random
+
+from mistral.tests.unit import base
+from mistral.utils import timing_wheel
+
+
+NOW = datetime.datetime(2016, 1, 1, 12, 30, 15)
+
+
+def _after(seconds):
+    return NOW + datetime.timedelta(seconds=seconds)
+
+
+class TimingWheelTest(base.BaseTest):
+    def setUp(self):
+        super(TimingWheelTest, self).setUp()
+
+        self.wheel = timing_wheel.TimingWheel(NOW)
+
+    def test_advance(self):
+        self.wheel.add('a', _after(1))
+        self.wheel.add('b', _after(5))
+
+        self.assertEqual(2, len(self.wheel))
+        self.assertEqual([], self.wheel.advance(_after(0)))
+        self.assertEqual(['a'], self.wheel.advance(_after(3)))
+        self.assertEqual([], self.wheel.advance(_after(4)))
+        self.assertEqual(['b'], self.wheel.advance(_after(5)))
+        self.assertEqual(0, len(self.wheel))
+
+    def test_add_past(self):
+        self.wheel.add('a', _after(-100))
+
+        self.assertEqual(['a'], self.wheel.advance(NOW))
+
+    def test_advance_to_earlier_time(self):
+        self.wheel.add('a', _after(-100))
+
+        self.assertEqual([], self.wheel.advance(_after(-200)))
+        self.assertEqual(['a'], self.wheel.advance(NOW))
+
+    def test_remove(self):
+        self.wheel.add('a', _after(10))
+        self.wheel.add('b', _after(10))
+
+        self.wheel.remove('a')
+
+        self.assertNotIn('a', self.wheel)
+        self.assertEqual(['b'], self.wheel.advance(_after(10)))
+
+    def test_reschedule(self):
+        self.wheel.add('a', _after(10))
+        self.wheel.add('a', _after(7200))
+
+        self.assertEqual([], self.wheel.advance(_after(3600)))
+        self.assertEqual(['a'], self.wheel.advance(_after(7200)))
+
+    def test_higher_levels(self):
+        # Fire times spanning all levels including the unlimited top one.
+        offsets = [59, 60, 61, 3599, 3600, 3601, 86400, 216000 * 3]
+
+        for idx, offset in enumerate(offsets):
+            self.wheel.add(idx, _after(offset))
+
+        for idx, offset in enumerate(offsets):
+            self.assertEqual([], self.wheel.advance(_after(offset - 1)))
+            self.assertEqual([idx], self.wheel.advance(_after(offset)))
+
+    def test_random(self):
+        rnd = random.Random(42)
+
+        fire_times = dict(
+            (i, rnd.randint(0, 20000)) for i in range(1000)
+        )
+
+        for key, offset in fire_times.items():
+            self.wheel.add(key, _after(offset))
+
+        fired = {}
+        now = 0
+
+        while now < 20000:
+            now += rnd.randint(1, 300)
+
+            for key in self.wheel.advance(_after(now)):
+                fired[key] = now
+
+        self.assertEqual(set(fire_times), set(fired))
+
+        for key, offset in fire_times.items():
+            # Every key is fired at the first advance reaching its time.
+            self.assertGreaterEqual(fired[key], offset)
+            self.assertLess(fired[key] - offset, 300)
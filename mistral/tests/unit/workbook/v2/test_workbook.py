@@ -18,7 +18,9 @@ import copy
 import yaml
 
 from mistral import exceptions as exc
+from mistral.tests.unit import base as test_base
 from mistral.tests.unit.workbook.v2 import base
+from mistral.workbook import parser as spec_parser
 
 
 class WorkbookSpecValidation(base.WorkbookSpecValidationTestCase):
@@ -379,3 +381,30 @@ class WorkbookSpecValidation(base.WorkbookSpecValidationTestCase):
         for workflows, expect_error in tests:
             self._parse_dsl_spec(changes=workflows,
                                  expect_error=expect_error)
+
+    def test_get_definitions(self):
+        wb_def = test_base.get_resource('workbook/v2/my_workbook.yaml')
+
+        wf_defs = spec_parser.get_workflow_definitions(
+            wb_def,
+            ['wf1', 'wf2']
+        )
+
+        self.assertEqual(['wf1', 'wf2'], sorted(wf_defs))
+
+        for name, definition in wf_defs.items():
+            self.assertEqual(
+                spec_parser.get_workflow_definition(wb_def, name),
+                definition
+            )
+
+        action_defs = spec_parser.get_action_definitions(
+            wb_def,
+            ['action1', 'action2']
+        )
+
+        for name, definition in action_defs.items():
+            self.assertEqual(
+                spec_parser.get_action_definition(wb_def, name),
+                definition
+            )
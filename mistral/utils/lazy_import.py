@@ -0,0 +1,63 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from oslo_utils import importutils
+
+
+class LazyModule(object):
+    """Module imported on first access to its attributes.
+
+    Can be used instead of importutils.try_import() for heavy optional
+    dependencies: if the module can't be imported the proxy evaluates to
+    False and accessing its attributes raises ImportError.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+
+        if module is None:
+            module = importutils.import_module(self.__dict__['_name'])
+
+            self.__dict__['_module'] = module
+
+        return module
+
+    def is_loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __bool__(self):
+        try:
+            self._load()
+        except ImportError:
+            return False
+
+        return True
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        name = self.__dict__['_name']
+
+        return "<LazyModule %s%s>" % (
+            name,
+            '' if self.is_loaded() else ' (not loaded)'
+        )
@@ -15,19 +15,32 @@
 #    limitations under the License.
 
 import functools
+import hashlib
 import json
 
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
 import pecan
 import six
-
-from oslo_log import log as logging
 from webob import Response
 from wsme import exc as wsme_exc
+from wsme.rest import json as wsme_json
 
+from mistral import context
+from mistral.db.v2 import api as db_api
 from mistral import exceptions as exc
 
 LOG = logging.getLogger(__name__)
 
+# Key of the request context under which the body iterator of a streamed
+# response is passed to StreamingHook.
+STREAM_KEY = 'mistral.stream'
+
+# Key of the request context marking that the response to a conditional
+# request must be turned into "304 Not Modified" by ConditionalGetHook.
+NOT_MODIFIED_KEY = 'mistral.not_modified'
+
 
 def wrap_wsme_controller_exception(func):
     """Decorator for controllers method.
@@ -119,9 +132,118 @@ def filters_to_dict(**kwargs):
     return {k: v for k, v in kwargs.items() if v is not None}
 
 
+def _get_resource_dicts(db_list, resource_function, resources_function,
+                        fields):
+    """Yields dictionaries of resources built of DB objects."""
+    if resources_function:
+        objs = resources_function(db_list, fields)
+    elif resource_function:
+        objs = [resource_function(data) for data in db_list]
+    else:
+        for data in db_list:
+            yield dict(zip(fields, data)) if fields else data.to_dict()
+
+        return
+
+    for obj in objs:
+        # filter fields using a loop instead of the ORM
+        if fields:
+            data = []
+            for f in fields:
+                if hasattr(obj, f):
+                    data.append(getattr(obj, f))
+
+            yield dict(zip(fields, data))
+        else:
+            yield obj.to_dict()
+
+
+def _iter_batches(iterable, batch_size):
+    batch = []
+
+    for item in iterable:
+        batch.append(item)
+
+        if len(batch) == batch_size:
+            yield batch
+
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _stream_all(list_cls, cls, get_all_function, resource_function,
+                resources_function, limit, fields, link_args, query_kwargs):
+    """Returns an iterator writing the resource list as JSON incrementally.
+
+    The iterator is consumed by the WSGI server after the controller has
+    returned, so it keeps its own security context and DB transaction.
+    DB rows are fetched in batches using a server side cursor if the
+    database supports it.
+    """
+    ctx = context.ctx()
+    host_url = pecan.request.host_url
+    batch_size = cfg.CONF.api.streaming_batch_size
+    list_type = list_cls()._type
+
+    def _generate():
+        context.set_ctx(ctx)
+
+        count = 0
+        last_id = None
+
+        try:
+            yield ('{"%s": [' % list_type).encode('utf-8')
+
+            with db_api.transaction():
+                db_iter = get_all_function(
+                    yield_per=batch_size,
+                    **query_kwargs
+                )
+
+                for batch in _iter_batches(db_iter, batch_size):
+                    for d in _get_resource_dicts(batch, resource_function,
+                                                 resources_function, fields):
+                        resource = cls.from_dict(d)
+
+                        chunk = json.dumps(wsme_json.tojson(cls, resource))
+
+                        yield ((', ' if count else '') + chunk).encode(
+                            'utf-8'
+                        )
+
+                        count += 1
+                        last_id = resource.id
+
+            yield b']'
+
+            # Same semantics as ResourceList.has_next().
+            if count and count == limit:
+                next_link = list_cls().get_next_link(
+                    last_id,
+                    limit,
+                    url=host_url,
+                    **link_args
+                )
+
+                yield (', "next": %s' % json.dumps(next_link)).encode('utf-8')
+
+            yield b'}'
+        except Exception:
+            LOG.exception("Failed to stream %s", list_type)
+
+            raise
+        finally:
+            context.set_ctx(None)
+
+    return _generate()
+
+
 def get_all(list_cls, cls, get_all_function, get_function,
             resource_function=None, marker=None, limit=None,
-            sort_keys='created_at', sort_dirs='asc', fields='', **filters):
+            sort_keys='created_at', sort_dirs='asc', fields='',
+            resources_function=None, stream=False, **filters):
     """Return a list of cls.
 
     :param list_cls: Collection class (e.g.: Actions, Workflows, ...).
@@ -144,6 +266,15 @@ def get_all(list_cls, cls, get_all_function, get_function,
                    be returned. 'id' will be included automatically in
                    fields if it's provided, since it will be used when
                    constructing 'next' link.
+    :param resources_function: Optional, function used to fetch additional
+                               data for all elements of the page at once.
+                               It takes the list of elements and fields and
+                               returns the list of resources.
+    :param stream: Optional. If True, the response body is written
+                   incrementally while iterating over DB results instead of
+                   building the whole list in memory. get_all_function must
+                   support 'yield_per' and the controller must have
+                   StreamingHook.
     :param filters: Optional. A specified dictionary of filters to match.
     """
     if fields and 'id' not in fields:
@@ -157,55 +288,120 @@ def get_all(list_cls, cls, get_all_function, get_function,
     if marker:
         marker_obj = get_function(marker)
 
-    list_to_return = []
-    if resource_function:
-        # do not filter fields yet, resource_function needs the ORM object
-        db_list = get_all_function(
-            limit=limit,
-            marker=marker_obj,
-            sort_keys=sort_keys,
-            sort_dirs=sort_dirs,
-            **filters
-        )
-
-        for data in db_list:
-            obj = resource_function(data)
+    query_kwargs = dict(
+        limit=limit,
+        marker=marker_obj,
+        sort_keys=sort_keys,
+        sort_dirs=sort_dirs
+    )
 
-            # filter fields using a loop instead of the ORM
-            if fields:
-                data = []
-                for f in fields:
-                    if hasattr(obj, f):
-                        data.append(getattr(obj, f))
+    # do not filter fields yet if resource functions need the ORM object
+    if not (resource_function or resources_function):
+        query_kwargs['fields'] = fields
 
-                dict_data = dict(zip(fields, data))
-            else:
-                dict_data = obj.to_dict()
+    query_kwargs.update(filters)
 
-            list_to_return.append(cls.from_dict(dict_data))
+    link_args = dict(
+        sort_keys=','.join(sort_keys),
+        sort_dirs=','.join(sort_dirs),
+        fields=','.join(fields) if fields else '',
+        **filters
+    )
 
-    else:
-        db_list = get_all_function(
-            limit=limit,
-            marker=marker_obj,
-            sort_keys=sort_keys,
-            sort_dirs=sort_dirs,
-            fields=fields,
-            **filters
+    if stream:
+        pecan.request.context[STREAM_KEY] = _stream_all(
+            list_cls,
+            cls,
+            get_all_function,
+            resource_function,
+            resources_function,
+            limit,
+            fields,
+            link_args,
+            query_kwargs
         )
 
-        for data in db_list:
-            dict_data = (dict(zip(fields, data)) if fields else
-                         data.to_dict())
+        # The body is replaced by StreamingHook.
+        return list_cls()
+
+    db_list = get_all_function(**query_kwargs)
 
-            list_to_return.append(cls.from_dict(dict_data))
+    list_to_return = [
+        cls.from_dict(d) for d in _get_resource_dicts(
+            db_list,
+            resource_function,
+            resources_function,
+            fields
+        )
+    ]
 
     return list_cls.convert_with_links(
         list_to_return,
         limit,
         pecan.request.host_url,
-        sort_keys=','.join(sort_keys),
-        sort_dirs=','.join(sort_dirs),
-        fields=','.join(fields) if fields else '',
-        **filters
+        **link_args
     )
+
+
+def _get_etag(db_obj):
+    value = '%s:%s:%s' % (db_obj.id, db_obj.version, db_obj.updated_at)
+
+    return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+
+def _get_last_modified(db_obj):
+    return db_obj.updated_at or db_obj.created_at
+
+
+def set_cache_headers(db_obj):
+    """Sets ETag and Last-Modified headers of the response.
+
+    :param db_obj: DB object or its version returned by one of
+        db_api.get_*_version() functions.
+    """
+    pecan.response.etag = _get_etag(db_obj)
+    pecan.response.last_modified = _get_last_modified(db_obj)
+
+
+def is_not_modified(get_version_function, *args):
+    """Checks whether the client already has the current object version.
+
+    The version is fetched only if the request has If-None-Match or
+    If-Modified-Since headers so that unconditional requests don't make
+    an additional DB query. If the object hasn't changed the response is
+    turned into "304 Not Modified" by ConditionalGetHook and the controller
+    doesn't need to load the object.
+
+    :param get_version_function: Function returning ID, version and
+        timestamps of the object, one of db_api.get_*_version().
+    :param args: Arguments of get_version_function.
+    :return: True if the object hasn't changed.
+    """
+    req = pecan.request
+
+    if_none_match = 'If-None-Match' in req.headers
+
+    if not if_none_match and 'If-Modified-Since' not in req.headers:
+        return False
+
+    version = get_version_function(*args)
+
+    set_cache_headers(version)
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 7232).
+    if if_none_match:
+        not_modified = _get_etag(version) in req.if_none_match
+    else:
+        # Last-Modified header has a precision of one second.
+        last_modified = _get_last_modified(version).replace(microsecond=0)
+        since = req.if_modified_since
+
+        not_modified = (
+            since is not None and
+            last_modified <= timeutils.normalize_time(since)
+        )
+
+    if not_modified:
+        req.context[NOT_MODIFIED_KEY] = True
+
+    return not_modified
@@ -0,0 +1,170 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+import datetime
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class TimingWheel(object):
+    """Hierarchical timing wheel.
+
+    Keeps keys with their fire times and returns the keys that are due
+    when the wheel is advanced. Level 0 consists of buckets of one tick,
+    every bucket of level N spans 'wheel_size' buckets of level N - 1. A key
+    is put into the lowest level whose bucket containing the fire time
+    belongs to the same parent bucket as the current time, so adding and
+    removing keys is O(1) and advancing costs only moving keys of the
+    buckets being entered one level down. The highest level is not limited
+    so keys may fire arbitrarily far in the future.
+
+    Removed and re-added keys are deleted from buckets lazily.
+    """
+
+    def __init__(self, now, tick=1, wheel_size=60, levels=4):
+        """Creates timing wheel.
+
+        :param now: Current time (datetime).
+        :param tick: Length of a level 0 bucket in seconds.
+        :param wheel_size: Number of buckets of a level spanned by a bucket
+            of the next level.
+        :param levels: Number of levels.
+        """
+        self.tick = tick
+        self._spans = [wheel_size ** l for l in range(levels)]
+
+        # [{bucket number: set of keys}] for every level.
+        self._levels = [collections.defaultdict(set) for _ in self._spans]
+
+        # {key: fire tick}
+        self._ticks = {}
+
+        # Keys added with fire time already passed.
+        self._due = set()
+
+        self._cur_tick = self._to_tick(now)
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def __contains__(self, key):
+        return key in self._ticks
+
+    def _to_tick(self, time):
+        return int((time - _EPOCH).total_seconds() // self.tick)
+
+    def _get_level(self, fire_tick):
+        level = 0
+
+        while (level < len(self._spans) - 1 and
+               fire_tick // self._spans[level + 1] !=
+               self._cur_tick // self._spans[level + 1]):
+            level += 1
+
+        return level
+
+    def _insert(self, key, fire_tick):
+        if fire_tick <= self._cur_tick:
+            self._due.add(key)
+
+            return
+
+        level = self._get_level(fire_tick)
+
+        self._levels[level][fire_tick // self._spans[level]].add(key)
+
+    def add(self, key, time):
+        """Adds the key or changes its fire time."""
+        fire_tick = self._to_tick(time)
+
+        self._ticks[key] = fire_tick
+
+        self._insert(key, fire_tick)
+
+    def remove(self, key):
+        self._ticks.pop(key, None)
+        self._due.discard(key)
+
+    def clear(self):
+        for buckets in self._levels:
+            buckets.clear()
+
+        self._ticks.clear()
+        self._due.clear()
+
+    def _cascade(self, level, bucket):
+        for key in self._levels[level].pop(bucket, ()):
+            fire_tick = self._ticks.get(key)
+
+            # Skip keys removed or moved to another bucket.
+            if (fire_tick is not None and
+                    fire_tick // self._spans[level] == bucket):
+                self._insert(key, fire_tick)
+
+    def _rebuild(self, tick):
+        self._cur_tick = tick
+
+        for buckets in self._levels:
+            buckets.clear()
+
+        for key, fire_tick in self._ticks.items():
+            self._insert(key, fire_tick)
+
+    def advance(self, time):
+        """Advances the wheel to the given time.
+
+        :return: List of keys with fire time not later than the given time.
+            Returned keys are removed from the wheel.
+        """
+        target = self._to_tick(time)
+
+        if target - self._cur_tick > self._spans[-1]:
+            # Faster than stepping through every tick.
+            self._rebuild(target)
+        else:
+            while self._cur_tick < target:
+                self._cur_tick += 1
+
+                for level in range(len(self._spans) - 1, 0, -1):
+                    span = self._spans[level]
+
+                    if self._cur_tick % span == 0:
+                        self._cascade(level, self._cur_tick // span)
+
+                self._due.update(self._levels[0].pop(self._cur_tick, ()))
+
+        due = []
+        not_due = set()
+
+        for key in self._due:
+            fire_tick = self._ticks.get(key)
+
+            if fire_tick is None:
+                continue
+
+            # Keys added with passed fire time are kept if the wheel is
+            # advanced to an earlier time.
+            if fire_tick <= target:
+                due.append(key)
+            else:
+                not_due.add(key)
+
+        self._due = not_due
+
+        for key in due:
+            del self._ticks[key]
+
+        return due
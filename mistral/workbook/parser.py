@@ -134,6 +134,108 @@ def get_action_definition(wb_def, action_name):
     return _parse_def_from_wb(wb_def, "actions:", action_name)
 
 
+def get_workflow_definitions(wb_def, wf_names):
+    """Returns definitions of the given workflows of the workbook.
+
+    Unlike get_workflow_definition() the workbook is scanned only once.
+
+    :return: Dictionary {workflow name: workflow definition}.
+    """
+    return _parse_defs_from_wb(wb_def, "workflows:", wf_names)
+
+
+def get_action_definitions(wb_def, action_names):
+    """Returns definitions of the given actions of the workbook.
+
+    Unlike get_action_definition() the workbook is scanned only once.
+
+    :return: Dictionary {action name: action definition}.
+    """
+    return _parse_defs_from_wb(wb_def, "actions:", action_names)
+
+
+def _get_indent(line):
+    return len(line) - len(line.lstrip())
+
+
+def _parse_defs_from_wb(wb_def, section_name, item_names):
+    item_names = set(item_names)
+
+    if not item_names:
+        return {}
+
+    io = six.StringIO(wb_def[wb_def.index(section_name):])
+    io.readline()
+
+    definitions = {}
+
+    # Indentation of names of section items, the first line that is
+    # neither empty nor a comment determines it.
+    items_ident = None
+
+    name = None
+    definition = None
+    ident = 0
+
+    for line in io:
+        new_line = line.strip()
+
+        # Add strings to the current item unless same/less indentation
+        # is found, the same way as _parse_def_from_wb() does.
+        if definition is not None:
+            if not new_line:
+                definition.append(line)
+
+                continue
+            elif new_line.startswith("#"):
+                definition.append(
+                    line if ident > line.index("#") else line[ident:]
+                )
+
+                continue
+            elif ident < _get_indent(line):
+                definition.append(line[ident:])
+
+                continue
+
+            definitions[name] = ''.join(definition).rstrip() + '\n'
+            definition = None
+
+        if not new_line or new_line.startswith("#"):
+            continue
+
+        line_ident = _get_indent(line)
+
+        if items_ident is None:
+            items_ident = line_ident
+
+        if line_ident < items_ident:
+            # The section is over.
+            break
+
+        if line_ident == items_ident and new_line[:-1] in item_names and \
+                new_line.endswith(":"):
+            name = new_line[:-1]
+            ident = line_ident
+            definition = [line.lstrip()]
+
+    if definition is not None:
+        definitions[name] = ''.join(definition).rstrip() + '\n'
+
+    io.close()
+
+    # Items not found by their indentation (e.g. if the section is
+    # formatted unusually) are looked up separately.
+    for item_name in item_names - set(definitions):
+        definitions[item_name] = _parse_def_from_wb(
+            wb_def,
+            section_name,
+            item_name + ":"
+        )
+
+    return definitions
+
+
 def _parse_def_from_wb(wb_def, section_name, item_name):
     io = six.StringIO(wb_def[wb_def.index(section_name):])
     io.readline()
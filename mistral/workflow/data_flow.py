@@ -13,6 +13,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
 import copy
 
 from oslo_config import cfg
@@ -84,7 +85,49 @@ def get_task_execution_result(task_ex):
 
     task_spec = spec_parser.get_task_spec(task_ex.spec)
 
-    if task_spec.get_with_items():
+    return _get_task_result(
+        task_ex,
+        results,
+        bool(task_spec.get_with_items())
+    )
+
+
+def get_task_execution_results(task_exs):
+    """Returns results of the given task executions.
+
+    Unlike get_task_execution_result() this function loads outputs of
+    action executions of all the tasks with one query and checks whether
+    a task is with-items using its runtime context instead of parsing the
+    task spec.
+
+    :return: Dictionary {task execution ID: result}.
+    """
+    outputs = collections.defaultdict(list)
+
+    for task_ex_id, runtime_context, output in \
+            db_api.get_accepted_action_execution_outputs(
+                [t.id for t in task_exs]):
+        outputs[task_ex_id].append(
+            ((runtime_context or {}).get('index'), output)
+        )
+
+    results = {}
+
+    for task_ex in task_exs:
+        task_outputs = sorted(outputs[task_ex.id], key=lambda x: x[0])
+
+        results[task_ex.id] = _get_task_result(
+            task_ex,
+            [output['result'] if output else None
+             for _, output in task_outputs],
+            with_items.is_with_items(task_ex)
+        )
+
+    return results
+
+
+def _get_task_result(task_ex, results, is_with_items):
+    if is_with_items:
         if with_items.get_count(task_ex) > 0:
             return results
         else:
@@ -39,6 +39,11 @@ def _get_context(task_ex):
     return task_ex.runtime_context.get(_WITH_ITEMS, _DEFAULT_WITH_ITEMS)
 
 
+def is_with_items(task_ex):
+    """Checks if the task is with-items without parsing its spec."""
+    return _WITH_ITEMS in (task_ex.runtime_context or {})
+
+
 def get_count(task_ex):
     return _get_context(task_ex)[_COUNT]
 
@@ -0,0 +1,151 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Simple CLI tool measuring throughput of Mistral API.
+
+It sends the given number of GET requests using a number of concurrent
+clients, each of them keeping its connection alive, and prints throughput
+and latency percentiles for every URL. To compare API server types start
+two Mistral API instances, e.g. one with [api]/server_type=simple on port
+8989 and another one with [api]/server_type=eventlet on port 8990, and run:
+
+    python tools/api_benchmark.py \\
+        --url http://localhost:8989/v2/executions \\
+        --url http://localhost:8990/v2/executions \\
+        --requests 5000 --concurrency 100
+"""
+
+import eventlet
+
+eventlet.monkey_patch()
+
+import argparse
+import time
+
+import requests
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+
+    idx = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+
+    return sorted_values[idx]
+
+
+def run_benchmark(url, num_requests, concurrency, headers=None):
+    latencies = []
+    errors = [0]
+    remaining = [num_requests]
+
+    def client():
+        session = requests.Session()
+
+        while remaining[0] > 0:
+            remaining[0] -= 1
+
+            started = time.time()
+
+            try:
+                resp = session.get(url, headers=headers)
+
+                if resp.status_code != 200:
+                    errors[0] += 1
+            except requests.RequestException:
+                errors[0] += 1
+
+            latencies.append(time.time() - started)
+
+    pool = eventlet.GreenPool(concurrency)
+
+    started = time.time()
+
+    for _ in range(concurrency):
+        pool.spawn_n(client)
+
+    pool.waitall()
+
+    elapsed = time.time() - started
+
+    latencies.sort()
+
+    return {
+        'url': url,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': _percentile(latencies, 50) * 1000,
+        'p95': _percentile(latencies, 95) * 1000,
+        'p99': _percentile(latencies, 99) * 1000
+    }
+
+
+def print_results(results):
+    row = '%-45s %9s %7s %9s %9s %9s %9s'
+
+    print(row % ('URL', 'requests', 'errors', 'req/s', 'p50, ms',
+                 'p95, ms', 'p99, ms'))
+
+    for r in results:
+        print(row % (
+            r['url'],
+            r['requests'],
+            r['errors'],
+            '%.1f' % r['rps'],
+            '%.1f' % r['p50'],
+            '%.1f' % r['p95'],
+            '%.1f' % r['p99']
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--url',
+        action='append',
+        dest='urls',
+        help='URL to benchmark, may be specified multiple times '
+             '(default: http://localhost:8989/v2/executions).'
+    )
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='Number of requests sent to every URL.')
+    parser.add_argument('--concurrency', type=int, default=50,
+                        help='Number of concurrent clients.')
+    parser.add_argument('--warmup', type=int, default=50,
+                        help='Number of requests sent before measuring.')
+    parser.add_argument('--token', help='Keystone token (X-Auth-Token).')
+
+    args = parser.parse_args()
+
+    urls = args.urls or ['http://localhost:8989/v2/executions']
+    headers = {'X-Auth-Token': args.token} if args.token else None
+
+    results = []
+
+    for url in urls:
+        if args.warmup:
+            run_benchmark(url, args.warmup, 1, headers)
+
+        results.append(
+            run_benchmark(url, args.requests, args.concurrency, headers)
+        )
+
+    print_results(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# Copyright (c) 2016. Zuercher Hochschule fuer Angewandte Wissenschaften
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Compares DTW scheduling policies by replaying a workload trace.
+
+The trace is a CSV file with columns 'arrival', 'deadline', 'duration'
+and optionally 'name', 'job_duration' and 'workflow' (times in seconds
+since the start of the trace). If no trace is given a synthetic one with
+bursts of workloads is generated. Simulation runs in-process against an
+in-memory SQLite database using a virtual clock, e.g.:
+
+    python tools/dtw_simulator.py --trace trace.csv --capacity 20
+"""
+
+import argparse
+
+from oslo_config import cfg
+
+from mistral import config
+from mistral.tests.unit import dtw_simulator
+
+
+CONF = cfg.CONF
+
+
+def print_results(results):
+    row = '%-12s %9s %8s %8s %7s %9s %6s %10s %10s %9s'
+
+    print(row % ('policy', 'workloads', 'rejected', 'pending', 'missed',
+                 'miss rate', 'peak', 'avg delay', 'max delay', 'cpu, s'))
+
+    for r in results:
+        print(row % (
+            r.policy,
+            r.workloads,
+            r.rejected,
+            r.not_started,
+            r.missed,
+            '%.2f%%' % (r.miss_rate * 100),
+            r.peak_concurrency,
+            '%.1f' % r.avg_queue_delay,
+            r.max_queue_delay,
+            '%.3f' % r.scheduler_cpu_time
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trace', help='CSV file with workload trace.')
+    parser.add_argument(
+        '--policy',
+        action='append',
+        dest='policies',
+        choices=dtw_simulator.POLICIES,
+        help='Policy to simulate, may be specified multiple times '
+             '(default: all policies).'
+    )
+    parser.add_argument('--capacity', type=int, default=10,
+                        help='Capacity of the deadline scheduler.')
+    parser.add_argument('--slot', type=int, default=60,
+                        help='Time slot of the deadline scheduler, seconds.')
+    parser.add_argument('--tick', type=int, default=1,
+                        help='Interval of periodic tasks, seconds.')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Seed of the synthetic trace.')
+    parser.add_argument('--bursts', type=int, default=10,
+                        help='Number of bursts of the synthetic trace.')
+    parser.add_argument('--burst-size', type=int, default=100,
+                        help='Number of workloads in a burst of the '
+                             'synthetic trace.')
+
+    args = parser.parse_args()
+
+    config.parse_args([])
+
+    CONF.set_override('connection', 'sqlite://', 'database')
+    CONF.set_override('dtw_max_concurrent_executions', args.capacity,
+                      'engine')
+    CONF.set_override('dtw_scheduling_slot', args.slot, 'engine')
+
+    if args.trace:
+        trace = dtw_simulator.load_trace(args.trace)
+    else:
+        trace = dtw_simulator.generate_trace(
+            seed=args.seed,
+            num_bursts=args.bursts,
+            burst_size=args.burst_size
+        )
+
+    print_results(
+        dtw_simulator.simulate(
+            trace,
+            policies=args.policies or dtw_simulator.POLICIES,
+            tick=args.tick
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()